@@ -0,0 +1,143 @@
+import math
+from bisect import bisect_left
+
+from .geometry import section_parameters
+from .utils import map_jobs
+
+
+def _conveyance_factors(geometry, stages):
+    """
+    A R^(2/3) of every observation, None where the stage is outside the
+    section.
+    """
+    datum = getattr(geometry, 'lowest', 0.0)
+    full = geometry.max_depth
+    depths = [stage - datum for stage in stages]
+    valid = [y > 0 and (full is None or y <= full) for y in depths]
+    factors = geometry.conveyance([y if ok else 0.0 for y, ok in zip(depths, valid)])
+    return [k if ok else None for k, ok in zip(factors, valid)]
+
+
+def _least_squares_scale(factors, discharges):
+    """
+    Scale c minimizing sum (Q - c phi)^2, i.e. c = sum(phi Q) / sum(phi^2).
+    """
+    numerator = 0.0
+    denominator = 0.0
+    for phi, q in zip(factors, discharges):
+        numerator += phi * q
+        denominator += phi * phi
+    if denominator == 0:
+        return None
+    return numerator / denominator
+
+
+def calibrate_site(section, stages, discharges, bands=None, fit_slope: bool = False):
+    """
+    Fits Manning's roughness, or the bed slope, of a section to observed
+    stage-discharge pairs by least squares on the discharge.
+
+    With Q = A R^(2/3) S^0.5 / n the discharge is linear in 1/n (or in S^0.5),
+    so the best fit has a closed form over all observations at once.
+
+    Args:
+        section: section class instance, stages being water surface
+            elevations for irregular sections and depths otherwise
+        stages (list): observed stages
+        discharges (list): observed discharges (cms)
+        bands (list): increasing stage breakpoints; when given, a separate
+            roughness is fitted to the observations between each pair
+        fit_slope (bool): fit the slope with the section's roughness instead
+            of the roughness with the section's slope
+
+    Returns:
+        dict: roughness, slope, count (observations used), rejected
+        (observations outside the section), rmse (cms) and, with bands,
+        a list of bands with lower, upper, roughness and count
+    """
+    if len(stages) != len(discharges):
+        raise ValueError('Stages and discharges must have the same length.')
+    if fit_slope and bands:
+        raise ValueError('Stage bands apply to the roughness only.')
+
+    geometry, roughness, slope = section_parameters(section)
+    factors = _conveyance_factors(geometry, stages)
+    used = [(stage, k, q) for stage, k, q in zip(stages, factors, discharges) if k is not None]
+    if not used:
+        raise ValueError('No observation lies within the section.')
+
+    used_stages = [stage for stage, k, q in used]
+    used_factors = [k for stage, k, q in used]
+    used_discharges = [q for stage, k, q in used]
+
+    result = {'count': len(used), 'rejected': len(stages) - len(used)}
+    if fit_slope:
+        if not roughness:
+            raise ValueError('The section roughness is required to fit the slope.')
+        root_slope = _least_squares_scale([k / roughness for k in used_factors], used_discharges)
+        if not root_slope:
+            raise ValueError('The observations do not determine the slope.')
+        slope = root_slope ** 2
+    else:
+        if not slope:
+            raise ValueError('The section slope is required to fit the roughness.')
+        scale = _least_squares_scale([k * math.sqrt(slope) for k in used_factors], used_discharges)
+        if not scale:
+            raise ValueError('The observations do not determine the roughness.')
+        roughness = 1.0 / scale
+    result['roughness'] = roughness
+    result['slope'] = slope
+
+    # Roughness of every observation, per band when bands are given
+    per_observation = [roughness] * len(used)
+    if bands:
+        edges = [-math.inf] + list(bands) + [math.inf]
+        members = [[] for _ in range(len(edges) - 1)]
+        for i, stage in enumerate(used_stages):
+            members[bisect_left(bands, stage)].append(i)
+
+        result['bands'] = []
+        for b, indices in enumerate(members):
+            scale = _least_squares_scale([used_factors[i] * math.sqrt(slope) for i in indices],
+                                         [used_discharges[i] for i in indices])
+            band_roughness = 1.0 / scale if scale else None
+            for i in indices:
+                per_observation[i] = band_roughness
+            result['bands'].append({'lower': edges[b], 'upper': edges[b + 1],
+                                    'roughness': band_roughness, 'count': len(indices)})
+
+    root_slope = math.sqrt(slope)
+    squares = 0.0
+    for k, q, n in zip(used_factors, used_discharges, per_observation):
+        squares += (k * root_slope / n - q) ** 2
+    result['rmse'] = math.sqrt(squares / len(used))
+
+    return result
+
+
+def _calibrate_job(args):
+    site_id, section, stages, discharges, bands, fit_slope = args
+    try:
+        return site_id, calibrate_site(section, stages, discharges, bands, fit_slope)
+    except ValueError as e:
+        return site_id, {'error': str(e)}
+
+
+def calibrate_sites(sites, bands=None, fit_slope: bool = False, workers: int = 1):
+    """
+    Calibrates many gauged sites, in parallel processes when workers > 1.
+
+    Args:
+        sites (dict): site id to a (section, stages, discharges) tuple
+        bands (list): stage breakpoints, see calibrate_site
+        fit_slope (bool): fit slopes instead of roughnesses
+        workers (int): number of processes
+
+    Returns:
+        dict: site id to its calibration result, or to a dict with an
+        'error' message when the site could not be calibrated
+    """
+    jobs = [(site_id, section, stages, discharges, bands, fit_slope)
+            for site_id, (section, stages, discharges) in sites.items()]
+
+    return dict(map_jobs(_calibrate_job, jobs, workers))
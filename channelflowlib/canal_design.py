@@ -0,0 +1,160 @@
+import math
+
+from .constants import GRAVITY_G
+from .geometry import TrapezoidalGeometry
+from .normal_flow import _normal_depth
+from .utils import map_jobs
+
+
+def _base_widths(discharge, roughness, slope, num_widths=60):
+    """
+    Geometric grid of bottom widths around the hydraulic length scale
+    (Q n / S^0.5)^(3/8) of the canal.
+    """
+    scale = (discharge * roughness / math.sqrt(slope)) ** 0.375
+    low = math.log(0.1 * scale)
+    step = (math.log(10.0 * scale) - low) / (num_widths - 1)
+    return [math.exp(low + i * step) for i in range(num_widths)]
+
+
+def pareto_front(designs):
+    """
+    Designs not dominated in excavation and lining quantities, sorted by
+    increasing excavation.
+    """
+    front = []
+    best_lining = math.inf
+    for design in sorted(designs, key=lambda d: (d['excavation'], d['lining'])):
+        if design['lining'] < best_lining:
+            front.append(design)
+            best_lining = design['lining']
+    return front
+
+
+def design_canal(discharge: float, roughness: float, slope: float,
+                 side_slopes=(1.0, 1.5, 2.0), base_widths=None,
+                 min_velocity: float = 0.6, max_velocity: float = 2.5,
+                 max_froude: float = 0.8, freeboard: float = 0.3, freeboard_ratio: float = 0.0,
+                 excavation_cost: float = 1.0, lining_cost: float = 1.0):
+    """
+    Searches trapezoidal canal sections carrying a discharge at normal depth.
+
+    For each side slope the bottom widths are swept from narrow to wide. The
+    normal depth decreases with the width, so the depth of the previous width
+    brackets the next root. The velocity peaks at the best hydraulic section:
+    a side slope whose best section is too slow is skipped without a sweep,
+    and the sweep stops at the first width past the best section whose
+    velocity falls below min_velocity.
+
+    Every feasible design is measured by its excavation (cross-section area
+    to the top of the freeboard, m^2 per m) and its lining (wetted perimeter
+    to the same level, m per m). The Pareto set over these two quantities
+    holds the cheapest design for any positive unit costs.
+
+    Args:
+        discharge (float): design discharge (cms)
+        roughness (float): Manning's roughness of the lining
+        slope (float): canal bed slope
+        side_slopes (list): candidate side slopes (horizontal per vertical)
+        base_widths (list): candidate bottom widths (m), a geometric grid
+            around the hydraulic length scale if None
+        min_velocity (float): minimum velocity against silting (m/s)
+        max_velocity (float): maximum velocity against scour (m/s)
+        max_froude (float): maximum Froude number
+        freeboard (float): minimum freeboard (m)
+        freeboard_ratio (float): minimum freeboard as a fraction of the depth
+        excavation_cost (float): cost per m^3 of excavation
+        lining_cost (float): cost per m^2 of lining
+
+    Returns:
+        dict: 'pareto' designs, the 'best' design by cost (None if nothing is
+        feasible), and the numbers of 'evaluated' and 'feasible' designs
+    """
+    if base_widths is None:
+        base_widths = _base_widths(discharge, roughness, slope)
+    base_widths = sorted(base_widths)
+
+    feasible = []
+    evaluated = 0
+    for m in side_slopes:
+        side_factor = 2 * math.sqrt(1 + m * m)
+
+        # Best hydraulic section, b = 2 y (sqrt(1 + m^2) - m) and R = y / 2,
+        # the fastest canal of this side slope
+        shape = side_factor - m
+        best_depth = (discharge * roughness / (math.sqrt(slope) * shape * 2 ** (-2.0 / 3.0))) ** 0.375
+        best_base = (side_factor - 2 * m) * best_depth
+        evaluated += 1
+        if discharge / (shape * best_depth ** 2) < min_velocity:
+            continue
+
+        upper = None
+        for b in base_widths:
+            geometry = TrapezoidalGeometry(b, m)
+            y = _normal_depth(geometry, discharge, roughness, slope, upper)
+            if y is None:
+                y = _normal_depth(geometry, discharge, roughness, slope)
+            evaluated += 1
+            upper = y
+
+            area = (b + m * y) * y
+            velocity = discharge / area
+            if velocity < min_velocity:
+                if b > best_base:
+                    # Wider canals are slower still
+                    break
+                continue
+            if velocity > max_velocity:
+                continue
+            froude = velocity / math.sqrt(GRAVITY_G * area / (b + 2 * m * y))
+            if froude > max_froude:
+                continue
+
+            total_depth = y + max(freeboard, freeboard_ratio * y)
+            excavation = (b + m * total_depth) * total_depth
+            lining = b + side_factor * total_depth
+            feasible.append({
+                'base': b,
+                'side_slope': m,
+                'water_depth': y,
+                'total_depth': total_depth,
+                'top_width': b + 2 * m * total_depth,
+                'velocity': velocity,
+                'froude_number': froude,
+                'excavation': excavation,
+                'lining': lining,
+                'cost': excavation_cost * excavation + lining_cost * lining
+            })
+
+    return {
+        'pareto': pareto_front(feasible),
+        'best': min(feasible, key=lambda d: d['cost']) if feasible else None,
+        'evaluated': evaluated,
+        'feasible': len(feasible)
+    }
+
+
+def _design_job(args):
+    segment, options = args
+    options = dict(options)
+    options.update(segment.get('options', {}))
+    result = design_canal(segment['discharge'], segment['roughness'], segment['slope'], **options)
+    result['id'] = segment.get('id')
+    return result
+
+
+def design_canals(segments, workers: int = 1, **options):
+    """
+    Designs many canal segments, in parallel processes when workers > 1.
+
+    Args:
+        segments (list): dicts with discharge, roughness, slope, an optional
+            id and optional 'options' overriding the common ones
+        workers (int): number of processes
+        **options: keyword arguments of design_canal shared by all segments
+
+    Returns:
+        list: design_canal results in segment order, each with the segment id
+    """
+    jobs = [(segment, options) for segment in segments]
+    return map_jobs(_design_job, jobs, workers)
@@ -0,0 +1,221 @@
+"""
+Command-line batch tool: ``channelflow [jobs-file]``
+
+Reads one job per line (JSON-lines) or per row (CSV) from a file or stdin,
+solves it and writes one JSON result per line to stdout as soon as it is
+available. A JSON job looks like::
+
+    {"id": 1, "shape": "trapezoidal", "unknown": "discharge",
+     "inputs": {"channel_slope": 0.001, "side_slope": 1.0, "channel_base": 1.0,
+                "roughness": 0.015, "water_depth": 0.989}}
+
+Irregular sections carry their survey as ``"points": [[x, y], ...]``. In CSV
+input every column other than id, shape, unknown, unit and points is an input,
+and the points column holds the survey as a JSON list.
+"""
+import argparse
+import csv
+import itertools
+import json
+import sys
+from multiprocessing import Pool
+
+from .exceptions import STATUS_OK, STATUS_INVALID_INPUT
+from .openchannellib import Rectangular, Trapezoidal, Circular, IrregularSection
+
+SETTERS = {
+    'rectangular': {
+        'discharge': 'set_discharge',
+        'channel_slope': 'set_channel_slope',
+        'channel_base': 'set_channel_base',
+        'roughness': 'set_roughness',
+        'water_depth': 'set_water_depth'
+    },
+    'trapezoidal': {
+        'discharge': 'set_discharge',
+        'channel_slope': 'set_channel_slope',
+        'side_slope': 'set_sideslope',
+        'channel_base': 'set_channel_base',
+        'roughness': 'set_roughness',
+        'water_depth': 'set_water_depth'
+    },
+    'circular': {
+        'slope': 'set_slope',
+        'diameter': 'set_diameter',
+        'roughness': 'set_roughness',
+        'water_depth': 'set_water_depth'
+    },
+    'irregular': {
+        'roughness': 'set_average_rougness',
+        'bed_slope': 'set_bed_slope',
+        'water_elevation': 'set_water_elevation'
+    }
+}
+
+OUTPUTS = ('discharge', 'velocity', 'wetted_area', 'wetted_perimeter', 'hydraulic_radius',
+           'water_depth', 'channel_base', 'channel_slope', 'top_width', 'froude_number')
+
+RESERVED_COLUMNS = ('id', 'shape', 'unknown', 'unit', 'points')
+
+
+def solve_job(job):
+    """
+    Solves one job record and returns its result record.
+
+    Args:
+        job (dict): job with 'shape', 'inputs' and, depending on the shape,
+            'unknown', 'unit' and 'points'
+
+    Returns:
+        dict: the job id and a status code (0 when solved) with the computed
+        hydraulic elements, or with an 'error' message if the job could not
+        be solved. Records the readers could not parse are returned as they
+        are.
+    """
+    if 'error' in job:
+        return job
+
+    result = {'id': job.get('id'), 'status': STATUS_OK}
+    try:
+        shape = job['shape']
+        if shape not in SETTERS:
+            raise ValueError('Unknown shape: ' + str(shape))
+
+        if shape == 'rectangular':
+            section = Rectangular(unknown=job.get('unknown', 'water_depth'), unit=job.get('unit', 'metric'))
+        elif shape == 'trapezoidal':
+            section = Trapezoidal(unknown=job.get('unknown', 'water_depth'), unit=job.get('unit', 'metric'))
+        elif shape == 'circular':
+            section = Circular()
+        else:
+            section = IrregularSection(tuple(tuple(point) for point in job['points']))
+
+        setters = SETTERS[shape]
+        for name, value in job.get('inputs', {}).items():
+            if name not in setters:
+                raise ValueError('Unknown input for ' + shape + ': ' + name)
+            getattr(section, setters[name])(value)
+
+        if shape == 'circular':
+            section.calculate_discharge()
+        else:
+            section.analyze()
+
+        for name in OUTPUTS:
+            if hasattr(section, name):
+                result[name] = getattr(section, name)
+        if getattr(section, 'critical_flow', None) is not None:
+            result['critical_flow'] = section.critical_flow
+    except Exception as e:
+        result['status'] = getattr(e, 'status', STATUS_INVALID_INPUT)
+        result['error'] = '{}: {}'.format(type(e).__name__, e)
+
+    return result
+
+
+def _parse_error(line_number, error, job_id=None):
+    """
+    Result record of an input record that could not be parsed.
+    """
+    return {'id': job_id, 'line': line_number, 'status': STATUS_INVALID_INPUT,
+            'error': '{}: {}'.format(type(error).__name__, error)}
+
+
+def read_jsonl(stream):
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError('A job must be a JSON object.')
+        except ValueError as e:
+            yield _parse_error(line_number, e)
+            continue
+        yield job
+
+
+def read_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        job = {'inputs': {}}
+        try:
+            for name, value in row.items():
+                if value is None or value == '':
+                    continue
+                if name == 'points':
+                    job['points'] = json.loads(value)
+                elif name in RESERVED_COLUMNS:
+                    job[name] = value
+                else:
+                    job['inputs'][name] = float(value)
+        except (TypeError, ValueError) as e:
+            yield _parse_error(reader.line_num, e, row.get('id'))
+            continue
+        yield job
+
+
+def run(jobs, output, workers: int = 1, batch_size: int = 1000):
+    """
+    Solves a stream of jobs and writes the results as JSON lines.
+
+    Jobs are consumed in batches of batch_size, so memory use does not grow
+    with the length of the stream. Results keep the order of the jobs.
+
+    Args:
+        jobs: iterable of job dicts
+        output: text stream the results are written to
+        workers (int): number of worker processes, 1 solves in this process
+        batch_size (int): number of jobs held in memory at a time
+    """
+    jobs = iter(jobs)
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        while True:
+            batch = list(itertools.islice(jobs, batch_size))
+            if not batch:
+                break
+            if pool is not None:
+                results = pool.imap(solve_job, batch, chunksize=max(1, len(batch) // (workers * 4)))
+            else:
+                results = map(solve_job, batch)
+            for result in results:
+                output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='channelflow',
+                                     description='Solve open channel flow jobs in batch.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='job file, JSON-lines or CSV (default: stdin)')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'csv'),
+                        help='input format (default: from the file extension, else jsonl)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('-b', '--batch-size', type=int, default=1000,
+                        help='jobs held in memory at a time (default: 1000)')
+    args = parser.parse_args(argv)
+
+    input_format = args.format
+    if input_format is None:
+        input_format = 'csv' if args.input.lower().endswith('.csv') else 'jsonl'
+
+    stream = sys.stdin if args.input == '-' else open(args.input, newline='')
+    try:
+        reader = read_csv if input_format == 'csv' else read_jsonl
+        run(reader(stream), sys.stdout, workers=args.workers, batch_size=args.batch_size)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import math
+
+from .constants import GRAVITY_G
+from .geometry import SectionGeometry, as_geometry, section_parameters
+from .normal_flow import _full_conveyance_depth
+from .roots import find_root
+from .utils import is_sequence
+
+
+def continuation(f, parameters, lower: float = 0.0, upper: float = None):
+    """
+    Solves f(y, p) = 0 for each parameter p of a sweep, warm-starting every
+    solve from the previous solutions.
+
+    A secant predictor extrapolates the last two solutions to the next
+    parameter and secant iterations correct the prediction, so neighbouring
+    parameters cost only a few evaluations each. A bracketed solve around
+    the prediction takes over if the iterations leave the range.
+
+    f must increase with y on [lower, upper]. Keeping upper below a turning
+    point (e.g. the maximum conveyance of a pipe) keeps the sweep on one
+    branch of solutions.
+
+    Args:
+        f: function of the unknown and the parameter
+        parameters (sequence): parameter values, ideally in order
+        lower (float): lower limit of the unknown
+        upper (float): upper limit of the unknown, searched by doubling if None
+
+    Returns:
+        tuple: list of solutions (None where f stays negative up to upper,
+        lower where f is already positive there) and the total number of
+        evaluations of f
+    """
+    solutions = []
+    evaluations = 0
+    history = []
+
+    for p in parameters:
+        def g(y):
+            nonlocal evaluations
+            evaluations += 1
+            return f(y, p)
+
+        if not history:
+            # Cold start over the whole range
+            a = lower
+            g_a = g(a)
+            if upper is None:
+                b = max(2.0 * lower, 1.0)
+                g_b = g(b)
+                while g_b < 0:
+                    b *= 2.0
+                    g_b = g(b)
+            else:
+                b = upper
+                g_b = g(b)
+            if g_b < 0:
+                solutions.append(None)
+                continue
+            if g_a >= 0:
+                y = a
+            elif g_b == 0:
+                y = b
+            else:
+                y = find_root(g, a, b, g_a, g_b)
+        else:
+            y = _correct(g, history, p, lower, upper)
+            if y is None:
+                solutions.append(None)
+                history = []
+                continue
+
+        solutions.append(y)
+        history = history[-1:] + [(p, y)]
+
+    return solutions, evaluations
+
+
+def _correct(g, history, p, lower, upper, tolerance=1e-10, max_iterations=8):
+    """
+    Predictor-corrector step of continuation: secant prediction from the last
+    two solutions, secant iterations from the prediction and the previous
+    solution, and a bracketed solve around the prediction if they fail.
+    """
+    p1, y1 = history[-1]
+    if len(history) > 1 and history[-2][0] != p1:
+        p0, y0 = history[-2]
+        prediction = y1 + (y1 - y0) * (p - p1) / (p1 - p0)
+    else:
+        prediction = y1
+    if prediction <= lower or (upper is not None and prediction >= upper):
+        prediction = y1
+
+    # Corrector
+    x0, g0 = y1, g(y1)
+    if prediction == y1:
+        x1 = y1 * (1 + 1e-3) + 1e-9
+        if upper is not None:
+            x1 = min(x1, upper)
+    else:
+        x1 = prediction
+    g1 = g(x1)
+    for _ in range(max_iterations):
+        if g1 == 0:
+            return x1
+        if g1 == g0:
+            break
+        x2 = x1 - g1 * (x1 - x0) / (g1 - g0)
+        if x2 < lower or (upper is not None and x2 > upper):
+            break
+        if abs(x2 - x1) <= tolerance * max(1.0, abs(x2)):
+            return x2
+        x0, g0 = x1, g1
+        x1, g1 = x2, g(x2)
+
+    # Safeguard: bracket grown around the prediction
+    step = max(abs(prediction - y1), 1e-3 * max(y1, 1e-3))
+    a = max(lower, prediction - step)
+    g_a = g(a)
+    while g_a > 0 and a > lower:
+        step *= 2.0
+        a = max(lower, prediction - step)
+        g_a = g(a)
+    if g_a >= 0:
+        return a
+    b = prediction + step if upper is None else min(upper, prediction + step)
+    g_b = g(b)
+    while g_b < 0 and (upper is None or b < upper):
+        step *= 2.0
+        b = prediction + step if upper is None else min(upper, prediction + step)
+        g_b = g(b)
+    if g_b < 0:
+        return None
+    if g_b == 0:
+        return b
+    return find_root(g, a, b, g_a, g_b)
+
+
+def _sweep_parameters(discharges, roughnesses, slopes):
+    """
+    Q n / S^0.5 of every point of a sweep over one or more sequences.
+    """
+    lengths = [len(v) for v in (discharges, roughnesses, slopes) if is_sequence(v)]
+    if not lengths:
+        raise ValueError('At least one of discharge, roughness or slope must be a sequence.')
+    if len(set(lengths)) > 1:
+        raise ValueError('Sequences must have the same length.')
+
+    def values(v):
+        return v if is_sequence(v) else [v] * lengths[0]
+
+    return [q * n / math.sqrt(s) for q, n, s in zip(values(discharges), values(roughnesses), values(slopes))]
+
+
+def sweep_normal_depth(section, discharge, roughness=None, slope=None):
+    """
+    Normal depths along a sweep of discharge, roughness or slope, any of which
+    may be a sequence.
+
+    Args:
+        section: geometry object or section class instance
+        discharge: discharge (cms) or sequence of discharges
+        roughness: Manning's n or a sequence, from the section if None
+        slope: bed slope or a sequence, from the section if None
+
+    Returns:
+        list: normal depths (m), None above the capacity of a closed section
+    """
+    if isinstance(section, SectionGeometry):
+        geometry = section
+    else:
+        geometry, n, s = section_parameters(section)
+        roughness = n if roughness is None else roughness
+        slope = s if slope is None else slope
+
+    upper = _full_conveyance_depth(geometry) if geometry.max_depth is not None else None
+    solutions, evaluations = continuation(lambda y, target: geometry.conveyance(y) - target,
+                                          _sweep_parameters(discharge, roughness, slope), 0.0, upper)
+    return solutions
+
+
+def sweep_critical_depth(section, discharges):
+    """
+    Critical depths along a sweep of discharges.
+
+    Args:
+        section: geometry object or section class instance
+        discharges (sequence): discharges (cms)
+
+    Returns:
+        list: critical depths (m)
+    """
+    geometry = as_geometry(section)
+
+    def f(y, k):
+        return 1.0 - k * geometry.top_width(y) / geometry.area(y) ** 3
+
+    solutions, evaluations = continuation(f, [q * q / GRAVITY_G for q in discharges], 1e-9, geometry.max_depth)
+    return solutions
+
+
+def sweep_base_width(discharge, roughness, slope, water_depth: float, side_slope: float = 0.0):
+    """
+    Bottom widths of a rectangular or trapezoidal channel carrying the flow at
+    a fixed normal depth, along a sweep of discharge, roughness or slope.
+
+    Returns:
+        list: bottom widths (m)
+    """
+    y = water_depth
+    side = 2 * y * math.sqrt(1 + side_slope ** 2)
+
+    def f(b, target):
+        a = (b + side_slope * y) * y
+        return a * (a / (b + side)) ** (2.0 / 3.0) - target
+
+    solutions, evaluations = continuation(f, _sweep_parameters(discharge, roughness, slope), 0.0)
+    return solutions
@@ -0,0 +1,112 @@
+import math
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+from .geometry import as_geometry
+from .utils import interpolate
+
+
+class ConveyanceCurve:
+    """
+    Geometric conveyance A R^(2/3) of a section tabulated against depth.
+
+    Manning's discharge is Q = A R^(2/3) S^0.5 / n, so once the geometric
+    part is tabulated any roughness and slope scenario only scales the curve
+    and the section geometry is never evaluated again.
+
+    Args:
+        depths (array): increasing flow depths (m)
+        factors (array): A R^(2/3) at each depth
+    """
+
+    def __init__(self, depths, factors):
+        self.depths = array('d', depths)
+        self.factors = array('d', factors)
+
+        self.peak_index = max(range(len(self.factors)), key=self.factors.__getitem__)
+
+        # Running maximum of the factors. It never decreases, so a bisection
+        # on it finds the first depth reaching a conveyance even where the
+        # curve dips, e.g. when an overbank bench starts to flood
+        self._envelope = array('d', accumulate(self.factors, max))
+
+    @classmethod
+    def from_section(cls, section, depths=None, num_points: int = 100):
+        """
+        Tabulates a section.
+
+        Args:
+            section: geometry object or section class instance
+            depths (list): depths to tabulate, num_points depths up to the
+                full depth of the section if None
+            num_points (int): number of depths when depths is None
+        """
+        geometry = as_geometry(section)
+        if depths is None:
+            if geometry.max_depth is None:
+                raise ValueError('Depths are required for open sections.')
+            depths = [geometry.max_depth * i / (num_points - 1) for i in range(num_points)]
+        return cls(depths, geometry.conveyance(depths))
+
+    def factor(self, depth: float):
+        """
+        A R^(2/3) at a depth, interpolated linearly between tabulated depths.
+        """
+        depths = self.depths
+        if depth < depths[0] or depth > depths[-1]:
+            raise ValueError('Depth outside the conveyance curve.')
+        return interpolate(depth, depths, self.factors)
+
+    def discharge(self, depth: float, roughness: float, slope: float):
+        """
+        Manning discharge (cms) at a depth.
+        """
+        return self.factor(depth) * math.sqrt(slope) / roughness
+
+    def normal_depth(self, discharge: float, roughness: float, slope: float):
+        """
+        Lowest depth (m) at which the curve carries the discharge, None if it
+        exceeds the largest tabulated conveyance. Curves that are not
+        monotone, like closed conduits past their peak or sections with
+        overbank benches, are resolved to the first crossing.
+        """
+        target = discharge * roughness / math.sqrt(slope)
+        envelope = self._envelope
+        if target > envelope[-1]:
+            return None
+        i = max(1, bisect_left(envelope, target))
+        factors = self.factors
+        k1 = factors[i - 1]
+        k2 = factors[i]
+        d1 = self.depths[i - 1]
+        d2 = self.depths[i]
+        if k2 == k1:
+            return d1
+        return d1 + (d2 - d1) * (target - k1) / (k2 - k1)
+
+    def scenario_cube(self, roughnesses, slopes, depths=None):
+        """
+        Discharges for every combination of roughness, slope and depth.
+
+        The geometry enters only through the tabulated factors: each of the
+        n x S scenarios scales one row of factors.
+
+        Args:
+            roughnesses (list): Manning's roughness coefficients
+            slopes (list): bed slopes
+            depths (list): depths to evaluate, the tabulated depths if None
+
+        Returns:
+            list: cube[i][j][k] discharge (cms) for roughness i, slope j and
+            depth k, each row an array of doubles
+        """
+        if depths is None:
+            factors = self.factors
+        else:
+            factors = array('d', [self.factor(y) for y in depths])
+
+        root_slopes = [math.sqrt(s) for s in slopes]
+        return [[array('d', [k * scale for k in factors])
+                 for scale in [r / n for r in root_slopes]]
+                for n in roughnesses]
@@ -1,5 +1,6 @@
 import math
 
+from . import kernels
 from .constants import GRAVITY_G
 
 
@@ -42,19 +43,9 @@ def solve_critical_flow_trapezoidal(discharge: float,
                                     velocity: float):
     Q2g = pow(discharge, 2.0) / GRAVITY_G
 
-    tester = 0.0
-
-    # Critical depth
-    critical_depth = 0.0
-
-    # Critical area, perimeter, hydraulic radius, critical slope
-    critical_flow_area = 0.0
-
-    while tester < Q2g:
-        critical_depth += 0.00001
-        top_width = channel_base + 2 * side_slope * critical_depth
-        critical_flow_area = (top_width + channel_base) / 2 * critical_depth
-        tester = pow(critical_flow_area, 3) / top_width
+    # Critical depth and area
+    critical_depth, critical_flow_area = kernels.call('critical_depth_trapezoidal',
+                                                      Q2g, channel_base, side_slope, 0.00001)
 
     critical_wetted_perimeter = 2 * critical_depth * math.sqrt(pow(side_slope, 2) + 1) + channel_base
     critical_hydraulic_radius = critical_flow_area / critical_wetted_perimeter
@@ -118,59 +109,9 @@ def solve_critical_flow_circular(discharge: float,
     # Q ^ 2 / g
     Q2g = pow(discharge, 2) / GRAVITY_G
 
-    # Other side of equation
-    tester = 0.0
-
-    # Critical depth
-    critical_depth = 0.0
-
-    # Critical area, perimeter, hydraulic radius, critical slope
-    critical_flow_area = 0.0
-    Pc = 0.0
-    critical_hydraulic_radius = 0.0
-    critical_slope = 0.0
-
-    # Top width
-    T = 0.0
-
-    # Angle of water edges from the center
-    thetaC = 0.0
-
-    # Triangle at critical flow
-    aTriC = 0.0
-
-    # Sector at critical flow
-    aSecC = 0.0
-
-    while tester < Q2g:
-        critical_depth += 0.00001
-
-        # Calculate theta
-        if critical_depth > (diameter / 2.0):
-            # Almost full
-            thetaC = 2 * math.acos((2 * critical_depth - diameter) / diameter) * 180.0 / math.pi
-        else:
-            # Less than half full
-            thetaC = 2 * math.acos((diameter - 2 * critical_depth) / diameter) * 180.0 / math.pi
-
-        # Calculate area of triangle
-        aTriC = pow(diameter, 2) * math.sin(thetaC * math.pi / 180) / 8
-
-        T = solve_top_width_circular(y=critical_depth,
-                                     diameter=diameter)
-
-        # Calculate area of sector
-        if critical_depth > (diameter / 2):
-            aSecC = math.pi * pow(diameter, 2) * (360 - thetaC) / 1440
-            critical_flow_area = aSecC + aTriC
-            Pc = math.pi * diameter * (360 - thetaC) / 360
-        else:
-            aSecC = thetaC * math.pi * pow(diameter, 2) / 1440
-            critical_flow_area = aSecC - aTriC
-            Pc = math.pi * diameter * thetaC / 360
-
-        # Compare the equation for equality
-        tester = pow(critical_flow_area, 3) / T
+    # Critical depth, area and perimeter
+    critical_depth, critical_flow_area, Pc = kernels.call('critical_depth_circular',
+                                                          Q2g, diameter, 0.00001)
 
     # Wetted properties
     theta = 0.0
@@ -0,0 +1,200 @@
+import math
+
+from .constants import GRAVITY_G
+from .continuation import sweep_critical_depth
+from .energy import critical_depth
+from .geometry import CircularGeometry, RectangularGeometry
+from .utils import is_sequence, map_jobs
+
+# Unit conversion of the HDS-5 inlet control equations (1.0 in US units)
+KU = 1.811
+
+# Q / (A D^0.5) limits of the unsubmerged and submerged inlet equations
+UNSUBMERGED_LIMIT = 3.5 / KU
+SUBMERGED_LIMIT = 4.0 / KU
+
+# HDS-5 form 1 inlet control constants K, M, c, Y and the slope correction
+# Ks (-0.5, or +0.7 for mitered inlets)
+INLETS = {
+    'concrete_pipe_square_edge_headwall': {'K': 0.0098, 'M': 2.0, 'c': 0.0398, 'Y': 0.67, 'Ks': -0.5},
+    'concrete_pipe_groove_end_headwall': {'K': 0.0018, 'M': 2.0, 'c': 0.0292, 'Y': 0.74, 'Ks': -0.5},
+    'concrete_pipe_groove_end_projecting': {'K': 0.0045, 'M': 2.0, 'c': 0.0317, 'Y': 0.69, 'Ks': -0.5},
+    'cmp_headwall': {'K': 0.0078, 'M': 2.0, 'c': 0.0379, 'Y': 0.69, 'Ks': -0.5},
+    'cmp_mitered': {'K': 0.0210, 'M': 1.33, 'c': 0.0463, 'Y': 0.75, 'Ks': 0.7},
+    'cmp_projecting': {'K': 0.0340, 'M': 1.50, 'c': 0.0553, 'Y': 0.54, 'Ks': -0.5},
+    'box_wingwall_30_75': {'K': 0.026, 'M': 1.0, 'c': 0.0347, 'Y': 0.81, 'Ks': -0.5},
+    'box_wingwall_90_15': {'K': 0.061, 'M': 0.75, 'c': 0.0400, 'Y': 0.80, 'Ks': -0.5},
+    'box_wingwall_0': {'K': 0.061, 'M': 0.75, 'c': 0.0423, 'Y': 0.82, 'Ks': -0.5},
+}
+
+INLET = 'inlet'
+OUTLET = 'outlet'
+
+
+class Culvert:
+    """
+    Pipe or box culvert with inlet and outlet control headwater, after the
+    FHWA HDS-5 methods in SI units. Headwater is measured from the inlet
+    invert and tailwater from the outlet invert.
+
+    Args:
+        length (float): barrel length (m)
+        slope (float): barrel slope
+        roughness (float): Manning's roughness of the barrel
+        diameter (float): pipe diameter (m), for circular barrels
+        span (float): box width (m), for box barrels
+        rise (float): box height (m), for box barrels
+        inlet (str): inlet type, a key of INLETS
+        entrance_loss (float): entrance loss coefficient ke
+        barrels (int): number of identical barrels sharing the flow
+    """
+
+    def __init__(self, length: float, slope: float, roughness: float,
+                 diameter: float = None, span: float = None, rise: float = None,
+                 inlet: str = 'concrete_pipe_square_edge_headwall',
+                 entrance_loss: float = 0.5, barrels: int = 1):
+        if inlet not in INLETS:
+            raise ValueError('Unknown inlet type: ' + str(inlet))
+
+        if diameter is not None:
+            self.geometry = CircularGeometry(diameter)
+            self.rise = diameter
+            self.full_area = math.pi * diameter ** 2 / 4.0
+            self.full_perimeter = math.pi * diameter
+        elif span is not None and rise is not None:
+            self.geometry = RectangularGeometry(span)
+            self.rise = rise
+            self.full_area = span * rise
+            self.full_perimeter = 2.0 * (span + rise)
+        else:
+            raise ValueError('Give a diameter, or a span and a rise.')
+
+        self.length = length
+        self.slope = slope
+        self.roughness = roughness
+        self.inlet = inlet
+        self.entrance_loss = entrance_loss
+        self.barrels = barrels
+
+        radius = self.full_area / self.full_perimeter
+        self._loss_factor = 1 + entrance_loss + 2 * GRAVITY_G * roughness ** 2 * length / radius ** (4.0 / 3.0)
+        self._transition = None
+
+    def _critical(self, q, dc=None):
+        """
+        Critical depth in the barrel, at most the rise, and the specific
+        energy at that depth.
+        """
+        if dc is None:
+            dc = critical_depth(self.geometry, q)
+        dc = min(dc, self.rise)
+        vc = q / self.geometry.area(dc)
+        return dc, dc + vc * vc / (2 * GRAVITY_G)
+
+    def _unsubmerged(self, q, x, dc=None):
+        constants = INLETS[self.inlet]
+        dc, hc = self._critical(q, dc)
+        return self.rise * (hc / self.rise + constants['K'] * (KU * x) ** constants['M'] + constants['Ks'] * self.slope)
+
+    def _submerged(self, x):
+        constants = INLETS[self.inlet]
+        return self.rise * (constants['c'] * (KU * x) ** 2 + constants['Y'] + constants['Ks'] * self.slope)
+
+    def _inlet(self, q, dc=None):
+        if q <= 0:
+            return 0.0
+        scale = self.full_area * math.sqrt(self.rise)
+        x = q / scale
+        if x <= UNSUBMERGED_LIMIT:
+            return self._unsubmerged(q, x, dc)
+        if x >= SUBMERGED_LIMIT:
+            return self._submerged(x)
+        if self._transition is None:
+            self._transition = (self._unsubmerged(UNSUBMERGED_LIMIT * scale, UNSUBMERGED_LIMIT),
+                                self._submerged(SUBMERGED_LIMIT))
+        low, high = self._transition
+        return low + (high - low) * (x - UNSUBMERGED_LIMIT) / (SUBMERGED_LIMIT - UNSUBMERGED_LIMIT)
+
+    def _outlet(self, q, tailwater, dc=None):
+        if q <= 0:
+            return max(tailwater - self.length * self.slope, 0.0)
+        v = q / self.full_area
+        dc, hc = self._critical(q, dc)
+        h0 = max(tailwater, (dc + self.rise) / 2.0)
+        return h0 + self._loss_factor * v * v / (2 * GRAVITY_G) - self.length * self.slope
+
+    def inlet_control(self, discharge: float):
+        """
+        Inlet control headwater (m) with the unsubmerged form 1 and the
+        submerged equations, interpolated linearly between their limits.
+        """
+        return self._inlet(discharge / self.barrels)
+
+    def outlet_control(self, discharge: float, tailwater: float = 0.0):
+        """
+        Outlet control headwater (m) for a barrel flowing full,
+        HW = h0 + (1 + ke + 2 g n^2 L / R^(4/3)) V^2 / 2g - L S, with
+        h0 = max(TW, (dc + D) / 2).
+        """
+        return self._outlet(discharge / self.barrels, tailwater)
+
+    def performance(self, discharges, tailwaters=0.0):
+        """
+        Performance curve over a sequence of discharges. The critical depths
+        of the whole curve are solved in one continuation sweep.
+
+        Args:
+            discharges (sequence): total discharges (cms)
+            tailwaters: tailwater depth (m), or a sequence with one per discharge
+
+        Returns:
+            dict: 'discharge', 'inlet' and 'outlet' headwaters, the controlling
+            'headwater' and the 'control' ('inlet' or 'outlet') per discharge
+        """
+        if not is_sequence(tailwaters):
+            tailwaters = [tailwaters] * len(discharges)
+        elif len(tailwaters) != len(discharges):
+            raise ValueError('One tailwater per discharge is required.')
+
+        flows = [q / self.barrels for q in discharges]
+        positive = [q for q in flows if q > 0]
+        depths = iter(sweep_critical_depth(self.geometry, positive) if positive else [])
+        critical = [next(depths) if q > 0 else 0.0 for q in flows]
+
+        inlet = [self._inlet(q, dc) for q, dc in zip(flows, critical)]
+        outlet = [self._outlet(q, tw, dc) for q, tw, dc in zip(flows, tailwaters, critical)]
+        return {
+            'discharge': list(discharges),
+            'inlet': inlet,
+            'outlet': outlet,
+            'headwater': [max(hi, ho) for hi, ho in zip(inlet, outlet)],
+            'control': [INLET if hi >= ho else OUTLET for hi, ho in zip(inlet, outlet)]
+        }
+
+
+def _performance_job(args):
+    key, culvert, discharges, tailwaters = args
+    return key, culvert.performance(discharges, tailwaters)
+
+
+def performance_curves(culverts, discharges, tailwaters=0.0, workers: int = 1):
+    """
+    Performance curves of many culverts over the same discharges, in
+    parallel processes when workers > 1.
+
+    Args:
+        culverts: list of Culvert instances, or a dict of id to Culvert
+        discharges (sequence): total discharges (cms)
+        tailwaters: tailwater depth (m), or a sequence with one per discharge
+        workers (int): number of processes
+
+    Returns:
+        list or dict: Culvert.performance results, keyed like culverts
+    """
+    items = culverts.items() if isinstance(culverts, dict) else enumerate(culverts)
+    jobs = [(key, culvert, discharges, tailwaters) for key, culvert in items]
+    results = dict(map_jobs(_performance_job, jobs, workers))
+
+    if isinstance(culverts, dict):
+        return results
+    return [results[i] for i in range(len(jobs))]
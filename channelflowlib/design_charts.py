@@ -0,0 +1,148 @@
+import json
+import math
+import sys
+from array import array
+from bisect import bisect_right
+
+from .constants import GRAVITY_G
+from .utils import interpolate
+
+MAGIC = 'channelflowlib-design-chart'
+
+
+def normal_flow_parameter(depth_ratio: float, side_slope: float):
+    """
+    Q n / (S^0.5 b^(8/3)) of a trapezoidal channel flowing at y/b = depth_ratio.
+    """
+    area = depth_ratio * (1 + side_slope * depth_ratio)
+    perimeter = 1 + 2 * depth_ratio * math.sqrt(1 + side_slope ** 2)
+    return area ** (5.0 / 3.0) / perimeter ** (2.0 / 3.0)
+
+
+def critical_flow_parameter(depth_ratio: float, side_slope: float):
+    """
+    Q / (g^0.5 b^(5/2)) of a trapezoidal channel with critical depth y/b = depth_ratio.
+    """
+    area = depth_ratio * (1 + side_slope * depth_ratio)
+    top_width = 1 + 2 * side_slope * depth_ratio
+    return area ** 1.5 / top_width ** 0.5
+
+
+class DesignChart:
+    """
+    Dimensionless normal and critical depth surfaces for trapezoidal canals.
+
+    For every side slope the chart stores log(y/b) on a uniform grid together
+    with the logarithms of the normal flow parameter Q n / (S^0.5 b^(8/3)) and
+    the critical flow parameter Q / (g^0.5 b^(5/2)). Queries interpolate in
+    log-log space, and between the two nearest side slopes.
+
+    Args:
+        side_slopes (list): side slopes (horizontal per vertical), increasing
+        log_ratios (array): log(y/b) grid
+        normal (list): array of log normal flow parameters per side slope
+        critical (list): array of log critical flow parameters per side slope
+    """
+
+    def __init__(self, side_slopes, log_ratios, normal, critical):
+        self.side_slopes = list(side_slopes)
+        self.log_ratios = log_ratios
+        self.normal = normal
+        self.critical = critical
+
+    @classmethod
+    def build(cls, side_slopes, num_points: int = 400, min_ratio: float = 1e-3,
+              max_ratio: float = 50.0):
+        """
+        Precomputes the chart for a set of side slopes.
+
+        Args:
+            side_slopes (list): side slopes to tabulate
+            num_points (int): number of y/b values per side slope
+            min_ratio (float): smallest y/b
+            max_ratio (float): largest y/b
+        """
+        side_slopes = sorted(side_slopes)
+        low = math.log(min_ratio)
+        step = (math.log(max_ratio) - low) / (num_points - 1)
+        log_ratios = array('d', [low + i * step for i in range(num_points)])
+
+        normal = []
+        critical = []
+        for m in side_slopes:
+            normal.append(array('d', [math.log(normal_flow_parameter(math.exp(x), m)) for x in log_ratios]))
+            critical.append(array('d', [math.log(critical_flow_parameter(math.exp(x), m)) for x in log_ratios]))
+
+        return cls(side_slopes, log_ratios, normal, critical)
+
+    def save(self, path: str):
+        """
+        Writes the chart as a one-line JSON header followed by raw
+        little-endian doubles.
+        """
+        header = {'format': MAGIC, 'side_slopes': self.side_slopes, 'num_points': len(self.log_ratios)}
+        data = array('d', self.log_ratios)
+        for table in self.normal + self.critical:
+            data.extend(table)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        with open(path, 'wb') as f:
+            f.write((json.dumps(header) + '\n').encode('ascii'))
+            data.tofile(f)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Reads a chart written by save.
+        """
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline().decode('ascii'))
+            if header.get('format') != MAGIC:
+                raise ValueError('Not a design chart file: ' + path)
+            count = header['num_points']
+            num_slopes = len(header['side_slopes'])
+            data = array('d')
+            data.fromfile(f, count * (1 + 2 * num_slopes))
+        if sys.byteorder == 'big':
+            data.byteswap()
+
+        tables = [data[i * count:(i + 1) * count] for i in range(1 + 2 * num_slopes)]
+        return cls(header['side_slopes'], tables[0], tables[1:1 + num_slopes], tables[1 + num_slopes:])
+
+    def _depth_ratio(self, tables, parameter, side_slope):
+        if parameter <= 0:
+            return 0.0
+        slopes = self.side_slopes
+        if side_slope < slopes[0] or side_slope > slopes[-1]:
+            raise ValueError('Side slope outside the chart range.')
+
+        x = math.log(parameter)
+        if len(slopes) == 1:
+            return math.exp(self._interpolate(tables[0], x))
+
+        i = min(bisect_right(slopes, side_slope), len(slopes) - 1)
+        m1 = slopes[i - 1]
+        m2 = slopes[i]
+        r1 = math.exp(self._interpolate(tables[i - 1], x))
+        r2 = math.exp(self._interpolate(tables[i], x))
+        return r1 + (r2 - r1) * (side_slope - m1) / (m2 - m1)
+
+    def _interpolate(self, table, x):
+        if x < table[0] or x > table[-1]:
+            raise ValueError('Flow parameter outside the chart range.')
+        return interpolate(x, table, self.log_ratios)
+
+    def normal_depth(self, discharge: float, roughness: float, slope: float,
+                     base: float, side_slope: float):
+        """
+        Normal depth (m) of a trapezoidal canal read from the chart.
+        """
+        parameter = discharge * roughness / (math.sqrt(slope) * base ** (8.0 / 3.0))
+        return self._depth_ratio(self.normal, parameter, side_slope) * base
+
+    def critical_depth(self, discharge: float, base: float, side_slope: float):
+        """
+        Critical depth (m) of a trapezoidal canal read from the chart.
+        """
+        parameter = discharge / (math.sqrt(GRAVITY_G) * base ** 2.5)
+        return self._depth_ratio(self.critical, parameter, side_slope) * base
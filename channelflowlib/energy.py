@@ -0,0 +1,218 @@
+from .constants import GRAVITY_G
+from .geometry import as_geometry
+from .roots import find_root
+from .utils import is_sequence
+
+
+def _broadcast(*values):
+    """
+    Pairs up scalars and equally long sequences element by element.
+    """
+    length = None
+    for value in values:
+        if is_sequence(value):
+            if length is not None and len(value) != length:
+                raise ValueError('Sequences must have the same length.')
+            length = len(value)
+    if length is None:
+        return None
+    return list(zip(*[value if is_sequence(value) else [value] * length for value in values]))
+
+
+def _upper_depth(geometry, f, start):
+    """
+    Upper end of the search range: the section's maximum depth, or for open
+    prismatic shapes a depth found by doubling where f is positive.
+    """
+    if geometry.max_depth is not None:
+        return geometry.max_depth
+    y = max(start, 1e-3)
+    while f(y) <= 0:
+        y *= 2.0
+    return y
+
+
+def specific_energy(section, discharge: float, depths):
+    """
+    Specific energy E = y + Q^2 / (2 g A^2) at one depth or a sequence of depths.
+
+    Args:
+        section: geometry object or section class instance
+        discharge (float): discharge (cms)
+        depths: depth (m) or sequence of depths
+
+    Returns:
+        float or list: specific energy (m)
+    """
+    geometry = as_geometry(section)
+    k = discharge * discharge / (2.0 * GRAVITY_G)
+    if is_sequence(depths):
+        return [y + k / geometry.area(y) ** 2 for y in depths]
+    return depths + k / geometry.area(depths) ** 2
+
+
+def momentum_function(section, discharge: float, depths):
+    """
+    Specific force M = Q^2 / (g A) + A * ybar at one depth or a sequence of
+    depths, ybar being the depth of the centroid of the flow area.
+
+    Args:
+        section: geometry object or section class instance
+        discharge (float): discharge (cms)
+        depths: depth (m) or sequence of depths
+
+    Returns:
+        float or list: momentum function (m^3)
+    """
+    geometry = as_geometry(section)
+    k = discharge * discharge / GRAVITY_G
+    if is_sequence(depths):
+        return [k / geometry.area(y) + geometry.first_moment(y) for y in depths]
+    return k / geometry.area(depths) + geometry.first_moment(depths)
+
+
+def energy_momentum_curves(section, discharge: float, depths):
+    """
+    E-y and M-y curves over a sequence of depths.
+
+    Returns:
+        dict: 'depth', 'specific_energy' and 'momentum' lists
+    """
+    geometry = as_geometry(section)
+    return {
+        'depth': list(depths),
+        'specific_energy': specific_energy(geometry, discharge, depths),
+        'momentum': momentum_function(geometry, discharge, depths)
+    }
+
+
+def _critical_depth(geometry, discharge):
+    k = discharge * discharge / GRAVITY_G
+
+    # 1 - Q^2 T / (g A^3) is negative below and positive above critical depth
+    def f(y):
+        return 1.0 - k * geometry.top_width(y) / geometry.area(y) ** 3
+
+    lo = 1e-9
+    while f(lo) >= 0:
+        lo /= 10.0
+        if lo < 1e-300:
+            return 0.0
+    hi = _upper_depth(geometry, f, 1.0)
+    f_hi = f(hi)
+    if f_hi <= 0:
+        return hi
+    return find_root(f, lo, hi, f(lo), f_hi)
+
+
+def critical_depth(section, discharges):
+    """
+    Critical depth, where the specific energy is minimum, for one discharge or
+    a sequence of discharges.
+    """
+    geometry = as_geometry(section)
+    if is_sequence(discharges):
+        return [_critical_depth(geometry, q) for q in discharges]
+    return _critical_depth(geometry, discharges)
+
+
+def _alternate_depths(geometry, discharge, energy):
+    if discharge == 0:
+        # Still water: the depth is the energy and there is no supercritical branch
+        if energy <= 0 or (geometry.max_depth is not None and energy > geometry.max_depth):
+            return None, None
+        return None, energy
+
+    yc = _critical_depth(geometry, discharge)
+    k = discharge * discharge / (2.0 * GRAVITY_G)
+
+    def f(y):
+        return y + k / geometry.area(y) ** 2 - energy
+
+    f_c = f(yc)
+    if f_c > 0:
+        return None, None
+
+    lo = yc / 2.0
+    while f(lo) <= 0:
+        lo /= 2.0
+    supercritical = find_root(f, lo, yc, f(lo), f_c)
+
+    hi = _upper_depth(geometry, f, 2.0 * yc)
+    f_hi = f(hi)
+    if f_hi < 0:
+        subcritical = None
+    else:
+        subcritical = find_root(f, yc, hi, f_c, f_hi)
+
+    return supercritical, subcritical
+
+
+def alternate_depths(section, discharges, energies):
+    """
+    Supercritical and subcritical depths with the given specific energy.
+
+    Args:
+        section: geometry object or section class instance
+        discharges: discharge (cms) or sequence of discharges
+        energies: specific energy (m) or sequence of energies
+
+    Returns:
+        tuple or list of tuples: (supercritical, subcritical) depths, None
+        where the energy is below the minimum or the depth above the section.
+        Without discharge the only depth is the energy itself, (None, E)
+    """
+    geometry = as_geometry(section)
+    pairs = _broadcast(discharges, energies)
+    if pairs is None:
+        return _alternate_depths(geometry, discharges, energies)
+    return [_alternate_depths(geometry, q, e) for q, e in pairs]
+
+
+def _sequent_depth(geometry, discharge, depth):
+    if discharge == 0:
+        # Without flow the momentum function only grows with depth, no jump forms
+        return depth
+
+    yc = _critical_depth(geometry, discharge)
+    k = discharge * discharge / GRAVITY_G
+    target = k / geometry.area(depth) + geometry.first_moment(depth)
+
+    def f(y):
+        return k / geometry.area(y) + geometry.first_moment(y) - target
+
+    f_c = f(yc)
+    if f_c > 0:
+        return None
+
+    if depth < yc:
+        hi = _upper_depth(geometry, f, 2.0 * yc)
+        f_hi = f(hi)
+        if f_hi < 0:
+            return None
+        return find_root(f, yc, hi, f_c, f_hi)
+
+    lo = yc / 2.0
+    while f(lo) <= 0:
+        lo /= 2.0
+    return find_root(f, lo, yc, f(lo), f_c)
+
+
+def sequent_depth(section, discharges, depths):
+    """
+    Depth on the other side of a hydraulic jump with the same momentum function.
+
+    Args:
+        section: geometry object or section class instance
+        discharges: discharge (cms) or sequence of discharges
+        depths: initial depth (m) or sequence of depths, super- or subcritical
+
+    Returns:
+        float or list: sequent depth (m), None if it lies above the section,
+        the depth itself without discharge
+    """
+    geometry = as_geometry(section)
+    pairs = _broadcast(discharges, depths)
+    if pairs is None:
+        return _sequent_depth(geometry, discharges, depths)
+    return [_sequent_depth(geometry, q, y) for q, y in pairs]
@@ -0,0 +1,36 @@
+# Status codes reported per row by the batch APIs. Zero means a valid result.
+STATUS_OK = 0
+STATUS_INVALID_INPUT = 1
+STATUS_ABOVE_SECTION = 2
+STATUS_BELOW_SECTION = 3
+STATUS_UNKNOWN_GAUGE = 4
+
+
+class ChannelFlowError(ValueError):
+    """
+    Base class of the errors raised for inputs a section cannot be analyzed
+    with. Each error carries the status code batch APIs report for it.
+    """
+    status = STATUS_INVALID_INPUT
+
+
+class InvalidInputError(ChannelFlowError):
+    """
+    A required input is zero or missing, e.g. the roughness or the slope.
+    """
+    status = STATUS_INVALID_INPUT
+
+
+class WaterAboveSectionError(ChannelFlowError):
+    """
+    The water surface is above the lower bank of an open section, or fills
+    a pipe.
+    """
+    status = STATUS_ABOVE_SECTION
+
+
+class WaterBelowSectionError(ChannelFlowError):
+    """
+    The water surface is below the lowest point of the section.
+    """
+    status = STATUS_BELOW_SECTION
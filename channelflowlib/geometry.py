@@ -0,0 +1,315 @@
+import math
+
+from .roots import find_root
+from .utils import is_sequence
+
+
+class SectionGeometry:
+    """
+    Common interface of the flow geometry of a channel section.
+
+    Depths y are measured from the lowest point of the section. Every method
+    takes a single depth or a sequence of depths and returns a float or a list
+    accordingly. Subclasses implement the scalar ``_area``, ``_perimeter``,
+    ``_top_width`` and ``_first_moment`` methods, and may override
+    ``depth_from_area`` with a closed form.
+
+    ``max_depth`` is the depth at which the section is full, None for open
+    prismatic shapes.
+    """
+    max_depth = None
+
+    def area(self, y):
+        if is_sequence(y):
+            return [self._area(v) for v in y]
+        return self._area(y)
+
+    def perimeter(self, y):
+        if is_sequence(y):
+            return [self._perimeter(v) for v in y]
+        return self._perimeter(y)
+
+    def top_width(self, y):
+        if is_sequence(y):
+            return [self._top_width(v) for v in y]
+        return self._top_width(y)
+
+    def first_moment(self, y):
+        """
+        First moment of the flow area about the water surface, i.e. the
+        hydrostatic pressure force divided by the unit weight of water.
+        """
+        if is_sequence(y):
+            return [self._first_moment(v) for v in y]
+        return self._first_moment(y)
+
+    def hydraulic_radius(self, y):
+        if is_sequence(y):
+            return [self._area(v) / self._perimeter(v) for v in y]
+        return self._area(y) / self._perimeter(y)
+
+    def conveyance(self, y, roughness: float = 1.0):
+        """
+        Manning conveyance K = A R^(2/3) / n, so that Q = K S^0.5. With the
+        default roughness of 1 this is the geometric part A R^(2/3).
+        """
+        if is_sequence(y):
+            return [self._conveyance(v) / roughness for v in y]
+        return self._conveyance(y) / roughness
+
+    def _conveyance(self, y):
+        a = self._area(y)
+        if a <= 0:
+            return 0.0
+        return a * (a / self._perimeter(y)) ** (2.0 / 3.0)
+
+    def depth_from_area(self, area: float):
+        """
+        Depth with the given flow area, by root finding on area(y).
+        """
+        if area <= 0:
+            return 0.0
+        hi = self.max_depth
+        if hi is None:
+            hi = 1.0
+            while self._area(hi) < area:
+                hi *= 2.0
+        return find_root(lambda y: self._area(y) - area, 0.0, hi, -area, self._area(hi) - area)
+
+
+class RectangularGeometry(SectionGeometry):
+    """
+    Flow geometry of a prismatic rectangular channel.
+
+    Args:
+        base (float): channel bottom width (m)
+    """
+
+    def __init__(self, base: float):
+        self.base = base
+
+    def _area(self, y):
+        return self.base * y
+
+    def _perimeter(self, y):
+        return self.base + 2 * y
+
+    def _top_width(self, y):
+        return self.base
+
+    def _first_moment(self, y):
+        return self.base * y * y / 2.0
+
+    def depth_from_area(self, area: float):
+        return area / self.base
+
+
+class TrapezoidalGeometry(SectionGeometry):
+    """
+    Flow geometry of a prismatic trapezoidal channel.
+
+    Args:
+        base (float): channel bottom width (m)
+        side_slope (float): horizontal run per unit rise of the side walls
+    """
+
+    def __init__(self, base: float, side_slope: float):
+        self.base = base
+        self.side_slope = side_slope
+
+    def _area(self, y):
+        return (self.base + self.side_slope * y) * y
+
+    def _perimeter(self, y):
+        return self.base + 2 * y * math.sqrt(1 + self.side_slope ** 2)
+
+    def _top_width(self, y):
+        return self.base + 2 * self.side_slope * y
+
+    def _first_moment(self, y):
+        return self.base * y * y / 2.0 + self.side_slope * y ** 3 / 3.0
+
+    def depth_from_area(self, area: float):
+        if self.side_slope == 0:
+            return area / self.base
+        m = self.side_slope
+        b = self.base
+        return (-b + math.sqrt(b * b + 4 * m * area)) / (2 * m)
+
+
+class TriangularGeometry(TrapezoidalGeometry):
+    """
+    Flow geometry of a prismatic triangular (V-shaped) channel.
+
+    Args:
+        side_slope (float): horizontal run per unit rise of the side walls
+    """
+
+    def __init__(self, side_slope: float):
+        super().__init__(0.0, side_slope)
+
+
+class ParabolicGeometry(SectionGeometry):
+    """
+    Flow geometry of a prismatic parabolic channel, described by its top
+    width at a reference depth.
+
+    Args:
+        top_width (float): water surface width (m) at the reference depth
+        depth (float): reference depth (m)
+    """
+
+    def __init__(self, top_width: float, depth: float):
+        # Bed profile y = a x^2
+        self.coefficient = depth / (top_width / 2.0) ** 2
+
+    def _top_width(self, y):
+        return 2.0 * math.sqrt(y / self.coefficient)
+
+    def _area(self, y):
+        return 2.0 / 3.0 * self._top_width(y) * y
+
+    def _perimeter(self, y):
+        a = self.coefficient
+        x = math.sqrt(y / a)
+        return x * math.sqrt(1 + 4 * a * a * x * x) + math.asinh(2 * a * x) / (2 * a)
+
+    def _first_moment(self, y):
+        return 4.0 / 15.0 * self._top_width(y) * y * y
+
+    def depth_from_area(self, area: float):
+        # A = (4/3) y^(3/2) / a^(1/2)
+        return (0.75 * area * math.sqrt(self.coefficient)) ** (2.0 / 3.0)
+
+
+class CircularGeometry(SectionGeometry):
+    """
+    Flow geometry of a partially full circular pipe.
+
+    Args:
+        diameter (float): pipe diameter (m)
+    """
+
+    def __init__(self, diameter: float):
+        self.diameter = diameter
+        self.max_depth = diameter
+
+    def central_angle(self, y: float):
+        """
+        Angle in radians subtended at the pipe center by the water surface.
+        """
+        ratio = 1 - 2 * y / self.diameter
+        return 2 * math.acos(max(-1.0, min(1.0, ratio)))
+
+    def _area(self, y):
+        theta = self.central_angle(y)
+        return self.diameter ** 2 * (theta - math.sin(theta)) / 8.0
+
+    def _perimeter(self, y):
+        return self.diameter * self.central_angle(y) / 2.0
+
+    def _top_width(self, y):
+        return self.diameter * math.sin(self.central_angle(y) / 2.0)
+
+    def _first_moment(self, y):
+        r = self.diameter / 2.0
+        d = min(max(r - y, -r), r)
+        return 2.0 / 3.0 * (r * r - d * d) ** 1.5 - self._area(y) * d
+
+
+class IrregularGeometry(SectionGeometry):
+    """
+    Flow geometry of an irregular (surveyed) cross section, with depths
+    measured from its lowest point.
+
+    Args:
+        points (sequence): (x, y) vertices of the section
+        index: elevation index of the points, built if None
+    """
+
+    def __init__(self, points, index=None):
+        if index is None:
+            from .openchannellib import _ElevationIndex
+            index = _ElevationIndex(points)
+
+        self.index = index
+        self.lowest = index.lowest
+        self.max_depth = min(points[0][1], points[-1][1]) - self.lowest
+
+    def _area(self, y):
+        return self.index.wetted_properties(self.lowest + y)[0]
+
+    def _perimeter(self, y):
+        return self.index.wetted_properties(self.lowest + y)[1]
+
+    def _top_width(self, y):
+        return self.index.wetted_properties(self.lowest + y)[2]
+
+    def _first_moment(self, y):
+        return self.index.first_moment(self.lowest + y)
+
+    def _conveyance(self, y):
+        a, p, t = self.index.wetted_properties(self.lowest + y)
+        if a <= 0:
+            return 0.0
+        return a * (a / p) ** (2.0 / 3.0)
+
+
+def as_geometry(section):
+    """
+    Accepts either a geometry object or a section class instance.
+    """
+    if isinstance(section, SectionGeometry):
+        return section
+    return section_geometry(section)
+
+
+def section_geometry(section):
+    """
+    Builds the geometry object that matches a channel section instance.
+
+    Args:
+        section: a ``Rectangular``, ``Trapezoidal``, ``Circular`` or
+            ``IrregularSection`` instance
+
+    Returns:
+        the geometry object of the section
+    """
+    from .openchannellib import Rectangular, Trapezoidal, Circular, IrregularSection
+
+    if isinstance(section, Rectangular):
+        return RectangularGeometry(section.channel_base)
+    if isinstance(section, Trapezoidal):
+        return TrapezoidalGeometry(section.channel_base, section.side_slope)
+    if isinstance(section, Circular):
+        return CircularGeometry(section.diameter)
+    if isinstance(section, IrregularSection):
+        return IrregularGeometry(section.points, section.get_elevation_index())
+
+    raise TypeError('Unsupported section type: ' + type(section).__name__)
+
+
+def section_parameters(section):
+    """
+    Geometry, Manning's roughness and bed slope of a section class instance,
+    whatever the attribute names of its class.
+
+    This adapter is how the engines built on the common interface
+    (normal_flow, energy, gvf, the Saint-Venant solver and the batch modules)
+    accept the section classes. The classes' own analyze() and critical flow
+    methods still use their stepping searches and attribute names, so their
+    results stay identical to earlier releases.
+
+    Returns:
+        tuple: geometry, roughness, slope
+    """
+    from .openchannellib import Circular, IrregularSection
+
+    if isinstance(section, Circular):
+        slope = section.slope
+    elif isinstance(section, IrregularSection):
+        slope = section.bed_slope
+    else:
+        slope = section.channel_slope
+
+    return section_geometry(section), section.roughness, slope
@@ -1,6 +1,8 @@
 import math
 
 from .constants import GRAVITY_G
+from .energy import momentum_function, specific_energy
+from .geometry import as_geometry
 
 
 def gradually_varied_flow_rectangular(x, dx, d0, Q, b, n, S0, z0):
@@ -47,3 +49,171 @@ def gradually_varied_flow_rectangular(x, dx, d0, Q, b, n, S0, z0):
         d0 = d
 
     return y, d
+
+
+def _depth_gradient(geometry, Q, n, S0, y):
+    """
+    dy/dx = (S0 - Sf) / (1 - Fr^2) of gradually varied flow, None at or
+    through critical depth.
+    """
+    if y <= 0:
+        return None
+    A = geometry.area(y)
+    R = A / geometry.perimeter(y)
+    Sf = (Q * n) ** 2 / (A ** 2 * R ** (4 / 3))
+    denominator = 1 - Q ** 2 * geometry.top_width(y) / (GRAVITY_G * A ** 3)
+    if abs(denominator) < 1e-6:
+        return None
+    return (S0 - Sf) / denominator
+
+
+def _runge_kutta_step(geometry, Q, n, S0, y, dx):
+    k1 = _depth_gradient(geometry, Q, n, S0, y)
+    if k1 is None:
+        return None
+    k2 = _depth_gradient(geometry, Q, n, S0, y + dx * k1 / 2)
+    if k2 is None:
+        return None
+    k3 = _depth_gradient(geometry, Q, n, S0, y + dx * k2 / 2)
+    if k3 is None:
+        return None
+    k4 = _depth_gradient(geometry, Q, n, S0, y + dx * k3)
+    if k4 is None:
+        return None
+    return y + dx * (k1 + 2 * k2 + 2 * k3 + k4) / 6
+
+
+def _froude_sign(geometry, Q, y):
+    return GRAVITY_G * geometry.area(y) ** 3 > Q ** 2 * geometry.top_width(y)
+
+
+def compute_profile(section, Q, n, S0, stations, boundary_depth, direction):
+    """
+    Computes a gradually varied flow profile in a prismatic channel by fourth
+    order Runge-Kutta integration between stations.
+
+    Args:
+        section: geometry object or section class instance
+        Q (float): discharge (m^3/s)
+        n (float): Manning roughness coefficient
+        S0 (float): channel bed slope
+        stations (list): distances along the channel, increasing downstream (m)
+        boundary_depth (float): control depth at the first station in the
+            direction of integration (m)
+        direction (str): 'downstream' for supercritical profiles controlled
+            upstream, 'upstream' for subcritical profiles controlled downstream
+
+    Returns:
+        list: flow depth at every station (m), None where the profile reaches
+        critical depth and cannot be continued
+    """
+    geometry = as_geometry(section)
+    if direction == 'downstream':
+        order = list(range(len(stations)))
+    elif direction == 'upstream':
+        order = list(range(len(stations) - 1, -1, -1))
+    else:
+        raise ValueError('direction must be downstream or upstream')
+
+    depths = [None] * len(stations)
+    y = boundary_depth
+    depths[order[0]] = y
+    subcritical = _froude_sign(geometry, Q, y)
+
+    for previous, i in zip(order, order[1:]):
+        y_next = _runge_kutta_step(geometry, Q, n, S0, y, stations[i] - stations[previous])
+        # The profile cannot be continued through critical depth
+        if y_next is None or y_next <= 0 or _froude_sign(geometry, Q, y_next) != subcritical:
+            break
+        y = y_next
+        depths[i] = y
+
+    return depths
+
+
+def _jump(geometry, Q, location, y1, y2):
+    return {
+        'status': 'jump',
+        'location': location,
+        'upstream_depth': y1,
+        'downstream_depth': y2,
+        'length': 6.9 * (y2 - y1),
+        'head_loss': specific_energy(geometry, Q, y1) - specific_energy(geometry, Q, y2)
+    }
+
+
+def locate_hydraulic_jump(section, Q, n, S0, stations, upstream_depth, downstream_depth):
+    """
+    Locates a hydraulic jump between a supercritical profile controlled
+    upstream and a subcritical profile controlled downstream.
+
+    Both profiles are computed over the stations and the jump is placed where
+    their momentum functions are equal, interpolating between stations. If the
+    supercritical profile reaches critical depth first, the jump is placed at
+    its last station. Jump length is estimated as 6.9 (y2 - y1).
+
+    Args:
+        section: geometry object or section class instance
+        Q (float): discharge (m^3/s)
+        n (float): Manning roughness coefficient
+        S0 (float): channel bed slope
+        stations (list): distances along the channel, increasing downstream (m)
+        upstream_depth (float): supercritical depth at the first station (m)
+        downstream_depth (float): subcritical depth at the last station (m)
+
+    Returns:
+        dict: 'status' is 'jump', 'swept_out' (supercritical flow leaves the
+        reach) or 'submerged' (the jump is pushed to the upstream end); a jump
+        also has 'location', 'upstream_depth', 'downstream_depth', 'length'
+        and 'head_loss'
+    """
+    geometry = as_geometry(section)
+    supercritical = compute_profile(geometry, Q, n, S0, stations, upstream_depth, 'downstream')
+    subcritical = compute_profile(geometry, Q, n, S0, stations, downstream_depth, 'upstream')
+
+    previous = None
+    for i in range(len(stations)):
+        y1 = supercritical[i]
+        y2 = subcritical[i]
+        if y2 is None:
+            continue
+        if y1 is None:
+            break
+        difference = momentum_function(geometry, Q, y1) - momentum_function(geometry, Q, y2)
+        if difference <= 0:
+            if previous is None:
+                return {'status': 'submerged'}
+            j, d0 = previous
+            t = d0 / (d0 - difference)
+            return _jump(geometry, Q,
+                         stations[j] + t * (stations[i] - stations[j]),
+                         supercritical[j] + t * (y1 - supercritical[j]),
+                         subcritical[j] + t * (y2 - subcritical[j]))
+        previous = (i, difference)
+    else:
+        if previous is not None:
+            return {'status': 'swept_out'}
+
+    if previous is None:
+        return {'status': 'submerged'}
+
+    j = previous[0]
+    return _jump(geometry, Q, stations[j], supercritical[j], subcritical[j])
+
+
+def screen_hydraulic_jumps(section, cases, n, S0, stations):
+    """
+    Runs locate_hydraulic_jump over many operating cases of one channel.
+
+    Args:
+        section: geometry object or section class instance
+        cases (list): (discharge, upstream_depth, downstream_depth) tuples
+        n (float): Manning roughness coefficient
+        S0 (float): channel bed slope
+        stations (list): distances along the channel, increasing downstream (m)
+
+    Returns:
+        list: one result dict per case
+    """
+    geometry = as_geometry(section)
+    return [locate_hydraulic_jump(geometry, Q, n, S0, stations, y1, y2) for Q, y1, y2 in cases]
@@ -0,0 +1,156 @@
+import math
+from array import array
+from bisect import bisect_right
+
+from .openchannellib import IrregularSection, _PointArray
+from .utils import is_sequence
+
+
+def normalized_stations(points, align_thalweg: bool = True):
+    """
+    Position of every vertex along a section as a fraction from 0 at the left
+    bank to 1 at the right bank, measured along the section outline.
+
+    With align_thalweg the lowest point is placed at 0.5 and each side is
+    normalized separately, so that the thalwegs of two sections line up when
+    interpolating between them.
+
+    Returns:
+        array: increasing fractions, one per vertex
+    """
+    distances = [0.0]
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        distances.append(distances[-1] + math.hypot(x2 - x1, y2 - y1))
+
+    total = distances[-1]
+    if not align_thalweg:
+        return array('d', [d / total for d in distances])
+
+    lowest = min(range(len(points)), key=lambda i: points[i][1])
+    middle = distances[lowest]
+    fractions = array('d')
+    for d in distances:
+        if d <= middle:
+            fractions.append(0.5 * d / middle if middle > 0 else 0.5)
+        else:
+            fractions.append(0.5 + 0.5 * (d - middle) / (total - middle))
+    return fractions
+
+
+def resample_section(points, stations, align_thalweg: bool = True):
+    """
+    Coordinates of a section at normalized stations.
+
+    Args:
+        points (sequence): (x, y) vertices of the section
+        stations (sequence): increasing fractions between 0 and 1
+        align_thalweg (bool): see normalized_stations
+
+    Returns:
+        tuple: xs and ys arrays
+    """
+    fractions = normalized_stations(points, align_thalweg)
+    last = len(fractions) - 1
+    xs = array('d')
+    ys = array('d')
+    for u in stations:
+        i = min(max(bisect_right(fractions, u), 1), last)
+        f1 = fractions[i - 1]
+        f2 = fractions[i]
+        t = (u - f1) / (f2 - f1) if f2 > f1 else 0.0
+        x1, y1 = points[i - 1]
+        x2, y2 = points[i]
+        xs.append(x1 + (x2 - x1) * t)
+        ys.append(y1 + (y2 - y1) * t)
+    return xs, ys
+
+
+class InterpolatedSections:
+    """
+    Sections interpolated along a reach, stored as one flat array of
+    interleaved x0, y0, x1, y1, ... coordinates with the same number of
+    stations per section. xs and ys are strided views into it.
+
+    Args:
+        positions (array): fraction of the reach length of each section
+        coords (array): interleaved coordinates, section after section
+        num_stations (int): number of vertices per section
+    """
+
+    def __init__(self, positions, coords, num_stations: int):
+        self.positions = positions
+        self.coords = coords
+        self.num_stations = num_stations
+        view = memoryview(coords)
+        self.xs = view[0::2]
+        self.ys = view[1::2]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def coordinates(self, i: int):
+        """
+        x and y coordinates of section i as memoryviews of the array, without
+        copying.
+        """
+        start = i * self.num_stations
+        stop = start + self.num_stations
+        return self.xs[start:stop], self.ys[start:stop]
+
+    def points(self, i: int):
+        """
+        Vertices of section i as a sequence of (x, y) pairs over the array,
+        without copying.
+        """
+        start = 2 * i * self.num_stations
+        return _PointArray(memoryview(self.coords)[start:start + 2 * self.num_stations])
+
+    def section(self, i: int):
+        """
+        Section i as an IrregularSection sharing the array.
+        """
+        return IrregularSection(self.points(i))
+
+
+def interpolate_sections(upstream, downstream, positions, num_stations: int = None,
+                         align_thalweg: bool = True):
+    """
+    Generates sections between two surveyed sections.
+
+    Both sections are resampled to common normalized stations, and each
+    coordinate is interpolated linearly along the reach.
+
+    Args:
+        upstream (sequence): (x, y) vertices of the upstream section
+        downstream (sequence): (x, y) vertices of the downstream section
+        positions: fractions of the reach length (0 upstream, 1 downstream) of
+            the sections to generate, or their number, equally spaced
+            between the two surveyed sections
+        num_stations (int): number of equally spaced stations per section;
+            if None the vertices of both sections are kept
+        align_thalweg (bool): see normalized_stations
+
+    Returns:
+        InterpolatedSections: the generated sections
+    """
+    if not is_sequence(positions):
+        positions = [(i + 1) / (positions + 1.0) for i in range(positions)]
+    positions = array('d', positions)
+
+    if num_stations is None:
+        stations = sorted(set(normalized_stations(upstream, align_thalweg))
+                          | set(normalized_stations(downstream, align_thalweg)))
+    else:
+        stations = [i / (num_stations - 1.0) for i in range(num_stations)]
+
+    x1, y1 = resample_section(upstream, stations, align_thalweg)
+    x2, y2 = resample_section(downstream, stations, align_thalweg)
+    first = [value for point in zip(x1, y1) for value in point]
+    last = [value for point in zip(x2, y2) for value in point]
+    deltas = [b - a for a, b in zip(first, last)]
+
+    coords = array('d')
+    for f in positions:
+        coords.extend([a + f * d for a, d in zip(first, deltas)])
+
+    return InterpolatedSections(positions, coords, len(stations))
@@ -0,0 +1,257 @@
+import math
+
+try:
+    import numba
+    import numpy
+except ImportError:
+    numba = None
+    numpy = None
+
+PYTHON = 'python'
+NUMBA = 'numba'
+
+_python_kernels = {}
+_numba_kernels = {}
+_backend = NUMBA if numba is not None else PYTHON
+
+
+def _kernel(func):
+    """
+    Registers the pure-Python implementation of a kernel.
+    """
+    _python_kernels[func.__name__] = func
+    return func
+
+
+# ------------------------------------------------------------------
+# Kernels. Only float arithmetic and the math module, so numba can
+# compile them in nopython mode unchanged.
+# ------------------------------------------------------------------
+@_kernel
+def manning_depth_search(q, s, n, b, ss, step):
+    """
+    Steps the water depth up until the Manning discharge of a trapezoidal
+    section (rectangular when ss is 0) reaches q.
+    """
+    q_trial = 0.0
+    d = 0.0
+    a = 0.0
+    p = 0.0
+    r = 0.0
+    v = 0.0
+    while q_trial < q:
+        d += step
+        a = (b + d * ss) * d
+        p = 2 * d * (ss ** 2 + 1) ** 0.5 + b
+        r = a / p
+        v = (1 / n) * s ** 0.5 * r ** (2.0 / 3)
+        q_trial = v * a
+    return d, a, p, r, v
+
+
+@_kernel
+def manning_depth_search_trapezoidal(q, s, n, b, ss, step):
+    """
+    Same search as manning_depth_search with the operand order of the
+    trapezoidal class, n^-1 R^(2/3) S^0.5, which rounds differently.
+    """
+    q_trial = 0.0
+    d = 0.0
+    a = 0.0
+    p = 0.0
+    r = 0.0
+    v = 0.0
+    while q_trial < q:
+        d += step
+        a = (b + d * ss) * d
+        p = 2 * d * (ss ** 2 + 1) ** 0.5 + b
+        r = a / p
+        v = (1 / n) * r ** (2.0 / 3) * s ** 0.5
+        q_trial = v * a
+    return d, a, p, r, v
+
+
+@_kernel
+def manning_slope_search(q, n, a, r, step):
+    """
+    Steps the bed slope up until the Manning discharge reaches q.
+    """
+    q_trial = 0.0
+    s = 0.0
+    v = 0.0
+    while q_trial < q:
+        s += step
+        v = (1 / n) * s ** 0.5 * r ** (2.0 / 3)
+        q_trial = v * a
+    return s, v
+
+
+@_kernel
+def manning_base_search(q, s, n, d, ss, step):
+    """
+    Steps the bottom width up until the Manning discharge reaches q.
+    """
+    q_trial = 0.0
+    b = 0.0
+    a = 0.0
+    p = 0.0
+    r = 0.0
+    v = 0.0
+    while q_trial < q:
+        b += step
+        a = (b + d * ss) * d
+        p = 2 * d * (ss ** 2 + 1) ** 0.5 + b
+        r = a / p
+        v = (1 / n) * s ** 0.5 * r ** (2.0 / 3)
+        q_trial = v * a
+    return b, a, p, r, v
+
+
+@_kernel
+def shoelace(xs, ys):
+    """
+    Shoelace formula for the area of the closed polygon with vertices (xs, ys).
+    """
+    n = len(xs)
+    area = 0.0
+    for i in range(n):
+        j = (i + 1) % n
+        area += xs[i] * ys[j]
+        area -= xs[j] * ys[i]
+    return abs(area) / 2.0
+
+
+@_kernel
+def critical_depth_trapezoidal(q2g, channel_base, side_slope, step):
+    """
+    Steps the depth up until A^3/T reaches Q^2/g in a trapezoidal section.
+    """
+    tester = 0.0
+    critical_depth = 0.0
+    critical_flow_area = 0.0
+    while tester < q2g:
+        critical_depth += step
+        top_width = channel_base + 2 * side_slope * critical_depth
+        critical_flow_area = (top_width + channel_base) / 2 * critical_depth
+        tester = critical_flow_area ** 3 / top_width
+    return critical_depth, critical_flow_area
+
+
+@_kernel
+def critical_depth_circular(q2g, diameter, step):
+    """
+    Steps the depth up until A^3/T reaches Q^2/g in a circular pipe.
+    """
+    tester = 0.0
+    critical_depth = 0.0
+    critical_flow_area = 0.0
+    critical_perimeter = 0.0
+    r = diameter / 2
+    while tester < q2g:
+        critical_depth += step
+
+        if critical_depth > (diameter / 2.0):
+            theta = 2 * math.acos((2 * critical_depth - diameter) / diameter) * 180.0 / math.pi
+        else:
+            theta = 2 * math.acos((diameter - 2 * critical_depth) / diameter) * 180.0 / math.pi
+
+        triangle_area = diameter ** 2 * math.sin(theta * math.pi / 180) / 8
+
+        if critical_depth == r:
+            ht = 0.0
+        elif critical_depth > r:
+            ht = critical_depth - r
+        else:
+            ht = r - critical_depth
+        top_width = 2 * math.sqrt(math.pow(r, 2) - math.pow(ht, 2))
+
+        if critical_depth > (diameter / 2):
+            sector_area = math.pi * diameter ** 2 * (360 - theta) / 1440
+            critical_flow_area = sector_area + triangle_area
+            critical_perimeter = math.pi * diameter * (360 - theta) / 360
+        else:
+            sector_area = theta * math.pi * diameter ** 2 / 1440
+            critical_flow_area = sector_area - triangle_area
+            critical_perimeter = math.pi * diameter * theta / 360
+
+        tester = critical_flow_area ** 3 / top_width
+    return critical_depth, critical_flow_area, critical_perimeter
+
+
+# ------------------------------------------------------------------
+# Backend selection
+# ------------------------------------------------------------------
+def get_backend():
+    return _backend
+
+
+def set_backend(backend: str):
+    """
+    Selects the kernel implementation used by the library.
+
+    Args:
+        backend (str): 'numba' for JIT-compiled kernels or 'python'
+    """
+    global _backend
+    if backend not in (PYTHON, NUMBA):
+        raise ValueError('Unknown backend: ' + str(backend))
+    if backend == NUMBA and numba is None:
+        raise ImportError('The numba backend requires numba to be installed.')
+    _backend = backend
+
+
+def get_kernel(name: str, backend: str = None):
+    """
+    Get a kernel for a backend (the active one if None), compiling it with
+    numba on first use.
+    """
+    backend = backend or _backend
+    if backend == PYTHON:
+        return _python_kernels[name]
+    if name not in _numba_kernels:
+        _numba_kernels[name] = numba.njit(_python_kernels[name])
+    return _numba_kernels[name]
+
+
+def call(name: str, *args):
+    """
+    Calls a kernel on the active backend.
+    """
+    if _backend == NUMBA and name == 'shoelace':
+        args = tuple(numpy.asarray(arg, dtype=numpy.float64) for arg in args)
+    return get_kernel(name)(*args)
+
+
+SELF_TEST_CASES = {
+    'manning_depth_search': (1.5, 0.001, 0.015, 1.0, 0.0, 0.00001),
+    'manning_depth_search_trapezoidal': (1.5, 0.001, 0.015, 1.0, 1.5, 0.0001),
+    'manning_slope_search': (1.0, 0.015, 0.989, 0.332, 0.0000001),
+    'manning_base_search': (2.0, 0.001, 0.015, 0.8, 1.0, 0.0001),
+    'shoelace': ([0.0, 1.287, 2.58, 5.223, 10.446, 12.333, 14.188],
+                 [1.13, 1.2, 0.09, -1.57, -1.81, 0.72, 1.2]),
+    'critical_depth_trapezoidal': (0.25, 1.0, 1.5, 0.00001),
+    'critical_depth_circular': (0.011, 1.0, 0.00001),
+}
+
+
+def self_test():
+    """
+    Runs every kernel on the Python and, when numba is installed, the numba
+    backend and compares the results.
+
+    Returns:
+        dict: kernel name to True when both backends give identical results,
+        empty when numba is not installed
+    """
+    results = {}
+    if numba is None:
+        return results
+
+    for name, args in SELF_TEST_CASES.items():
+        expected = get_kernel(name, PYTHON)(*args)
+        if name == 'shoelace':
+            args = tuple(numpy.asarray(arg, dtype=numpy.float64) for arg in args)
+        actual = get_kernel(name, NUMBA)(*args)
+        results[name] = tuple(numpy.atleast_1d(actual).tolist()) == tuple(numpy.atleast_1d(expected).tolist())
+
+    return results
@@ -0,0 +1,169 @@
+import math
+from array import array
+from bisect import bisect_right
+
+from .openchannellib import _ElevationIndex
+from .utils import interpolate
+
+
+def section_areas(section, elevations):
+    """
+    Flow area of a section at each elevation. Above the lower bank the end
+    points are extended vertically.
+
+    Args:
+        section: ``IrregularSection`` instance or point sequence
+        elevations (sequence): water surface elevations
+
+    Returns:
+        array: areas (m^2), zero below the lowest point
+    """
+    if hasattr(section, 'get_elevation_index'):
+        index = section.get_elevation_index()
+    else:
+        index = _ElevationIndex(section)
+    lowest = index.lowest
+    return array('d', [index.wetted_properties(h)[0] if h > lowest else 0.0 for h in elevations])
+
+
+def reach_storage(sections, lengths, elevations):
+    """
+    Storage volume of a reach against water elevation by prismoidal
+    (frustum) integration between consecutive surveyed sections,
+    V = L / 3 (A1 + A2 + sqrt(A1 A2)).
+
+    Args:
+        sections (list): surveyed sections from upstream to downstream
+        lengths (list): distances (m) between consecutive sections
+        elevations (sequence): increasing water surface elevations
+
+    Returns:
+        array: storage volumes (m^3), one per elevation
+    """
+    if len(lengths) != len(sections) - 1:
+        raise ValueError('One length is required between each pair of sections.')
+
+    storages = array('d', [0.0]) * len(elevations)
+    upstream = section_areas(sections[0], elevations)
+    for section, length in zip(sections[1:], lengths):
+        downstream = section_areas(section, elevations)
+        third = length / 3.0
+        for i, (a1, a2) in enumerate(zip(upstream, downstream)):
+            storages[i] += third * (a1 + a2 + math.sqrt(a1 * a2))
+        upstream = downstream
+    return storages
+
+
+def weir(crest_elevation: float, length: float, coefficient: float = 1.7):
+    """
+    Outflow rating of a free overflow weir, Q = C L H^1.5.
+
+    Returns:
+        function of the water elevation returning the discharge (cms)
+    """
+    def outflow(elevation):
+        head = elevation - crest_elevation
+        return coefficient * length * head ** 1.5 if head > 0 else 0.0
+    return outflow
+
+
+class StorageTable:
+    """
+    Storage-elevation-outflow table of a reservoir or reach for level-pool
+    routing.
+
+    Args:
+        elevations (sequence): increasing water surface elevations
+        storages (sequence): storage volumes (m^3), increasing
+        outflows (sequence): outflows (cms), non-decreasing
+    """
+
+    def __init__(self, elevations, storages, outflows):
+        self.elevations = array('d', elevations)
+        self.storages = array('d', storages)
+        self.outflows = array('d', outflows)
+        if not len(self.elevations) == len(self.storages) == len(self.outflows):
+            raise ValueError('Elevations, storages and outflows must have the same length.')
+
+    @classmethod
+    def from_sections(cls, sections, lengths, elevations, outflow):
+        """
+        Builds the table from consecutive surveys of a reach.
+
+        Args:
+            sections (list): surveyed sections from upstream to downstream
+            lengths (list): distances (m) between consecutive sections
+            elevations (sequence): increasing water surface elevations
+            outflow: function of the elevation returning the outflow (cms),
+                e.g. weir(), or a sequence with one outflow per elevation
+        """
+        if callable(outflow):
+            outflow = [outflow(h) for h in elevations]
+        return cls(elevations, reach_storage(sections, lengths, elevations), outflow)
+
+    def elevation_at_storage(self, storage: float):
+        """
+        Water elevation holding a storage volume, by linear interpolation.
+        """
+        return interpolate(storage, self.storages, self.elevations, extrapolate=True)
+
+    def route(self, inflows, dt: float, initial_elevation: float = None):
+        """
+        Modified Puls routing of an inflow hydrograph:
+        2 S2 / dt + O2 = I1 + I2 + 2 S1 / dt - O1.
+
+        The storage indication 2 S / dt + O is tabulated once for dt, and the
+        interval containing each new value is found by stepping from the
+        previous one, since the pool level changes little between steps.
+
+        Args:
+            inflows (sequence): inflow (cms) at each time step
+            dt (float): time step (s)
+            initial_elevation (float): starting pool elevation, the lowest
+                tabulated elevation if None
+
+        Returns:
+            tuple: outflows (cms) and pool elevations, arrays with one value
+            per time step
+        """
+        elevations = self.elevations
+        outflows_table = self.outflows
+        factor = 2.0 / dt
+        indication = [factor * s + o for s, o in zip(self.storages, outflows_table)]
+        last = len(indication) - 2
+
+        h = elevations[0] if initial_elevation is None else initial_elevation
+        i = min(max(bisect_right(elevations, h), 1), last + 1) - 1
+        f = (h - elevations[i]) / (elevations[i + 1] - elevations[i])
+        n = indication[i] + (indication[i + 1] - indication[i]) * f
+        o = outflows_table[i] + (outflows_table[i + 1] - outflows_table[i]) * f
+
+        count = len(inflows)
+        outflows = array('d', [0.0]) * count
+        levels = array('d', [0.0]) * count
+        if count == 0:
+            return outflows, levels
+        outflows[0] = o
+        levels[0] = h
+
+        previous = inflows[0]
+        for t in range(1, count):
+            inflow = inflows[t]
+            n = previous + inflow + n - 2.0 * o
+            previous = inflow
+
+            # Incremental search of the table interval holding n
+            while i < last and n > indication[i + 1]:
+                i += 1
+            while i > 0 and n < indication[i]:
+                i -= 1
+
+            n1 = indication[i]
+            f = (n - n1) / (indication[i + 1] - n1)
+            o1 = outflows_table[i]
+            o = o1 + (outflows_table[i + 1] - o1) * f
+            h1 = elevations[i]
+            outflows[t] = o
+            levels[t] = h1 + (elevations[i + 1] - h1) * f
+
+        return outflows, levels
@@ -0,0 +1,127 @@
+import math
+
+from .constants import GRAVITY_G
+from .utils import is_sequence
+
+UNIT_WEIGHT = 1000.0 * GRAVITY_G    # N/m^3 - Unit weight of water
+
+# Permissible velocity (m/s) and tractive force (Pa) for clear water in
+# straight canals after aging (Fortier and Scobey), with the angle of repose
+# (degrees) of non-cohesive materials. Rigid linings have no shear limit.
+MATERIALS = {
+    'fine_sand': {'permissible_velocity': 0.46, 'permissible_shear': 1.3, 'angle_of_repose': 30.0},
+    'sandy_loam': {'permissible_velocity': 0.53, 'permissible_shear': 1.8, 'angle_of_repose': None},
+    'silt_loam': {'permissible_velocity': 0.61, 'permissible_shear': 2.3, 'angle_of_repose': None},
+    'firm_loam': {'permissible_velocity': 0.76, 'permissible_shear': 3.6, 'angle_of_repose': None},
+    'fine_gravel': {'permissible_velocity': 0.76, 'permissible_shear': 3.6, 'angle_of_repose': 32.0},
+    'stiff_clay': {'permissible_velocity': 1.14, 'permissible_shear': 12.4, 'angle_of_repose': None},
+    'coarse_gravel': {'permissible_velocity': 1.22, 'permissible_shear': 14.4, 'angle_of_repose': 35.0},
+    'cobbles': {'permissible_velocity': 1.52, 'permissible_shear': 43.6, 'angle_of_repose': 38.0},
+    'shale': {'permissible_velocity': 1.83, 'permissible_shear': 32.1, 'angle_of_repose': None},
+    'concrete': {'permissible_velocity': 6.0, 'permissible_shear': None, 'angle_of_repose': None},
+}
+
+CHECKS = ('velocity', 'bed_shear', 'bank_shear', 'side_slope')
+
+
+def tractive_force_ratio(side_slope: float, angle_of_repose: float):
+    """
+    Ratio K = sqrt(1 - sin^2(theta) / sin^2(phi)) of the permissible shear on
+    a bank inclined at theta to that on the bed, for a material with angle of
+    repose phi. None when the bank is steeper than the angle of repose.
+
+    Args:
+        side_slope (float): horizontal run per unit rise of the bank
+        angle_of_repose (float): angle of repose in degrees
+    """
+    theta = math.atan2(1.0, side_slope)
+    phi = math.radians(angle_of_repose)
+    if theta >= phi:
+        return None
+    return math.sqrt(1 - math.sin(theta) ** 2 / math.sin(phi) ** 2)
+
+
+def _column(values, length):
+    if is_sequence(values):
+        if len(values) != length:
+            raise ValueError('Columns must have the same length.')
+        return values
+    return [values] * length
+
+
+def check_linings(flows, slopes, side_slopes=0.0, materials=None, bank_shear_factor: float = 0.76):
+    """
+    Tractive force and permissible velocity checks of a canal inventory
+    against lining materials.
+
+    The bed shear is gamma R S. The bank shear is bank_shear_factor
+    gamma y S, 0.76 being Lane's maximum for trapezoidal canals, and is
+    compared with the bed limit reduced by the tractive force ratio K of
+    the bank. Cohesive and rigid linings (no angle of repose) use K = 1 and
+    always pass the side slope check.
+
+    Args:
+        flows: mapping with 'water_depth', 'hydraulic_radius' and 'velocity'
+            columns of normal flow results, e.g. a ResultTable
+        slopes: bed slope, or a sequence with one per segment
+        side_slopes: side slope (horizontal per vertical), or a sequence
+        materials (dict): material name to its permissible_velocity,
+            permissible_shear and angle_of_repose, MATERIALS if None
+        bank_shear_factor (float): maximum bank shear over gamma y S
+
+    Returns:
+        dict: 'bed_shear' and 'bank_shear' (Pa) per segment, 'checks' with a
+        list of booleans per material and check, and 'passes' with a list
+        of booleans per material, True where every check passes
+    """
+    materials = MATERIALS if materials is None else materials
+    depths = flows['water_depth']
+    radii = flows['hydraulic_radius']
+    velocities = flows['velocity']
+    count = len(depths)
+    slopes = _column(slopes, count)
+    side_slopes = _column(side_slopes, count)
+
+    bed_shear = [UNIT_WEIGHT * r * s for r, s in zip(radii, slopes)]
+    bank_shear = [bank_shear_factor * UNIT_WEIGHT * y * s for y, s in zip(depths, slopes)]
+
+    # Tractive force ratios per distinct side slope and angle of repose
+    ratios = {}
+    for properties in materials.values():
+        phi = properties.get('angle_of_repose')
+        if phi is not None:
+            for m in set(side_slopes):
+                ratios[m, phi] = tractive_force_ratio(m, phi)
+
+    checks = {}
+    passes = {}
+    for name, properties in materials.items():
+        max_velocity = properties['permissible_velocity']
+        max_shear = properties.get('permissible_shear')
+        phi = properties.get('angle_of_repose')
+
+        velocity_ok = [v <= max_velocity for v in velocities]
+        if max_shear is None:
+            bed_ok = [True] * count
+            bank_ok = [True] * count
+            slope_ok = [True] * count
+        elif phi is None:
+            bed_ok = [t <= max_shear for t in bed_shear]
+            bank_ok = [t <= max_shear for t in bank_shear]
+            slope_ok = [True] * count
+        else:
+            k = [ratios[m, phi] for m in side_slopes]
+            bed_ok = [t <= max_shear for t in bed_shear]
+            slope_ok = [ratio is not None for ratio in k]
+            bank_ok = [ratio is not None and t <= ratio * max_shear for t, ratio in zip(bank_shear, k)]
+
+        checks[name] = {'velocity': velocity_ok, 'bed_shear': bed_ok,
+                        'bank_shear': bank_ok, 'side_slope': slope_ok}
+        passes[name] = [all(row) for row in zip(velocity_ok, bed_ok, bank_ok, slope_ok)]
+
+    return {
+        'bed_shear': bed_shear,
+        'bank_shear': bank_shear,
+        'checks': checks,
+        'passes': passes
+    }
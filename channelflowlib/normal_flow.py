@@ -0,0 +1,98 @@
+import math
+
+from .geometry import SectionGeometry, section_parameters
+from .roots import find_root
+from .utils import is_sequence
+
+
+def _resolve(section, roughness, slope):
+    """
+    Geometry, roughness and slope, taking missing values from a section class
+    instance.
+    """
+    if isinstance(section, SectionGeometry):
+        if roughness is None or slope is None:
+            raise ValueError('Roughness and slope are required with a geometry object.')
+        return section, roughness, slope
+    geometry, n, s = section_parameters(section)
+    return geometry, n if roughness is None else roughness, s if slope is None else slope
+
+
+def _full_conveyance_depth(geometry):
+    """
+    Depth of maximum conveyance of a closed or bounded section, e.g. about
+    0.938 D in a circular pipe. Normal depth is searched below it.
+    """
+    steps = 64
+    best = geometry.max_depth
+    best_k = geometry.conveyance(best)
+    for i in range(1, steps):
+        y = geometry.max_depth * i / steps
+        k = geometry.conveyance(y)
+        if k > best_k:
+            best = y
+            best_k = k
+    return best
+
+
+def _normal_depth(geometry, q, roughness, slope, hi=None):
+    if q <= 0:
+        return 0.0
+    target = q * roughness / math.sqrt(slope)
+
+    def f(y):
+        return geometry.conveyance(y) - target
+
+    if hi is None:
+        if geometry.max_depth is not None:
+            hi = _full_conveyance_depth(geometry)
+        else:
+            hi = 1.0
+            while f(hi) < 0:
+                hi *= 2.0
+    f_hi = f(hi)
+    if f_hi < 0:
+        return None
+    return find_root(f, 0.0, hi, -target, f_hi)
+
+
+def normal_discharge(section, depths, roughness: float = None, slope: float = None):
+    """
+    Manning discharge at one depth or a sequence of depths.
+
+    Args:
+        section: geometry object or section class instance
+        depths: flow depth (m) or sequence of depths
+        roughness (float): Manning's n, from the section if None
+        slope (float): bed slope, from the section if None
+
+    Returns:
+        float or list: discharge (cms)
+    """
+    geometry, n, s = _resolve(section, roughness, slope)
+    factor = math.sqrt(s) / n
+    if is_sequence(depths):
+        return [k * factor for k in geometry.conveyance(depths)]
+    return geometry.conveyance(depths) * factor
+
+
+def normal_depth(section, discharges, roughness: float = None, slope: float = None):
+    """
+    Normal depth for one discharge or a sequence of discharges.
+
+    Args:
+        section: geometry object or section class instance
+        discharges: discharge (cms) or sequence of discharges
+        roughness (float): Manning's n, from the section if None
+        slope (float): bed slope, from the section if None
+
+    Returns:
+        float or list: normal depth (m), None where the discharge exceeds the
+        capacity of a closed or bounded section
+    """
+    geometry, n, s = _resolve(section, roughness, slope)
+    if not is_sequence(discharges):
+        return _normal_depth(geometry, discharges, n, s)
+
+    hi = _full_conveyance_depth(geometry) if geometry.max_depth is not None else None
+    return [_normal_depth(geometry, q, n, s, hi) for q in discharges]
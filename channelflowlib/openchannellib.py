@@ -22,8 +22,17 @@
 #           of open channels using the Manning's equation.                  #
 # --------------------------------------------------------------------------#
 import math
+from array import array
+from bisect import bisect_left
 
+from . import kernels
 from .constants import GRAVITY_G
+from .exceptions import (
+    STATUS_OK,
+    InvalidInputError,
+    WaterAboveSectionError,
+    WaterBelowSectionError
+)
 from .critical_flow import (
     solve_critical_flow_rectangular,
     solve_critical_flow_trapezoidal,
@@ -172,17 +181,7 @@ class Rectangular:
             n = self.roughness
             b = self.channel_base
 
-            q_trial = 0.0
-            d = 0.0
-            v = 0.0
-            if q > 0:
-                while q_trial < q:
-                    d += 0.00001
-                    a = d * b
-                    p = b + 2*d
-                    r = a / p
-                    v = (1/n) * s**.5 * r**(2/3)
-                    q_trial = a * v
+            d, a, p, r, v = kernels.call('manning_depth_search', q, s, n, b, 0.0, 0.00001)
             self.velocity = v
             self.water_depth = d
             self.wetted_area = a
@@ -219,12 +218,7 @@ class Rectangular:
             v = 0.0
 
             if q > 0:
-                s = 0.0
-                q_trial = 0.0
-                while q_trial < q:
-                    s += 0.0000001
-                    v = (1/n) * s**0.5 * r**(2.0/3)
-                    q_trial = v * a
+                s, v = kernels.call('manning_slope_search', q, n, a, r, 0.0000001)
                 # Pass to global variable
                 self.channel_slope = s
                 self.velocity = v
@@ -238,20 +232,7 @@ class Rectangular:
             s = self.channel_slope
             n = self.roughness
 
-            q_trial = 0.0
-            b = 0.0
-            a = 0.0
-            p = 0.0
-            r = 0.0
-
-            while q_trial < q:
-                if q > 0:
-                    b += 0.0001
-                    a = b * d
-                    p = b + 2 * d
-                    r = a / p
-                    v = (1/n) * s ** 0.5 * r ** (2.0/3)
-                    q_trial = v * a
+            b, a, p, r, v = kernels.call('manning_base_search', q, s, n, d, 0.0, 0.0001)
             self.channel_base = b
             self.velocity = v
             self.wetted_area = a
@@ -408,20 +389,7 @@ class Trapezoidal:
             n = self.roughness
             b = self.channel_base
 
-            q_trial = 0.0
-            d = 0.0
-            a = 0.0
-            p = 0.0
-            r = 0.0
-            v = 0.0
-
-            while q_trial < q:
-                d += 0.0001
-                a = (b + d * ss) * d
-                p = 2 * d * (ss**2 + 1)**0.5 + b
-                r = a / p
-                v = (1/n) * r ** (2.0/3) * s ** 0.5
-                q_trial = v * a
+            d, a, p, r, v = kernels.call('manning_depth_search_trapezoidal', q, s, n, b, ss, 0.0001)
 
             self.velocity = v
             self.wetted_area = a
@@ -457,21 +425,12 @@ class Trapezoidal:
             b = self.channel_base
             n = self.roughness
 
-            q_trial = 0.0
-            v = 0.0
-            a = 0.0
-            p = 0.0
-            r = 0.0
-            s = 0.0
+            a = (b + d * ss) * d
+            p = 2 * d * (ss**2 + 1)**0.5 + b
+            r = a / p
 
             if q > 0:
-                while q_trial < q:
-                    s += 0.000001
-                    a = (b + d * ss) * d
-                    p = 2 * d * (ss**2 + 1)**0.5 + b
-                    r = a / p
-                    v = (1/n) * s ** 0.5 * r ** (2.0/3)
-                    q_trial = v * a
+                s, v = kernels.call('manning_slope_search', q, n, a, r, 0.000001)
 
                 # Pass to global variable
                 self.channel_slope = s
@@ -488,21 +447,8 @@ class Trapezoidal:
             d = self.water_depth
             n = self.roughness
 
-            q_trial = 0.0
-            b = 0.0
-            a = 0.0
-            p = 0.0
-            r = 0.0
-            v = 0.0
-
             if q > 0:
-                while q_trial < q:
-                    b += 0.0001
-                    a = (b + d * ss) * d
-                    p = 2 * d * (ss**2 + 1)**0.5 + b
-                    r = a / p
-                    v = (1/n) * s ** 0.5 * r ** (2.0/3)
-                    q_trial = v * a
+                b, a, p, r, v = kernels.call('manning_base_search', q, s, n, d, ss, 0.0001)
 
                 self.channel_base = b
                 self.wetted_area = a
@@ -622,8 +568,9 @@ class Circular:
         n = self.roughness
 
         if h >= dia:
-            print('Error in input. Water depth is greater than or equal to pipe diameter!')
-            return 0, 0, 0, 0, 0
+            raise WaterAboveSectionError('Water depth is greater than or equal to pipe diameter.')
+        if h <= 0:
+            raise WaterBelowSectionError('Water depth must be greater than zero.')
 
         if h < (dia/2):
             almost_full = False  # Indicates that the water surface is below the center
@@ -671,12 +618,196 @@ class Circular:
         return self.discharge, self.velocity, self.wetted_area, self.wetted_perimeter, self.hydraulic_radius
 
 
+class _PointArray:
+    """
+    Read-only sequence of (x, y) vertices over a buffer of doubles, either an
+    (N, 2) array or a flat x0, y0, x1, y1, ... buffer. Float64 buffers are
+    used in place without copying; xs and ys are strided views into them.
+    """
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if view.format == 'd' and view.c_contiguous:
+            flat = view.cast('B').cast('d')
+        else:
+            values = view.tolist()
+            if values and isinstance(values[0], list):
+                values = [value for row in values for value in row]
+            flat = memoryview(array('d', values))
+        if len(flat) % 2:
+            raise ValueError('Point buffers need an even number of coordinates.')
+        self.flat = flat
+        self.xs = flat[0::2]
+        self.ys = flat[1::2]
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.xs[index], self.ys[index]
+
+    def __iter__(self):
+        return zip(self.xs, self.ys)
+
+    def __reduce__(self):
+        return _PointArray, (array('d', self.flat),)
+
+
+def _as_points(points):
+    """
+    Wraps buffer-protocol inputs (e.g. NumPy arrays or array('d')) in a
+    _PointArray, and leaves sequences of (x, y) pairs as they are.
+    """
+    if isinstance(points, (tuple, list, _PointArray)):
+        return points
+    try:
+        memoryview(points)
+    except TypeError:
+        return points
+    return _PointArray(points)
+
+
+def _coordinates(points):
+    """
+    Get the x and y coordinates of the vertices as two sequences
+    :param points:
+    :return: xs, ys
+    """
+    if isinstance(points, _PointArray):
+        return points.xs, points.ys
+    return [point[0] for point in points], [point[1] for point in points]
+
+
+class _ElevationIndex:
+    """
+    Index of the segments of a cross section by elevation, used to clip the
+    section at a water surface without scanning every vertex.
+
+    Segments lying entirely below the water surface are found with a binary
+    search over their sorted top elevations and summed with prefix sums.
+    Segments crossed by the water surface are found with a centered interval
+    tree over their elevation ranges.
+    """
+    def __init__(self, points):
+        """
+        Build the index from the section vertices
+        :param points:
+        """
+        xs, ys = _coordinates(points)
+        x1s, x2s = xs[:-1], xs[1:]
+        y1s, y2s = ys[:-1], ys[1:]
+        num_segments = len(xs) - 1
+
+        self.lowest = min(ys)
+        self.lows = [min(y1, y2) for y1, y2 in zip(y1s, y2s)]
+        self.highs = [max(y1, y2) for y1, y2 in zip(y1s, y2s)]
+        self.widths = [abs(x2 - x1) for x1, x2 in zip(x1s, x2s)]
+        self.lengths = [math.sqrt((x2 - x1)**2 + (y2 - y1)**2) for x1, x2, y1, y2 in zip(x1s, x2s, y1s, y2s)]
+
+        # Prefix sums over the segments sorted by their highest point
+        order = sorted(range(num_segments), key=lambda k: self.highs[k])
+        self.sorted_highs = [self.highs[k] for k in order]
+        self.sum_width = [0.0]
+        self.sum_integral = [0.0]
+        self.sum_length = [0.0]
+        self.sum_square = [0.0]
+        for k in order:
+            y1 = ys[k]
+            y2 = ys[k + 1]
+            self.sum_width.append(self.sum_width[-1] + self.widths[k])
+            self.sum_integral.append(self.sum_integral[-1] + self.widths[k] * (y1 + y2) / 2.0)
+            self.sum_length.append(self.sum_length[-1] + self.lengths[k])
+            self.sum_square.append(self.sum_square[-1] + self.widths[k] * (y1*y1 + y1*y2 + y2*y2) / 3.0)
+
+        self.tree = self._build_tree(list(range(num_segments)))
+
+    def _build_tree(self, indices):
+        if not indices:
+            return None
+        ends = sorted([self.lows[k] for k in indices] + [self.highs[k] for k in indices])
+        center = ends[len(ends) // 2]
+        left = [k for k in indices if self.highs[k] < center]
+        right = [k for k in indices if self.lows[k] > center]
+        middle = [k for k in indices if self.lows[k] <= center <= self.highs[k]]
+        by_low = sorted(middle, key=lambda k: self.lows[k])
+        by_high = sorted(middle, key=lambda k: -self.highs[k])
+        return center, by_low, by_high, self._build_tree(left), self._build_tree(right)
+
+    def crossing_segments(self, elevation):
+        """
+        Get the segments with their lowest point below and their highest point
+        at or above the elevation
+        :param elevation:
+        :return: list of segment indices
+        """
+        found = []
+        node = self.tree
+        while node is not None:
+            center, by_low, by_high, left, right = node
+            if elevation <= center:
+                for k in by_low:
+                    if self.lows[k] >= elevation:
+                        break
+                    found.append(k)
+                node = left
+            else:
+                for k in by_high:
+                    if self.highs[k] < elevation:
+                        break
+                    found.append(k)
+                node = right
+        return found
+
+    def wetted_properties(self, elevation):
+        """
+        Get the wetted area, perimeter and top width at a water surface elevation
+        :param elevation:
+        :return: area, perimeter, top_width
+        """
+        count = bisect_left(self.sorted_highs, elevation)
+        top_width = self.sum_width[count]
+        area = elevation * top_width - self.sum_integral[count]
+        perimeter = self.sum_length[count]
+
+        for k in self.crossing_segments(elevation):
+            low = self.lows[k]
+            high = self.highs[k]
+            fraction = (elevation - low) / (high - low)
+            width = self.widths[k] * fraction
+            top_width += width
+            area += width * (elevation - low) / 2.0
+            perimeter += self.lengths[k] * fraction
+
+        return area, perimeter, top_width
+
+    def first_moment(self, elevation):
+        """
+        Get the first moment of the wetted area about the water surface
+        :param elevation:
+        :return: first moment
+        """
+        count = bisect_left(self.sorted_highs, elevation)
+        moment = (elevation * elevation * self.sum_width[count]
+                  - 2 * elevation * self.sum_integral[count]
+                  + self.sum_square[count]) / 2.0
+
+        for k in self.crossing_segments(elevation):
+            low = self.lows[k]
+            depth = elevation - low
+            width = self.widths[k] * depth / (self.highs[k] - low)
+            moment += width * depth * depth / 6.0
+
+        return moment
+
+
 # This class if for irrregular shape channels like rivers and creeks
 class IrregularSection:
     def __init__(self, points):
         """
         Constructor and initializations
-        :param points:
+        :param points: (x, y) pairs, or an (N, 2) or flat buffer of doubles
+            such as a NumPy array, used without copying
         :return:
         """
         self.points = points
@@ -693,6 +824,16 @@ class IrregularSection:
         self.min_water_elevation = 0.0
         self.froude_number = 0.0
 
+    @property
+    def points(self):
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        # A new outline invalidates the elevation index built from the old one
+        self._points = _as_points(points)
+        self._elevation_index = None
+
     # ---------
     # Setters
     # ---------
@@ -726,9 +867,9 @@ class IrregularSection:
     def analyze(self):
         # Validate inputs
         if self.bed_slope == 0:
-            raise Exception
+            raise InvalidInputError('Bed slope must not be zero.')
         if self.roughness == 0:
-            raise Exception
+            raise InvalidInputError('Roughness must not be zero.')
 
         # Count the points
         num_points = len(self.points)
@@ -742,65 +883,79 @@ class IrregularSection:
         self.max_water_elevation = max_ws
 
         if self.water_elevation > max_ws:
-            print('Water will overflow the bank!')
-            # raise Exception
-            return
+            raise WaterAboveSectionError('Water will overflow the bank.')
 
         # Get the lowest possible water elevation
-        if self.water_elevation < self.get_lowest_elev(self.points):
-            print('Water surface is below the lowest point of the channel.')
-            return
-
-        # Number of intersections
-        left = 0
-        right = 0
-
-        new_points = []     # New points, removing points out of range of the intersection
-
-        for index in range(len(self.points)):
-            x, y = self.points[index]
-
-            # Look for the first point of intersection
-            if left == 0:
-                if y < self.water_elevation:
-                    left += 1
-                    x1 = self.points[index-1][0]
-                    y1 = self.points[index-1][1]
-                    x2 = self.points[index][0]
-                    y2 = self.points[index][1]
-                    x3 = (self.water_elevation - y1) * (x2 - x1) / (y2 - y1) + x1
-                    new_points.append((x3, self.water_elevation))  # Add this point as the first new point from the left
-
-            if right == 0:
-                if left == 1:
-                    if y > self.water_elevation:
-                        right += 1
-                        x1 = self.points[index-1][0]
-                        y1 = self.points[index-1][1]
-                        x2 = self.points[index][0]
-                        y2 = self.points[index][1]
-                        x3 = (self.water_elevation - y1) * (x2 - x1) / (y2 - y1) + x1
-                        new_points.append((x3, self.water_elevation))
-
-            if left == 1:
-                if right == 0:
-                    new_points.append(self.points[index])
-
-        left_top_bank_point = new_points[0]
-        right_top_bank_point = new_points[len(new_points) - 1]
+        if self.water_elevation <= self.get_elevation_index().lowest:
+            raise WaterBelowSectionError('Water surface is at or below the lowest point of the channel.')
 
         # Hydraulic elements
-        self.wetted_area = self.polygon_area(new_points)
-        self.wetted_perimeter = self.get_perimeter(new_points)
+        area, perimeter, top_width = self.get_wetted_properties(self.water_elevation)
+        self.wetted_area = area
+        self.wetted_perimeter = perimeter
         self.hydraulic_radius = self.wetted_area / self.wetted_perimeter
         self.velocity = (1 / self.roughness) * self.hydraulic_radius**(2/3) * self.bed_slope**0.5
         self.discharge = self.velocity * self.wetted_area
 
-        self.top_width = right_top_bank_point[0] - left_top_bank_point[0]
-        hydraulic_depth = self.polygon_area(new_points) / self.top_width
+        self.top_width = top_width
+        hydraulic_depth = self.wetted_area / self.top_width
         self.froude_number = self.velocity / math.sqrt(GRAVITY_G * hydraulic_depth)
         self.discharge_intensity = self.discharge / self.top_width
 
+    def get_elevation_index(self):
+        """
+        Get the segment elevation index of the section, built on first use
+        :return: _ElevationIndex
+        """
+        if self._elevation_index is None:
+            self._elevation_index = _ElevationIndex(self.points)
+        return self._elevation_index
+
+    def get_wetted_properties(self, water_elevation):
+        """
+        Get the wetted area, wetted perimeter and top width at a water surface
+        elevation. Every part of the section below the water surface is counted,
+        so sections with several wetted pockets (e.g. a mid-channel bar) are
+        handled.
+        :param water_elevation:
+        :return: area, perimeter, top_width
+        """
+        return self.get_elevation_index().wetted_properties(water_elevation)
+
+    def analyze_elevations(self, water_elevations):
+        """
+        Analyze the section at many water surface elevations without raising
+        for the invalid ones. Each row gets a status code from the exceptions
+        module, STATUS_OK when valid, and the hydraulic elements of invalid
+        rows are NaN.
+        :param water_elevations:
+        :return: dict of lists keyed by element name, with 'status' and 'valid'
+        """
+        names = ('wetted_area', 'wetted_perimeter', 'hydraulic_radius', 'velocity',
+                 'discharge', 'top_width', 'froude_number')
+        results = {name: [] for name in names}
+        results['status'] = []
+        results['valid'] = []
+        nan = float('nan')
+
+        water_elevation = self.water_elevation
+        try:
+            for elevation in water_elevations:
+                self.water_elevation = elevation
+                try:
+                    self.analyze()
+                    status = STATUS_OK
+                except (InvalidInputError, WaterAboveSectionError, WaterBelowSectionError) as e:
+                    status = e.status
+                for name in names:
+                    results[name].append(getattr(self, name) if status == STATUS_OK else nan)
+                results['status'].append(status)
+                results['valid'].append(status == STATUS_OK)
+        finally:
+            self.water_elevation = water_elevation
+
+        return results
+
     def polygon_area(self, vertices):
         """
         Implementation of Shoelace Formula in finding the area of a closed
@@ -808,14 +963,9 @@ class IrregularSection:
         :param vertices:
         :return:
         """
-        n = len(vertices) # of corners
-        area = 0.0
-        for i in range(n):
-            j = (i + 1) % n
-            area += vertices[i][0] * vertices[j][1]
-            area -= vertices[j][0] * vertices[i][1]
-        area = abs(area) / 2.0
-        return area
+        xs = [vertex[0] for vertex in vertices]
+        ys = [vertex[1] for vertex in vertices]
+        return kernels.call('shoelace', xs, ys)
 
     def get_perimeter(self, points):
         """
@@ -0,0 +1,190 @@
+import math
+from array import array
+from multiprocessing import shared_memory
+
+from .openchannellib import _ElevationIndex
+from .utils import is_sequence, map_jobs
+
+DOUBLE_SIZE = array('d').itemsize
+
+
+class RatingGrid:
+    """
+    Discharges of many irregular sections over a grid of depths and Manning's
+    roughness values.
+
+    Discharges are stored flat in one array, ordered section by section, then
+    depth, then roughness. Depths are measured from the lowest point of each
+    section; values above the lower bank are NaN.
+
+    Args:
+        depths (list): flow depths (m)
+        roughnesses (list): Manning's roughness coefficients
+        discharges (array): flat array of discharges (cms)
+    """
+
+    def __init__(self, depths, roughnesses, discharges):
+        self.depths = list(depths)
+        self.roughnesses = list(roughnesses)
+        self.discharges = discharges
+
+    def __len__(self):
+        return len(self.discharges) // (len(self.depths) * len(self.roughnesses))
+
+    def discharge(self, section: int, depth_index: int, roughness_index: int):
+        """
+        Discharge (cms) of one section at one depth and roughness.
+        """
+        num_roughnesses = len(self.roughnesses)
+        return self.discharges[(section * len(self.depths) + depth_index) * num_roughnesses + roughness_index]
+
+    def table(self, section: int):
+        """
+        Rating table of one section as a list of rows, one per depth, with
+        one discharge per roughness.
+        """
+        num_roughnesses = len(self.roughnesses)
+        start = section * len(self.depths) * num_roughnesses
+        return [list(self.discharges[start + i * num_roughnesses:start + (i + 1) * num_roughnesses])
+                for i in range(len(self.depths))]
+
+
+def _evaluate(coords, offsets, depths, roughnesses, slopes, out, start, stop):
+    """
+    Fills the output rows of sections start to stop. All arguments are flat
+    sequences of numbers, either arrays or views of shared memory blocks.
+    """
+    num_depths = len(depths)
+    num_roughnesses = len(roughnesses)
+    nan = float('nan')
+
+    for s in range(start, stop):
+        first = offsets[s]
+        last = offsets[s + 1]
+        points = [(coords[2 * k], coords[2 * k + 1]) for k in range(first, last)]
+        index = _ElevationIndex(points)
+        bank = min(points[0][1], points[-1][1])
+        root_slope = math.sqrt(slopes[s])
+
+        row = s * num_depths * num_roughnesses
+        for i in range(num_depths):
+            elevation = index.lowest + depths[i]
+            if elevation > bank:
+                k = nan
+            else:
+                a, p, t = index.wetted_properties(elevation)
+                k = a * (a / p) ** (2.0 / 3.0) * root_slope if a > 0 else 0.0
+            for j in range(num_roughnesses):
+                out[row + i * num_roughnesses + j] = k / roughnesses[j]
+
+
+def _evaluate_shared(args):
+    """
+    Worker entry point: attaches to the shared blocks by name and writes the
+    results of its sections directly into the output block.
+    """
+    names, num_points, num_sections, num_depths, num_roughnesses, start, stop = args
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    views = []
+    try:
+        coords = blocks[0].buf.cast('d')[:2 * num_points]
+        offsets = blocks[1].buf.cast('q')[:num_sections + 1]
+        params = blocks[2].buf.cast('d')
+        out = blocks[3].buf.cast('d')
+        depths = params[:num_depths]
+        roughnesses = params[num_depths:num_depths + num_roughnesses]
+        slopes = params[num_depths + num_roughnesses:num_depths + num_roughnesses + num_sections]
+        views = [coords, offsets, params, out, depths, roughnesses, slopes]
+        _evaluate(coords, offsets, depths, roughnesses, slopes, out, start, stop)
+    finally:
+        # Views must be released before the blocks can be closed
+        for view in views:
+            view.release()
+        for block in blocks:
+            block.close()
+
+    return stop - start
+
+
+def _shared_block(data):
+    """
+    Creates a shared memory block holding a copy of an array.
+    """
+    size = max(len(data) * data.itemsize, DOUBLE_SIZE)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    block.buf[:len(data) * data.itemsize] = memoryview(data).cast('B')
+    return block
+
+
+def rating_grid(sections, depths, roughnesses, slopes, workers: int = 1, chunk_size: int = None):
+    """
+    Evaluates the Manning discharge of many irregular sections at every
+    combination of depth and roughness.
+
+    With more than one worker the section coordinates, the parameters and the
+    output are placed in shared memory blocks. Workers receive only the block
+    names and a range of sections, and write their results in place, so
+    nothing but a few integers is pickled between processes.
+
+    Args:
+        sections (list): point sequences or ``IrregularSection`` instances
+        depths (list): flow depths (m) measured from the lowest point of each section
+        roughnesses (list): Manning's roughness coefficients
+        slopes: bed slope for all sections, or a sequence with one per section
+        workers (int): number of worker processes
+        chunk_size (int): number of sections per task, chosen from the number
+            of workers if None
+
+    Returns:
+        RatingGrid: discharges (cms) per section, depth and roughness
+    """
+    coords = array('d')
+    offsets = array('q', [0])
+    for section in sections:
+        points = getattr(section, 'points', section)
+        for x, y in points:
+            coords.append(x)
+            coords.append(y)
+        offsets.append(len(coords) // 2)
+
+    num_sections = len(offsets) - 1
+    if not is_sequence(slopes):
+        slopes = [slopes] * num_sections
+    elif len(slopes) != num_sections:
+        raise ValueError('One slope per section is required.')
+
+    params = array('d', list(depths) + list(roughnesses) + list(slopes))
+    num_depths = len(depths)
+    num_roughnesses = len(roughnesses)
+    size = num_sections * num_depths * num_roughnesses
+
+    if workers <= 1 or num_sections < 2:
+        out = array('d', [0.0]) * size
+        _evaluate(coords, offsets, params[:num_depths], params[num_depths:num_depths + num_roughnesses],
+                  params[num_depths + num_roughnesses:], out, 0, num_sections)
+        return RatingGrid(depths, roughnesses, out)
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-num_sections // (4 * workers)))
+
+    blocks = []
+    try:
+        blocks.append(_shared_block(coords))
+        blocks.append(_shared_block(offsets))
+        blocks.append(_shared_block(params))
+        blocks.append(shared_memory.SharedMemory(create=True, size=max(size * DOUBLE_SIZE, DOUBLE_SIZE)))
+        names = [block.name for block in blocks]
+
+        jobs = [(names, len(coords) // 2, num_sections, num_depths, num_roughnesses,
+                 start, min(start + chunk_size, num_sections))
+                for start in range(0, num_sections, chunk_size)]
+        map_jobs(_evaluate_shared, jobs, workers)
+
+        out = array('d')
+        out.frombytes(blocks[3].buf[:size * DOUBLE_SIZE])
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return RatingGrid(depths, roughnesses, out)
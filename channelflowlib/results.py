@@ -0,0 +1,209 @@
+import ast
+import csv
+import mmap
+import sys
+import zipfile
+from array import array
+
+from .exceptions import STATUS_OK
+
+HYDRAULIC_FIELDS = ('discharge', 'velocity', 'wetted_area', 'wetted_perimeter', 'hydraulic_radius',
+                    'water_depth', 'top_width', 'froude_number')
+CRITICAL_FIELDS = ('critical_depth', 'critical_flow_area', 'critical_wetted_perimeter',
+                   'critical_hydraulic_radius', 'critical_slope', 'hydraulic_depth', 'discharge_intensity')
+FIELDS = HYDRAULIC_FIELDS + CRITICAL_FIELDS + ('status',)
+
+# Column types, both 8 bytes wide so that records stay aligned
+DESCR = {'d': '<f8', 'q': '<i8'}
+TYPECODES = {value: key for key, value in DESCR.items()}
+NPY_MAGIC = b'\x93NUMPY'
+
+
+def _typecode(name):
+    return 'q' if name == 'status' else 'd'
+
+
+def _npy_header(descr, length):
+    """
+    NPY format 1.0 header, padded so that the data starts on a 64 byte boundary.
+    """
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (descr, length)
+    padding = 64 - (len(NPY_MAGIC) + 4 + len(header) + 1) % 64
+    header += ' ' * (padding % 64) + '\n'
+    return NPY_MAGIC + b'\x01\x00' + len(header).to_bytes(2, 'little') + header.encode('latin1')
+
+
+def _read_npy_header(f):
+    if f.read(6) != NPY_MAGIC:
+        raise ValueError('Not an NPY file.')
+    major = f.read(2)[0]
+    size = int.from_bytes(f.read(2 if major == 1 else 4), 'little')
+    header = ast.literal_eval(f.read(size).decode('latin1'))
+    if header['fortran_order'] or len(header['shape']) != 1:
+        raise ValueError('Only one-dimensional NPY files are supported.')
+    return header['descr'], header['shape'][0], f.tell()
+
+
+class ResultTable:
+    """
+    Columnar container of hydraulic and critical flow results.
+
+    Each output is one column, an array of doubles (status codes: 64 bit
+    integers), instead of one set of attributes and one critical flow dict
+    per solve. Columns loaded with mmap are read-only memoryviews into the
+    file.
+
+    Args:
+        columns (dict): field name to column, all of the same length
+    """
+
+    def __init__(self, columns):
+        self.columns = dict(columns)
+        lengths = set(len(column) for column in self.columns.values())
+        if len(lengths) > 1:
+            raise ValueError('Columns must have the same length.')
+
+    @classmethod
+    def empty(cls, fields=FIELDS):
+        return cls({name: array(_typecode(name)) for name in fields})
+
+    @property
+    def fields(self):
+        return tuple(self.columns)
+
+    def __len__(self):
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def append_section(self, section, status: int = STATUS_OK):
+        """
+        Appends the results of an analyzed section class instance, critical
+        flow outputs from its critical flow dict and the others from its
+        attributes. Missing outputs, and all outputs of a failed row, are
+        stored as NaN.
+        """
+        nan = float('nan')
+        critical = getattr(section, 'critical_flow', None) or {}
+        for name, column in self.columns.items():
+            if name == 'status':
+                column.append(status)
+            elif status != STATUS_OK:
+                column.append(nan)
+            elif name in CRITICAL_FIELDS and name in critical:
+                column.append(critical[name])
+            elif hasattr(section, name):
+                column.append(getattr(section, name))
+            else:
+                column.append(critical.get(name, nan))
+
+    def extend(self, **columns):
+        """
+        Appends whole columns of results at once, e.g. from a batch API.
+        Fields not given are filled with NaN (status: STATUS_OK).
+        """
+        count = len(next(iter(columns.values())))
+        for name, column in self.columns.items():
+            if name in columns:
+                column.extend(columns[name])
+            elif name == 'status':
+                column.extend(array('q', [STATUS_OK]) * count)
+            else:
+                column.extend(array('d', [float('nan')]) * count)
+
+    def valid(self):
+        """
+        Validity mask of the rows, from the status column.
+        """
+        return [status == STATUS_OK for status in self.columns['status']]
+
+    # ----------
+    # Export
+    # ----------
+    def save_npy(self, path: str):
+        """
+        Writes a NumPy structured array file (.npy), one record per row.
+        """
+        names = self.fields
+        width = len(names)
+        length = len(self)
+        data = bytearray(8 * width * length)
+        for j, name in enumerate(names):
+            column = self.columns[name]
+            view = memoryview(data).cast(_typecode(name))
+            view[j::width] = column if isinstance(column, array) else array(_typecode(name), column)
+            view.release()
+        if sys.byteorder == 'big':
+            swapped = array('d', bytes(data))
+            swapped.byteswap()
+            data = swapped.tobytes()
+
+        descr = [(name, DESCR[_typecode(name)]) for name in names]
+        with open(path, 'wb') as f:
+            f.write(_npy_header(descr, length))
+            f.write(data)
+
+    @classmethod
+    def load_npy(cls, path: str, mmap_mode: bool = False):
+        """
+        Reads a file written by save_npy. With mmap_mode the columns are
+        strided views into the memory-mapped file and nothing is copied.
+        """
+        with open(path, 'rb') as f:
+            descr, length, offset = _read_npy_header(f)
+            names = [name for name, kind in descr]
+            width = len(names)
+            if mmap_mode and sys.byteorder == 'little':
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                data = memoryview(mapped)[offset:offset + 8 * width * length]
+                return cls({name: data.cast(TYPECODES[kind])[j::width]
+                            for j, (name, kind) in enumerate(descr)})
+            data = f.read(8 * width * length)
+
+        columns = {}
+        for j, (name, kind) in enumerate(descr):
+            column = array(TYPECODES[kind])
+            column.frombytes(memoryview(data).cast(TYPECODES[kind])[j::width].tobytes())
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns[name] = column
+        return cls(columns)
+
+    def save_npz(self, path: str):
+        """
+        Writes an uncompressed NumPy archive (.npz) with one array per field.
+        """
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as archive:
+            for name in self.fields:
+                column = array(_typecode(name), self.columns[name])
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                archive.writestr(name + '.npy', _npy_header(DESCR[_typecode(name)], len(column)) + column.tobytes())
+
+    @classmethod
+    def load_npz(cls, path: str):
+        """
+        Reads an archive written by save_npz.
+        """
+        columns = {}
+        with zipfile.ZipFile(path) as archive:
+            for entry in archive.namelist():
+                with archive.open(entry) as f:
+                    kind, length, offset = _read_npy_header(f)
+                    column = array(TYPECODES[kind])
+                    column.frombytes(f.read(8 * length))
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                columns[entry[:-len('.npy')]] = column
+        return cls(columns)
+
+    def to_csv(self, stream):
+        """
+        Writes the table as CSV with a header row.
+        """
+        writer = csv.writer(stream)
+        writer.writerow(self.fields)
+        writer.writerows(zip(*self.columns.values()))
@@ -0,0 +1,29 @@
+def find_root(f, lo, hi, f_lo, f_hi, tolerance=1e-10, max_iterations=200):
+    """
+    Illinois (modified regula falsi) root finding on a bracket [lo, hi], with a
+    bisection step whenever an iteration fails to halve the bracket.
+    """
+    side = 0
+    bisect = False
+    x = lo
+    for _ in range(max_iterations):
+        width = hi - lo
+        if bisect:
+            x = (lo + hi) / 2.0
+        else:
+            x = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        fx = f(x)
+        if abs(fx) < tolerance or width < tolerance:
+            return x
+        if fx * f_hi > 0:
+            hi, f_hi = x, fx
+            if side == -1:
+                f_lo /= 2.0
+            side = -1
+        else:
+            lo, f_lo = x, fx
+            if side == 1:
+                f_hi /= 2.0
+            side = 1
+        bisect = hi - lo > width / 2.0
+    return x
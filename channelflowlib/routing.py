@@ -0,0 +1,254 @@
+import math
+
+from .utils import interpolate, job_pool, map_jobs
+
+
+class CelerityTable:
+    """
+    Kinematic wave celerity and top width against discharge for one reach.
+
+    Args:
+        discharges (list): discharges in cms, increasing
+        celerities (list): wave celerity dQ/dA in m/s at each discharge
+        top_widths (list): water surface width in meters at each discharge
+        slope (float): reach bed slope the table was computed for
+    """
+
+    def __init__(self, discharges, celerities, top_widths, slope: float):
+        self.discharges = list(discharges)
+        self.celerities = list(celerities)
+        self.top_widths = list(top_widths)
+        self.slope = slope
+
+    @classmethod
+    def from_section(cls, section, num_stages: int = 50):
+        """
+        Precomputes the table from an ``IrregularSection`` with its roughness
+        and bed slope already set, by analyzing it once per stage between the
+        lowest point and the lower bank.
+        """
+        elevations = [point[1] for point in section.points]
+        lowest = min(elevations)
+        highest = min(elevations[0], elevations[-1])
+        interval = (highest - lowest) / num_stages
+
+        areas = []
+        discharges = []
+        top_widths = []
+        for i in range(1, num_stages + 1):
+            section.set_water_elevation(min(lowest + i * interval, highest))
+            section.analyze()
+            areas.append(section.wetted_area)
+            discharges.append(section.discharge)
+            top_widths.append(section.top_width)
+
+        # dQ/dA by finite differences over the stage table
+        celerities = []
+        last = len(areas) - 1
+        for i in range(len(areas)):
+            i1 = max(i - 1, 0)
+            i2 = min(i + 1, last)
+            celerities.append((discharges[i2] - discharges[i1]) / (areas[i2] - areas[i1]))
+
+        return cls(discharges, celerities, top_widths, section.bed_slope)
+
+    def celerity(self, discharge: float):
+        return interpolate(discharge, self.discharges, self.celerities)
+
+    def top_width(self, discharge: float):
+        return interpolate(discharge, self.discharges, self.top_widths)
+
+
+class Reach:
+    """
+    A river reach routed with the Muskingum-Cunge method.
+
+    Args:
+        reach_id: unique identifier of the reach
+        table (CelerityTable): celerity and top width table of the reach
+        length (float): reach length in meters
+        downstream: identifier of the reach this one drains into, None at an outlet
+    """
+
+    def __init__(self, reach_id, table: CelerityTable, length: float, downstream=None):
+        self.reach_id = reach_id
+        self.table = table
+        self.length = length
+        self.downstream = downstream
+
+    def route(self, inflow, dt: float):
+        """
+        Routes an inflow hydrograph through the reach.
+
+        The routing parameters K and X are recomputed every time step from the
+        celerity and top width at the three-point average reference discharge.
+        The reach is split into sub-reaches no longer than the distance the
+        peak inflow wave travels in one time step. The Courant number C is
+        then at least one at the peak, which keeps C0 non-negative there. C2
+        goes negative where C exceeds 2 (1 - X); the outflow is not clipped
+        in that case, since clipping would lose volume.
+
+        Args:
+            inflow (list): inflow at the upstream end per time step (cms)
+            dt (float): time step (s)
+
+        Returns:
+            list: outflow at the downstream end per time step (cms)
+        """
+        if not inflow:
+            return []
+
+        peak_celerity = self.table.celerity(max(inflow))
+        num_sub_reaches = max(1, int(math.ceil(self.length / (peak_celerity * dt))))
+        dx = self.length / num_sub_reaches
+
+        outflow = inflow
+        for _ in range(num_sub_reaches):
+            outflow = self._route_sub_reach(outflow, dx, dt)
+
+        return outflow
+
+    def _route_sub_reach(self, inflow, dx, dt):
+        table = self.table
+        slope = table.slope
+        outflow = [0.0] * len(inflow)
+
+        outflow[0] = inflow[0]
+        for t in range(1, len(inflow)):
+            i1 = inflow[t - 1]
+            i2 = inflow[t]
+            o1 = outflow[t - 1]
+            q_ref = (i1 + i2 + o1) / 3.0
+
+            c = table.celerity(q_ref)
+            k = dx / c
+            x = 0.5 * (1.0 - q_ref / (table.top_width(q_ref) * slope * c * dx))
+            x = min(max(x, 0.0), 0.5)
+
+            denominator = k * (1 - x) + dt / 2.0
+            c0 = (dt / 2.0 - k * x) / denominator
+            c1 = (dt / 2.0 + k * x) / denominator
+            c2 = (k * (1 - x) - dt / 2.0) / denominator
+            outflow[t] = c0 * i2 + c1 * i1 + c2 * o1
+
+        return outflow
+
+
+def _route_reach(args):
+    reach, inflow, dt = args
+    return reach.route(inflow, dt)
+
+
+class RoutingNetwork:
+    """
+    Tree of reaches routed in topological order, upstream to downstream.
+    Reaches on the same topological level do not depend on each other and
+    are routed in parallel.
+
+    Args:
+        reaches (list): Reach instances, linked through their downstream ids
+    """
+
+    def __init__(self, reaches):
+        self.reaches = {reach.reach_id: reach for reach in reaches}
+        for reach in reaches:
+            if reach.downstream is not None and reach.downstream not in self.reaches:
+                raise ValueError('Unknown downstream reach: ' + str(reach.downstream))
+
+    def topological_order(self):
+        """
+        Returns the reach ids ordered so that every reach comes after all the
+        reaches draining into it.
+        """
+        pending = {reach_id: 0 for reach_id in self.reaches}
+        for reach in self.reaches.values():
+            if reach.downstream is not None:
+                pending[reach.downstream] += 1
+
+        ready = [reach_id for reach_id, count in pending.items() if count == 0]
+        order = []
+        while ready:
+            reach_id = ready.pop()
+            order.append(reach_id)
+            downstream = self.reaches[reach_id].downstream
+            if downstream is not None:
+                pending[downstream] -= 1
+                if pending[downstream] == 0:
+                    ready.append(downstream)
+
+        if len(order) != len(self.reaches):
+            raise ValueError('The reach network contains a loop.')
+
+        return order
+
+    def topological_levels(self):
+        """
+        Groups the reach ids by level: headwater reaches on level 0 and every
+        other reach one level below the deepest reach draining into it.
+        """
+        levels = {reach_id: 0 for reach_id in self.reaches}
+        for reach_id in self.topological_order():
+            downstream = self.reaches[reach_id].downstream
+            if downstream is not None:
+                levels[downstream] = max(levels[downstream], levels[reach_id] + 1)
+
+        groups = [[] for _ in range(max(levels.values()) + 1)] if levels else []
+        for reach_id, level in levels.items():
+            groups[level].append(reach_id)
+        return groups
+
+    def sub_basins(self):
+        """
+        Splits the network into independent sub-basins, one per outlet, each
+        as a list of reach ids in topological order.
+        """
+        basins = {}
+        outlets = {}
+        for reach_id in reversed(self.topological_order()):
+            downstream = self.reaches[reach_id].downstream
+            outlet = reach_id if downstream is None else outlets[downstream]
+            outlets[reach_id] = outlet
+            basins.setdefault(outlet, []).append(reach_id)
+
+        return [list(reversed(basin)) for basin in basins.values()]
+
+    def route(self, lateral_inflows, dt: float, workers: int = 1):
+        """
+        Routes local inflow hydrographs through the whole network.
+
+        Args:
+            lateral_inflows (dict): reach id to the inflow hydrograph entering
+                at the upstream end of that reach (cms per time step)
+            dt (float): time step (s)
+            workers (int): number of processes routing the reaches of a
+                level in parallel
+
+        Returns:
+            dict: reach id to its outflow hydrograph
+        """
+        num_steps = max(len(inflow) for inflow in lateral_inflows.values())
+        upstream_flows = {}
+        outflows = {}
+        with job_pool(workers) as executor:
+            for level in self.topological_levels():
+                jobs = []
+                for reach_id in level:
+                    inflow = upstream_flows.pop(reach_id, None)
+                    if inflow is None:
+                        inflow = [0.0] * num_steps
+                    local = lateral_inflows.get(reach_id)
+                    if local is not None:
+                        inflow = [a + b for a, b in zip(inflow, local)]
+                    jobs.append((self.reaches[reach_id], inflow, dt))
+
+                for reach_id, outflow in zip(level, map_jobs(_route_reach, jobs, workers, executor)):
+                    outflows[reach_id] = outflow
+                    downstream = self.reaches[reach_id].downstream
+                    if downstream is not None:
+                        previous = upstream_flows.get(downstream)
+                        if previous is None:
+                            upstream_flows[downstream] = outflow
+                        else:
+                            upstream_flows[downstream] = [a + b for a, b in zip(previous, outflow)]
+
+        return outflows
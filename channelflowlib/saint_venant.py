@@ -0,0 +1,330 @@
+import json
+import math
+
+from .constants import GRAVITY_G
+from .geometry import section_parameters
+from .utils import is_sequence
+
+
+class TransmissiveBoundary:
+    """
+    Zero-gradient boundary, lets waves leave the domain.
+    """
+
+    def ghost(self, solver, time, area, discharge):
+        return area, discharge
+
+
+class WallBoundary:
+    """
+    Reflecting boundary, e.g. a closed gate or dead end.
+    """
+
+    def ghost(self, solver, time, area, discharge):
+        return area, -discharge
+
+
+class DischargeBoundary:
+    """
+    Imposed discharge, typically an upstream inflow hydrograph.
+
+    Args:
+        discharge: discharge in cms, or a callable of time (s) returning it
+    """
+
+    def __init__(self, discharge):
+        self.discharge = discharge
+
+    def ghost(self, solver, time, area, discharge):
+        return area, _evaluate(self.discharge, time)
+
+
+class DepthBoundary:
+    """
+    Imposed water depth, typically a downstream water level.
+
+    Args:
+        depth: water depth in meters, or a callable of time (s) returning it
+    """
+
+    def __init__(self, depth):
+        self.depth = depth
+
+    def ghost(self, solver, time, area, discharge):
+        return solver.geometry.area(_evaluate(self.depth, time)), discharge
+
+
+class GateBoundary:
+    """
+    Downstream sluice gate in free flow, Q = Cd * w * a * sqrt(2 g y).
+
+    Args:
+        opening: gate opening in meters, or a callable of time (s) returning it
+        width (float): gate width in meters
+        coefficient (float): discharge coefficient, Cd
+    """
+
+    def __init__(self, opening, width: float, coefficient: float = 0.61):
+        self.opening = opening
+        self.width = width
+        self.coefficient = coefficient
+
+    def ghost(self, solver, time, area, discharge):
+        opening = _evaluate(self.opening, time)
+        depth = solver.geometry.depth_from_area(area)
+        if opening <= 0 or depth <= 0:
+            return area, -discharge
+        opening = min(opening, depth)
+        q = self.coefficient * self.width * opening * math.sqrt(2 * GRAVITY_G * depth)
+        # Mirror the interior state so that the interface discharge equals q
+        return area, 2 * q - discharge
+
+
+def _evaluate(value, time):
+    if callable(value):
+        return value(time)
+    return value
+
+
+class SaintVenantSolver:
+    """
+    One-dimensional Saint-Venant (dynamic wave) solver for prismatic channels.
+
+    Finite-volume scheme on the conservative variables (A, Q) with the HLL
+    approximate Riemann solver for the interface fluxes, the bed slope as a
+    source term and Manning friction treated semi-implicitly.
+
+    Args:
+        section: a section class instance, supplying the channel geometry,
+            the roughness and the channel slope
+        length (float): channel length (m)
+        num_cells (int): number of finite volumes
+        initial_depth: water depth (m) for all cells, or a sequence per cell
+        initial_discharge: discharge (cms) for all cells, or a sequence per cell
+        upstream: boundary condition at the upstream end
+        downstream: boundary condition at the downstream end
+        min_depth (float): depth below which a cell is treated as dry
+    """
+
+    def __init__(self, section, length: float, num_cells: int,
+                 initial_depth=0.0, initial_discharge=0.0,
+                 upstream=None, downstream=None, min_depth: float = 1e-6):
+        self.geometry, self.roughness, self.channel_slope = section_parameters(section)
+        self.length = length
+        self.num_cells = num_cells
+        self.dx = length / num_cells
+        self.upstream = upstream if upstream is not None else TransmissiveBoundary()
+        self.downstream = downstream if downstream is not None else TransmissiveBoundary()
+        self.min_area = self.geometry.area(min_depth)
+        self.time = 0.0
+        self.steps = 0
+
+        # Preallocated state and interface fluxes
+        self.area = [0.0] * num_cells
+        self.discharge = [0.0] * num_cells
+        self._mass_flux = [0.0] * (num_cells + 1)
+        self._momentum_flux = [0.0] * (num_cells + 1)
+
+        # Depth, wave celerity and pressure term g I1 of each cell, computed
+        # once per step from the area and shared by the CFL condition, the
+        # fluxes and the friction update
+        self._depth = [0.0] * num_cells
+        self._celerity = [0.0] * num_cells
+        self._pressure = [0.0] * num_cells
+
+        for i in range(num_cells):
+            depth = initial_depth[i] if is_sequence(initial_depth) else initial_depth
+            q = initial_discharge[i] if is_sequence(initial_discharge) else initial_discharge
+            self.area[i] = max(self.geometry.area(depth), self.min_area)
+            self.discharge[i] = q
+        self._update_cells()
+
+    # ----------
+    # Getters
+    # ----------
+    def get_depths(self):
+        return list(self._depth)
+
+    def get_velocities(self):
+        return [q / a for q, a in zip(self.discharge, self.area)]
+
+    # ----------
+    # Methods
+    # ----------
+    def _update_cells(self):
+        """
+        Recomputes the depth, celerity and pressure term of every cell from
+        its area, after the state was set from outside step().
+        """
+        g = GRAVITY_G
+        geometry = self.geometry
+        for i, a in enumerate(self.area):
+            y = geometry.depth_from_area(a)
+            self._depth[i] = y
+            self._celerity[i] = math.sqrt(g * a / geometry._top_width(y))
+            self._pressure[i] = g * geometry._first_moment(y)
+
+    def stable_time_step(self, cfl: float = 0.9):
+        """
+        Largest time step allowed by the CFL condition for the current state.
+        """
+        max_speed = 0.0
+        for a, q, c in zip(self.area, self.discharge, self._celerity):
+            speed = abs(q / a) + c
+            if speed > max_speed:
+                max_speed = speed
+        if max_speed == 0:
+            return float('inf')
+        return cfl * self.dx / max_speed
+
+    def step(self, dt: float):
+        """
+        Advances the solution by one time step of dt seconds.
+        """
+        g = GRAVITY_G
+        geometry = self.geometry
+        area = self.area
+        discharge = self.discharge
+        mass_flux = self._mass_flux
+        momentum_flux = self._momentum_flux
+        depth = self._depth
+        celerity = self._celerity
+        pressure = self._pressure
+        num_cells = self.num_cells
+        min_area = self.min_area
+
+        left_ghost = self.upstream.ghost(self, self.time, area[0], discharge[0])
+        right_ghost = self.downstream.ghost(self, self.time, area[-1], discharge[-1])
+
+        # Left state of the first interface
+        a_l, q_l = left_ghost
+        y_l = geometry.depth_from_area(a_l)
+        u_l = q_l / a_l
+        c_l = math.sqrt(g * a_l / geometry._top_width(y_l))
+        f_l = q_l * u_l + g * geometry._first_moment(y_l)
+
+        # Right ghost state of the last interface
+        a_g, q_g = right_ghost
+        y_g = geometry.depth_from_area(a_g)
+        c_g = math.sqrt(g * a_g / geometry._top_width(y_g))
+        p_g = g * geometry._first_moment(y_g)
+
+        for i in range(num_cells + 1):
+            if i < num_cells:
+                a_r = area[i]
+                q_r = discharge[i]
+                c_r = celerity[i]
+                p_r = pressure[i]
+            else:
+                a_r, q_r, c_r, p_r = a_g, q_g, c_g, p_g
+            u_r = q_r / a_r
+            f_r = q_r * u_r + p_r
+
+            # HLL wave speed estimates
+            s_l = u_l - c_l
+            if u_r - c_r < s_l:
+                s_l = u_r - c_r
+            s_r = u_l + c_l
+            if u_r + c_r > s_r:
+                s_r = u_r + c_r
+
+            if s_l >= 0:
+                mass_flux[i] = q_l
+                momentum_flux[i] = f_l
+            elif s_r <= 0:
+                mass_flux[i] = q_r
+                momentum_flux[i] = f_r
+            else:
+                inv = 1.0 / (s_r - s_l)
+                mass_flux[i] = (s_r * q_l - s_l * q_r + s_l * s_r * (a_r - a_l)) * inv
+                momentum_flux[i] = (s_r * f_l - s_l * f_r + s_l * s_r * (q_r - q_l)) * inv
+
+            a_l, q_l, u_l, c_l, f_l = a_r, q_r, u_r, c_r, f_r
+
+        ratio = dt / self.dx
+        gs0 = g * self.channel_slope
+        gn2 = g * self.roughness ** 2
+        sqrt = math.sqrt
+        depth_from_area = geometry.depth_from_area
+        perimeter = geometry._perimeter
+        top_width = geometry._top_width
+        first_moment = geometry._first_moment
+
+        for i in range(num_cells):
+            a = area[i] - ratio * (mass_flux[i + 1] - mass_flux[i])
+            q = discharge[i] - ratio * (momentum_flux[i + 1] - momentum_flux[i]) + dt * gs0 * area[i]
+            if a < min_area:
+                a = min_area
+                q = 0.0
+            y = depth_from_area(a)
+            r = a / perimeter(y)
+            q = q / (1.0 + dt * gn2 * abs(q) / (a * r ** (4.0 / 3.0)))
+            area[i] = a
+            discharge[i] = q
+            depth[i] = y
+            celerity[i] = sqrt(g * a / top_width(y))
+            pressure[i] = g * first_moment(y)
+
+        self.time += dt
+        self.steps += 1
+
+    def run(self, duration: float, dt: float = None, cfl: float = 0.9,
+            checkpoint_path: str = None, checkpoint_interval: int = 0):
+        """
+        Advances the solution until the solver time reaches duration.
+
+        Args:
+            duration (float): simulation end time (s)
+            dt (float): fixed time step (s), computed from the CFL condition if None
+            cfl (float): Courant number used for the adaptive time step
+            checkpoint_path (str): file the state is saved to during the run
+            checkpoint_interval (int): number of steps between checkpoints
+
+        Returns:
+            SaintVenantSolver: the solver itself
+        """
+        while self.time < duration - 1e-12:
+            step_dt = dt if dt is not None else self.stable_time_step(cfl)
+            step_dt = min(step_dt, duration - self.time)
+            self.step(step_dt)
+            if checkpoint_path and checkpoint_interval and self.steps % checkpoint_interval == 0:
+                self.save_checkpoint(checkpoint_path)
+
+        if checkpoint_path:
+            self.save_checkpoint(checkpoint_path)
+
+        return self
+
+    def save_checkpoint(self, path: str):
+        """
+        Writes the solver state (time, step count, A and Q per cell) to a file.
+        """
+        state = {
+            'time': self.time,
+            'steps': self.steps,
+            'length': self.length,
+            'num_cells': self.num_cells,
+            'area': self.area,
+            'discharge': self.discharge
+        }
+        with open(path, 'w') as f:
+            json.dump(state, f)
+
+    def load_checkpoint(self, path: str):
+        """
+        Restores a state written by save_checkpoint. The solver must have been
+        created with the same section, length and number of cells.
+        """
+        with open(path) as f:
+            state = json.load(f)
+
+        if state['num_cells'] != self.num_cells or state['length'] != self.length:
+            raise ValueError('Checkpoint does not match the solver discretization.')
+
+        self.time = state['time']
+        self.steps = state['steps']
+        self.area[:] = state['area']
+        self.discharge[:] = state['discharge']
+        self._update_cells()
+
+        return self
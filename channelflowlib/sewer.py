@@ -0,0 +1,401 @@
+import math
+from bisect import bisect_left
+
+from .constants import GRAVITY_G
+from .geometry import CircularGeometry
+from .utils import interpolate, map_jobs
+
+# Full-flow discharge of a pipe is FULL_FLOW_FACTOR * D^(8/3) * S^0.5 / n
+FULL_FLOW_FACTOR = math.pi / 4.0 / math.pow(4.0, 2.0 / 3.0)
+
+
+def full_flow_discharge(diameter: float, slope: float, roughness: float):
+    """
+    Manning discharge of a circular pipe flowing just full.
+    """
+    return FULL_FLOW_FACTOR * math.pow(diameter, 8.0 / 3.0) * math.sqrt(slope) / roughness
+
+
+class PartialFlowTable:
+    """
+    Dimensionless partial-flow relations of a circular pipe with constant n.
+
+    For depth ratios y/D between 0 and 1 it stores the area ratio A/Af, the
+    top width ratio T/D, the discharge ratio Q/Qf and the critical flow factor
+    Q / sqrt(g D^5) = (A^3 / T)^0.5 / D^2.5. The discharge ratio peaks
+    near y/D = 0.938; only the rising branch up to that peak is used when a
+    depth is recovered from a discharge.
+
+    Args:
+        num_points (int): number of depth ratios in the table
+    """
+
+    def __init__(self, num_points: int = 500):
+        geometry = CircularGeometry(1.0)
+        full_area = geometry.area(1.0)
+        full_radius = 0.25
+
+        self.depth_ratios = []
+        self.area_ratios = []
+        self.width_ratios = []
+        self.discharge_ratios = []
+        self.critical_factors = []
+
+        for i in range(num_points + 1):
+            ratio = i / num_points
+            area = geometry.area(ratio)
+            perimeter = geometry.perimeter(ratio)
+            radius = area / perimeter if perimeter > 0 else 0.0
+            width = geometry.top_width(ratio)
+            self.depth_ratios.append(ratio)
+            self.area_ratios.append(area / full_area)
+            self.width_ratios.append(width)
+            self.discharge_ratios.append(area / full_area * math.pow(radius / full_radius, 2.0 / 3.0))
+            if width > 0:
+                self.critical_factors.append(math.sqrt(area ** 3 / width))
+            else:
+                self.critical_factors.append(float('inf') if area > 0 else 0.0)
+
+        self.peak_index = self.discharge_ratios.index(max(self.discharge_ratios))
+
+    def discharge_ratio(self, depth_ratio: float):
+        """
+        Q/Qf at a depth ratio y/D.
+        """
+        return interpolate(depth_ratio, self.depth_ratios, self.discharge_ratios)
+
+    def depth_ratio(self, discharge_ratio: float):
+        """
+        y/D on the rising branch for a discharge ratio Q/Qf, None if the ratio
+        exceeds the peak capacity of the pipe.
+        """
+        peak = self.peak_index
+        if discharge_ratio > self.discharge_ratios[peak]:
+            return None
+        i = bisect_left(self.discharge_ratios, discharge_ratio, 0, peak)
+        if i == 0:
+            return 0.0
+        q1 = self.discharge_ratios[i - 1]
+        q2 = self.discharge_ratios[i]
+        y1 = self.depth_ratios[i - 1]
+        y2 = self.depth_ratios[i]
+        return y1 + (y2 - y1) * (discharge_ratio - q1) / (q2 - q1)
+
+    def critical_depth_ratio(self, factor: float):
+        """
+        Critical y/D for a critical flow factor Q / sqrt(g D^5), capped at the
+        last tabulated ratio below the crown.
+        """
+        factors = self.critical_factors
+        if factor >= factors[-2]:
+            return self.depth_ratios[-2]
+        return interpolate(factor, factors, self.depth_ratios)
+
+    def area_ratio(self, depth_ratio: float):
+        return interpolate(depth_ratio, self.depth_ratios, self.area_ratios)
+
+    def width_ratio(self, depth_ratio: float):
+        return interpolate(depth_ratio, self.depth_ratios, self.width_ratios)
+
+
+def size_pipes(pipes, diameters, max_depth_ratio: float = 0.8,
+               roughness: float = 0.015, table: PartialFlowTable = None):
+    """
+    Picks the smallest catalogue diameter for every pipe of a network.
+
+    The required diameter follows in closed form from the full-flow Manning
+    equation and the discharge ratio at the allowed depth ratio, so each pipe
+    costs one binary search in the catalogue instead of a trial solve per
+    candidate diameter.
+
+    Args:
+        pipes (list): dicts with 'id', 'discharge' (cms), 'slope' and
+            optionally 'roughness'
+        diameters (list): available commercial diameters (m)
+        max_depth_ratio (float): allowed y/D at the design discharge
+        roughness (float): Manning's n for pipes without their own roughness
+        table (PartialFlowTable): partial-flow relations, built if None
+
+    Returns:
+        list: one dict per pipe with the chosen diameter, full-flow capacity,
+        depth ratio, velocity, Froude number and a surcharge flag
+    """
+    if table is None:
+        table = PartialFlowTable()
+
+    catalogue = sorted(diameters)
+    capacity_ratio = table.discharge_ratio(max_depth_ratio)
+
+    results = []
+    for pipe in pipes:
+        q = pipe['discharge']
+        s = pipe['slope']
+        n = pipe.get('roughness', roughness)
+
+        required = math.pow(q * n / (capacity_ratio * FULL_FLOW_FACTOR * math.sqrt(s)), 3.0 / 8.0)
+        index = bisect_left(catalogue, required)
+        diameter = catalogue[min(index, len(catalogue) - 1)]
+
+        q_full = full_flow_discharge(diameter, s, n)
+        depth_ratio = table.depth_ratio(q / q_full)
+        surcharged = depth_ratio is None
+
+        if surcharged:
+            depth_ratio = 1.0
+            area = math.pi * diameter ** 2 / 4.0
+            velocity = q / area
+            froude_number = 0.0
+        else:
+            area = table.area_ratio(depth_ratio) * math.pi * diameter ** 2 / 4.0
+            velocity = q / area if area > 0 else 0.0
+            top_width = table.width_ratio(depth_ratio) * diameter
+            froude_number = velocity / math.sqrt(GRAVITY_G * area / top_width) if area > 0 else 0.0
+
+        results.append({
+            'id': pipe.get('id'),
+            'diameter': diameter,
+            'required_diameter': required,
+            'full_flow_discharge': q_full,
+            'depth_ratio': depth_ratio,
+            'velocity': velocity,
+            'froude_number': froude_number,
+            'surcharged': surcharged,
+            'undersized': index >= len(catalogue)
+        })
+
+    return results
+
+
+# Number of depth steps of a direct step profile along one pipe
+PROFILE_STEPS = 20
+
+
+def _direct_step(y0, target, length, slope, q, diameter, q_unit, table):
+    """
+    Direct step profile from depth y0 at the outlet of a pipe towards its
+    limiting depth, upstream, with E_up - E_down = (Sf - S0) dx. The depths
+    approach the target geometrically, down to 0.1 % of the initial gap.
+
+    Returns:
+        tuple: depth at the upstream end, or at the distance where the target
+        is reached, and that distance
+    """
+    full_area = math.pi * diameter ** 2 / 4.0
+    ratio = math.pow(1e-3, 1.0 / PROFILE_STEPS)
+
+    def state(y):
+        r = y / diameter
+        v = q / (table.area_ratio(r) * full_area)
+        return y + v * v / (2 * GRAVITY_G), (q / (table.discharge_ratio(r) * q_unit)) ** 2
+
+    y1 = y0
+    e1, sf1 = state(y0)
+    x = 0.0
+    for i in range(1, PROFILE_STEPS + 1):
+        y2 = target + (y0 - target) * ratio ** i
+        e2, sf2 = state(y2)
+        dx = (e2 - e1) / (0.5 * (sf1 + sf2) - slope)
+        if dx < 0:
+            break
+        if x + dx >= length:
+            return y1 + (y2 - y1) * (length - x) / dx, length
+        x += dx
+        y1, e1, sf1 = y2, e2, sf2
+    return target, x
+
+
+def pipe_hgl(pipe, downstream_level: float, roughness: float = 0.015, table: PartialFlowTable = None):
+    """
+    Hydraulic grade line along one pipe, from the water level at its outlet.
+
+    A free outlet is held at critical depth. Where the outlet is surcharged
+    the pressure HGL rises upstream at the full-flow friction slope until it
+    meets the crown; the free surface then follows a direct step profile
+    towards normal depth (mild pipes), critical depth (steep pipes, inlet
+    control) or the crown (flat pipes or flow above the peak capacity),
+    beyond which the pipe flows full again.
+
+    Args:
+        pipe (dict): 'discharge' (cms), 'diameter' and 'length' (m),
+            'upstream_invert' and 'downstream_invert' elevations and
+            optionally 'roughness'
+        downstream_level (float): water level at the outlet, None for a free
+            outfall
+        roughness (float): Manning's n for pipes without their own roughness
+        table (PartialFlowTable): partial-flow relations, built if None
+
+    Returns:
+        dict: 'upstream_hgl', 'downstream_hgl', 'upstream_depth',
+        'downstream_depth', 'normal_depth' (None above the capacity),
+        'critical_depth', 'full_length' (m under pressure) and 'velocity'
+        at the upstream end
+    """
+    if table is None:
+        table = PartialFlowTable()
+
+    q = pipe['discharge']
+    d = pipe['diameter']
+    length = pipe['length']
+    n = pipe.get('roughness', roughness)
+    z_up = pipe['upstream_invert']
+    z_down = pipe['downstream_invert']
+    slope = (z_up - z_down) / length
+    full_area = math.pi * d ** 2 / 4.0
+
+    if q <= 0:
+        level = z_down if downstream_level is None else max(downstream_level, z_down)
+        depth = min(max(level - z_up, 0.0), d)
+        return {'upstream_hgl': max(level, z_up), 'downstream_hgl': level, 'upstream_depth': depth,
+                'downstream_depth': level - z_down, 'normal_depth': 0.0, 'critical_depth': 0.0,
+                'full_length': length if level >= z_up + d else 0.0, 'velocity': 0.0}
+
+    q_unit = FULL_FLOW_FACTOR * math.pow(d, 8.0 / 3.0) / n
+    friction_full = (q / q_unit) ** 2
+    yc = table.critical_depth_ratio(q / math.sqrt(GRAVITY_G * d ** 5)) * d
+    yn = None
+    if slope > 0:
+        ratio = table.depth_ratio(q / (q_unit * math.sqrt(slope)))
+        yn = None if ratio is None else ratio * d
+
+    depth = yc if downstream_level is None else max(downstream_level - z_down, yc)
+    downstream_depth = depth
+    x = 0.0
+    full_length = 0.0
+
+    # Pressure flow from a surcharged outlet until the HGL meets the crown
+    if depth >= d:
+        if friction_full >= slope:
+            x = length
+        else:
+            x = min(length, (depth - d) / (slope - friction_full))
+        full_length = x
+        level = z_down + depth + friction_full * x
+        depth = level - (z_down + slope * x)
+
+    if x < length:
+        if yn is None:
+            target = d
+        elif yn < yc:
+            target = yc
+        else:
+            target = yn
+        depth, covered = _direct_step(depth, target, length - x, slope, q, d, q_unit, table)
+        x += covered
+        if x < length and target == d:
+            # Full above the crown point
+            depth = d + friction_full * (length - x) - slope * (length - x)
+            full_length += length - x
+
+    area = full_area if depth >= d else table.area_ratio(depth / d) * full_area
+    return {
+        'upstream_hgl': z_up + depth,
+        'downstream_hgl': z_down + downstream_depth,
+        'upstream_depth': depth,
+        'downstream_depth': downstream_depth,
+        'normal_depth': yn,
+        'critical_depth': yc,
+        'full_length': full_length,
+        'velocity': q / area
+    }
+
+
+def _hgl_job(args):
+    pipes, outfall_level, roughness, table = args
+    results = {}
+    manholes = {}
+    for pipe in pipes:
+        downstream = pipe.get('downstream')
+        level = outfall_level if downstream is None else manholes[downstream]
+        result = pipe_hgl(pipe, level, roughness, table)
+        v = result['velocity']
+        result['manhole_hgl'] = result['upstream_hgl'] + pipe.get('junction_loss', 0.0) * v * v / (2 * GRAVITY_G)
+        rim = pipe.get('rim_elevation')
+        result['flooded'] = rim is not None and result['manhole_hgl'] > rim
+        result['surcharged'] = result['full_length'] > 0
+        manholes[pipe['id']] = result['manhole_hgl']
+        results[pipe['id']] = result
+    return results
+
+
+class SewerNetwork:
+    """
+    Tree of circular pipes joined at manholes, for steady HGL analysis.
+
+    Args:
+        pipes (list): dicts as for pipe_hgl, with an 'id', the id of the
+            'downstream' pipe (None at an outfall) and optionally the
+            'junction_loss' coefficient K and the 'rim_elevation' of the
+            manhole at the upstream end of the pipe
+    """
+
+    def __init__(self, pipes):
+        self.pipes = {pipe['id']: pipe for pipe in pipes}
+        for pipe in pipes:
+            downstream = pipe.get('downstream')
+            if downstream is not None and downstream not in self.pipes:
+                raise ValueError('Unknown downstream pipe: ' + str(downstream))
+
+    def outfall_order(self):
+        """
+        Splits the network into independent trees, one per outfall, each as
+        a list of pipe ids ordered from the outfall upstream.
+        """
+        upstream = {pipe_id: [] for pipe_id in self.pipes}
+        outfalls = []
+        for pipe_id, pipe in self.pipes.items():
+            downstream = pipe.get('downstream')
+            if downstream is None:
+                outfalls.append(pipe_id)
+            else:
+                upstream[downstream].append(pipe_id)
+
+        trees = []
+        visited = 0
+        for outfall in outfalls:
+            order = [outfall]
+            i = 0
+            while i < len(order):
+                order.extend(upstream[order[i]])
+                i += 1
+            visited += len(order)
+            trees.append(order)
+
+        if visited != len(self.pipes):
+            raise ValueError('The pipe network contains a loop.')
+
+        return trees
+
+    def hgl(self, outfall_levels=None, roughness: float = 0.015,
+            table: PartialFlowTable = None, workers: int = 1):
+        """
+        Steady HGL of the whole network, from each outfall upstream. The water
+        level in a manhole is the HGL at the upstream end of its outgoing pipe
+        plus the junction loss K V^2 / 2g, and sets the outlet level of the
+        pipes draining into it.
+
+        Args:
+            outfall_levels (dict): outfall pipe id to the receiving water
+                level, free outfall for pipes not listed
+            roughness (float): Manning's n for pipes without their own roughness
+            table (PartialFlowTable): partial-flow relations, built if None
+            workers (int): number of processes analyzing outfall trees in
+                parallel
+
+        Returns:
+            dict: pipe id to its pipe_hgl result, with the 'manhole_hgl' at its
+            upstream end and 'surcharged' and 'flooded' flags
+        """
+        if table is None:
+            table = PartialFlowTable()
+        outfall_levels = outfall_levels or {}
+
+        jobs = []
+        for tree in self.outfall_order():
+            pipes = [self.pipes[pipe_id] for pipe_id in tree]
+            jobs.append((pipes, outfall_levels.get(tree[0]), roughness, table))
+
+        results = {}
+        for result in map_jobs(_hgl_job, jobs, workers):
+            results.update(result)
+
+        return results
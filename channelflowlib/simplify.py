@@ -0,0 +1,138 @@
+import math
+
+from .openchannellib import _ElevationIndex
+
+
+def douglas_peucker(points, tolerance: float):
+    """
+    Douglas-Peucker simplification of a polyline.
+
+    Args:
+        points (sequence): (x, y) vertices
+        tolerance (float): largest allowed perpendicular distance (m) of a
+            dropped vertex from the simplified polyline
+
+    Returns:
+        list: the kept vertices, always including both end points
+    """
+    n = len(points)
+    if n < 3:
+        return list(points)
+
+    keep = [False] * n
+    keep[0] = True
+    keep[n - 1] = True
+    stack = [(0, n - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = points[first]
+        x2, y2 = points[last]
+        dx = x2 - x1
+        dy = y2 - y1
+        length = math.sqrt(dx * dx + dy * dy)
+
+        farthest = -1
+        max_distance = tolerance
+        for i in range(first + 1, last):
+            x, y = points[i]
+            if length > 0:
+                distance = abs(dy * (x - x1) - dx * (y - y1)) / length
+            else:
+                distance = math.sqrt((x - x1) ** 2 + (y - y1) ** 2)
+            if distance > max_distance:
+                farthest = i
+                max_distance = distance
+
+        if farthest >= 0:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def section_deviation(original, simplified):
+    """
+    Largest differences in wetted area and wetted perimeter between two
+    versions of a cross section over all stages up to the lower bank.
+
+    Top width is piecewise linear in the stage between vertex elevations, so
+    the perimeter difference is extreme at a vertex elevation and the area
+    difference either there or where the top width difference changes sign.
+    Checking those stages gives the exact maxima.
+
+    Args:
+        original (sequence): (x, y) vertices of the surveyed section
+        simplified (sequence): (x, y) vertices of the simplified section
+
+    Returns:
+        tuple: max area difference (sq.m.), max perimeter difference (m)
+    """
+    index_a = _ElevationIndex(original)
+    index_b = _ElevationIndex(simplified)
+    top = min(original[0][1], original[-1][1])
+    stages = sorted(set(point[1] for point in original) | set(point[1] for point in simplified))
+    stages = [z for z in stages if z < top] + [top]
+
+    max_area = 0.0
+    max_perimeter = 0.0
+    previous = None
+    for z in stages:
+        area_a, perimeter_a, width_a = index_a.wetted_properties(z)
+        area_b, perimeter_b, width_b = index_b.wetted_properties(z)
+        area = area_a - area_b
+        width = width_a - width_b
+        max_area = max(max_area, abs(area))
+        max_perimeter = max(max_perimeter, abs(perimeter_a - perimeter_b))
+
+        if previous is not None:
+            z0, area0, width0 = previous
+            if width0 * width < 0:
+                # Extremum of the area difference inside the interval
+                depth = (z - z0) * width0 / (width0 - width)
+                max_area = max(max_area, abs(area0 + width0 * depth / 2.0))
+        previous = (z, area, width)
+
+    return max_area, max_perimeter
+
+
+def simplify_section(points, tolerance: float, max_area_error: float = None,
+                     max_perimeter_error: float = None):
+    """
+    Simplifies a dense surveyed cross section with known accuracy loss.
+
+    The section is simplified with Douglas-Peucker at the given tolerance.
+    When area or perimeter limits are given, the tolerance is halved until the
+    simplified section stays within both limits at every stage.
+
+    Args:
+        points (sequence): (x, y) vertices of the surveyed section
+        tolerance (float): Douglas-Peucker distance tolerance (m)
+        max_area_error (float): allowed wetted area difference (sq.m.)
+        max_perimeter_error (float): allowed wetted perimeter difference (m)
+
+    Returns:
+        tuple: simplified points (tuple of tuples) and a report dict
+    """
+    points = tuple(tuple(point) for point in points)
+
+    while True:
+        simplified = tuple(douglas_peucker(points, tolerance))
+        area_error, perimeter_error = section_deviation(points, simplified)
+        area_ok = max_area_error is None or area_error <= max_area_error
+        perimeter_ok = max_perimeter_error is None or perimeter_error <= max_perimeter_error
+        if (area_ok and perimeter_ok) or len(simplified) == len(points):
+            break
+        tolerance /= 2.0
+
+    report = {
+        'tolerance': tolerance,
+        'original_points': len(points),
+        'simplified_points': len(simplified),
+        'reduction': len(points) / len(simplified),
+        'max_area_error': area_error,
+        'max_perimeter_error': perimeter_error
+    }
+
+    return simplified, report
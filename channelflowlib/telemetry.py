@@ -0,0 +1,224 @@
+import csv
+import math
+import time
+from array import array
+from collections import deque
+
+from .constants import GRAVITY_G
+from .exceptions import STATUS_ABOVE_SECTION, STATUS_BELOW_SECTION, STATUS_OK, STATUS_UNKNOWN_GAUGE
+from .geometry import section_parameters
+
+
+class GaugeRating:
+    """
+    Cached rating of a gauged section: flow area, top width and discharge
+    tabulated on a uniform stage grid, so that converting a reading is an
+    index computation and a linear interpolation.
+
+    Stages are water surface elevations for irregular sections and depths for
+    the prismatic shapes. The section must have a full depth (an irregular
+    section or a pipe).
+
+    Args:
+        section: section class instance with roughness and slope set
+        step (float): stage interval of the table (m)
+    """
+
+    def __init__(self, section, step: float = 0.005):
+        geometry, roughness, slope = section_parameters(section)
+        if geometry.max_depth is None:
+            raise ValueError('The rating of an open prismatic section needs a full depth.')
+
+        self.datum = getattr(geometry, 'lowest', 0.0)
+        self.max_depth = geometry.max_depth
+        num_steps = max(1, int(math.ceil(self.max_depth / step)))
+        self.step = self.max_depth / num_steps
+
+        depths = [i * self.step for i in range(num_steps + 1)]
+        factor = math.sqrt(slope) / roughness
+        self.areas = array('d', geometry.area(depths))
+        self.top_widths = array('d', geometry.top_width(depths))
+        self.discharges = array('d', [k * factor for k in geometry.conveyance(depths)])
+
+    def convert(self, stage: float):
+        """
+        Discharge, velocity and Froude number at a stage.
+
+        Returns:
+            tuple: discharge (cms), velocity (m/s), Froude number and status
+            code, zero flow with STATUS_BELOW_SECTION when the section is dry
+            and NaN values with STATUS_ABOVE_SECTION above the section
+        """
+        y = stage - self.datum
+        if y <= 0:
+            return 0.0, 0.0, 0.0, STATUS_BELOW_SECTION
+
+        x = y / self.step
+        i = int(x)
+        last = len(self.areas) - 1
+        if i >= last:
+            if y > self.max_depth * (1 + 1e-12):
+                nan = float('nan')
+                return nan, nan, nan, STATUS_ABOVE_SECTION
+            i = last - 1
+        f = x - i
+
+        areas = self.areas
+        top_widths = self.top_widths
+        discharges = self.discharges
+        a = areas[i] + (areas[i + 1] - areas[i]) * f
+        t = top_widths[i] + (top_widths[i + 1] - top_widths[i]) * f
+        q = discharges[i] + (discharges[i + 1] - discharges[i]) * f
+        v = q / a
+        return q, v, v / math.sqrt(GRAVITY_G * a / t), STATUS_OK
+
+
+class RollingStatistics:
+    """
+    Count, mean, minimum and maximum of the last values of a series, kept in
+    memory bounded by the window size.
+
+    Args:
+        window (int): number of most recent values covered
+    """
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.count = 0
+        # Monotonic queues of (sequence number, value) for the window extremes
+        self._minima = deque()
+        self._maxima = deque()
+
+    def add(self, value: float):
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+        count = self.count
+        self.count += 1
+        oldest = self.count - self.window
+        for queue, better in ((self._minima, value.__le__), (self._maxima, value.__ge__)):
+            while queue and better(queue[-1][1]):
+                queue.pop()
+            queue.append((count, value))
+            if queue[0][0] < oldest:
+                queue.popleft()
+
+    def mean(self):
+        return self.total / len(self.values) if self.values else float('nan')
+
+    def minimum(self):
+        return self._minima[0][1] if self._minima else float('nan')
+
+    def maximum(self):
+        return self._maxima[0][1] if self._maxima else float('nan')
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'window_mean': self.mean(),
+            'window_min': self.minimum(),
+            'window_max': self.maximum(),
+            'latest': self.values[-1] if self.values else float('nan')
+        }
+
+
+class TelemetryPipeline:
+    """
+    Converts a stream of gauge readings to discharge records.
+
+    Args:
+        ratings (dict): gauge id to ``GaugeRating`` or to a section class
+            instance, whose rating is built and cached on first use
+        window (int): number of readings covered by the rolling discharge
+            statistics of each gauge
+    """
+
+    def __init__(self, ratings, window: int = 60):
+        self.ratings = dict(ratings)
+        self.window = window
+        self.statistics = {}
+
+    def get_rating(self, gauge_id):
+        rating = self.ratings.get(gauge_id)
+        if rating is not None and not isinstance(rating, GaugeRating):
+            rating = GaugeRating(rating)
+            self.ratings[gauge_id] = rating
+        return rating
+
+    def process(self, readings):
+        """
+        Generator yielding one record per (gauge_id, timestamp, stage) reading
+        as soon as it is converted.
+
+        Yields:
+            dict: gauge_id, timestamp, stage, discharge, velocity,
+            froude_number and status code (STATUS_UNKNOWN_GAUGE for gauges
+            without a rating)
+        """
+        ratings = self.ratings
+        statistics = self.statistics
+        nan = float('nan')
+
+        for gauge_id, timestamp, stage in readings:
+            rating = ratings.get(gauge_id)
+            if rating is None or not isinstance(rating, GaugeRating):
+                rating = self.get_rating(gauge_id)
+
+            if rating is None:
+                q = v = fr = nan
+                status = STATUS_UNKNOWN_GAUGE
+            else:
+                q, v, fr, status = rating.convert(stage)
+                if status != STATUS_ABOVE_SECTION:
+                    stats = statistics.get(gauge_id)
+                    if stats is None:
+                        stats = statistics[gauge_id] = RollingStatistics(self.window)
+                    stats.add(q)
+
+            yield {
+                'gauge_id': gauge_id,
+                'timestamp': timestamp,
+                'stage': stage,
+                'discharge': q,
+                'velocity': v,
+                'froude_number': fr,
+                'status': status
+            }
+
+    def summary(self, gauge_id):
+        """
+        Rolling discharge statistics of a gauge.
+        """
+        return self.statistics[gauge_id].summary()
+
+
+def replay_file(path: str, speed: float = None):
+    """
+    Reads recorded readings from a CSV file with gauge_id, timestamp and stage
+    columns, timestamps in seconds.
+
+    Args:
+        path (str): recording to replay
+        speed (float): replay speed relative to real time, as fast as
+            possible if None
+
+    Yields:
+        tuple: gauge_id, timestamp, stage
+    """
+    start = None
+    first = None
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            timestamp = float(row['timestamp'])
+            if speed:
+                if start is None:
+                    start = time.monotonic()
+                    first = timestamp
+                delay = (timestamp - first) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            yield row['gauge_id'], timestamp, float(row['stage'])
@@ -0,0 +1,54 @@
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+
+def is_sequence(value):
+    return hasattr(value, '__len__')
+
+
+def interpolate(x, xs, ys, extrapolate: bool = False):
+    """
+    Linear interpolation in a table sorted by xs. Outside the table the end
+    values are held, or the end intervals extended when extrapolate is True.
+    """
+    last = len(xs) - 1
+    if extrapolate:
+        i = min(max(bisect_right(xs, x), 1), last)
+    else:
+        if x <= xs[0]:
+            return ys[0]
+        if x >= xs[last]:
+            return ys[last]
+        i = bisect_right(xs, x)
+    x1 = xs[i - 1]
+    y1 = ys[i - 1]
+    return y1 + (ys[i] - y1) * (x - x1) / (xs[i] - x1)
+
+
+def job_pool(workers: int = 1):
+    """
+    Process pool to share between several map_jobs calls, or a context
+    giving None when workers <= 1.
+    """
+    if workers > 1:
+        return ProcessPoolExecutor(max_workers=workers)
+    return nullcontext()
+
+
+def map_jobs(function, jobs, workers: int = 1, executor=None):
+    """
+    Applies a picklable function to every job, in parallel processes when
+    workers > 1 and there is more than one job. An executor from job_pool
+    is used instead of starting a new pool.
+
+    Returns:
+        list: results in job order
+    """
+    if workers > 1 and len(jobs) > 1:
+        chunksize = max(1, len(jobs) // (4 * workers))
+        if executor is not None:
+            return list(executor.map(function, jobs, chunksize=chunksize))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, jobs, chunksize=chunksize))
+    return [function(job) for job in jobs]
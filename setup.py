@@ -15,12 +15,22 @@ setup(
         'Natural Language :: English',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2.7',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
+    python_requires='>=3.8',
     keywords='hydraulics open-channel fluid-flow',
     packages=find_packages(exclude=['tests*']),
+    extras_require={
+        'jit': ['numba'],
+    },
+    entry_points={
+        'console_scripts': [
+            'channelflow=channelflowlib.cli:main',
+        ],
+    },
     data_files=None
 )
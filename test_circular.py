@@ -7,7 +7,7 @@ circ = Circular()
 circ.slope = 0.001
 circ.set_diameter(1.0)
 circ.set_roughness(0.015)
-circ.set_water_depth(1)
+circ.set_water_depth(0.8)
 
 # Analyze
 circ.calculate_discharge()
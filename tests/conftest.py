@@ -0,0 +1,33 @@
+import pytest
+
+from channelflowlib.openchannellib import IrregularSection
+
+# River cross section of the README example, (x, y) in meters
+SURVEY_POINTS = (
+    (0, 1.13),
+    (1.287, 1.2),
+    (2.58, 0.09),
+    (5.223, -1.57),
+    (10.446, -1.81),
+    (12.333, 0.72),
+    (14.188, 1.2)
+)
+
+
+@pytest.fixture
+def survey_points():
+    return SURVEY_POINTS
+
+
+@pytest.fixture
+def make_section():
+    """
+    Factory of IrregularSection instances with the roughness and bed slope
+    set, over the survey points unless other points are given.
+    """
+    def make(roughness=0.03, slope=0.002, points=SURVEY_POINTS):
+        section = IrregularSection(points)
+        section.set_average_rougness(roughness)
+        section.set_bed_slope(slope)
+        return section
+    return make
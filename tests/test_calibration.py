@@ -0,0 +1,55 @@
+import random
+
+from channelflowlib.calibration import calibrate_site, calibrate_sites
+from channelflowlib.normal_flow import normal_discharge
+from channelflowlib.openchannellib import Trapezoidal
+
+
+def observations(make_section, n_low, n_high, split=0.0):
+    rng = random.Random(1)
+    stages = [rng.uniform(-1.7, 1.1) for _ in range(200)]
+    reference = make_section(1.0, 0.001)
+    discharges = [normal_discharge(reference, stage + 1.81) / (n_low if stage <= split else n_high)
+                  for stage in stages]
+    return stages, discharges
+
+
+def test_recovers_roughness(make_section):
+    stages, discharges = observations(make_section, 0.035, 0.035)
+    stages.append(3.0)
+    discharges.append(100.0)
+    result = calibrate_site(make_section(0.0, 0.001), stages, discharges)
+    assert abs(result['roughness'] - 0.035) < 1e-9
+    assert result['rejected'] == 1
+    assert result['rmse'] < 1e-9
+
+
+def test_stage_bands(make_section):
+    stages, discharges = observations(make_section, 0.045, 0.030)
+    result = calibrate_site(make_section(0.0, 0.001), stages, discharges, bands=[0.0])
+    low, high = result['bands']
+    assert abs(low['roughness'] - 0.045) < 1e-9
+    assert abs(high['roughness'] - 0.030) < 1e-9
+    assert low['count'] + high['count'] == result['count']
+    assert result['rmse'] < 1e-9
+
+
+def test_fit_slope_on_prismatic_section():
+    trap = Trapezoidal(unknown='discharge', unit='metric')
+    trap.set_channel_base(2.0)
+    trap.set_sideslope(1.0)
+    trap.set_roughness(0.015)
+    trap.set_channel_slope(0.0)
+    depths = [0.2 * i for i in range(1, 10)]
+    discharges = [normal_discharge(trap, y, 0.015, 0.0025) for y in depths]
+    result = calibrate_site(trap, depths, discharges, fit_slope=True)
+    assert abs(result['slope'] - 0.0025) < 1e-12
+
+
+def test_many_sites_in_parallel(make_section):
+    stages, discharges = observations(make_section, 0.04, 0.04)
+    sites = {i: (make_section(0.0, 0.001), stages, discharges) for i in range(6)}
+    sites['empty'] = (make_section(0.0, 0.001), [5.0], [1.0])
+    results = calibrate_sites(sites, workers=2)
+    assert all(abs(results[i]['roughness'] - 0.04) < 1e-9 for i in range(6))
+    assert 'error' in results['empty']
@@ -0,0 +1,50 @@
+import math
+
+from channelflowlib.canal_design import _base_widths, design_canal, design_canals, pareto_front
+from channelflowlib.normal_flow import normal_depth, normal_discharge
+from channelflowlib.constants import GRAVITY_G
+from channelflowlib.geometry import TrapezoidalGeometry
+
+
+def test_designs_meet_constraints():
+    result = design_canal(5.0, 0.015, 0.0005, min_velocity=1.2, max_froude=0.5, freeboard_ratio=0.25)
+    assert result['evaluated'] < 3 * 60
+
+    # Same feasible designs as an exhaustive search
+    count = 0
+    for m in (1.0, 1.5, 2.0):
+        for b in _base_widths(5.0, 0.015, 0.0005):
+            y = normal_depth(TrapezoidalGeometry(b, m), 5.0, 0.015, 0.0005)
+            area = (b + m * y) * y
+            velocity = 5.0 / area
+            froude = velocity / math.sqrt(GRAVITY_G * area / (b + 2 * m * y))
+            if 1.2 <= velocity <= 2.5 and froude <= 0.5:
+                count += 1
+    assert result['feasible'] == count > 0
+
+    for design in result['pareto']:
+        assert 1.2 <= design['velocity'] <= 2.5
+        assert design['froude_number'] <= 0.5
+        assert design['total_depth'] >= 1.25 * design['water_depth'] - 1e-12
+        q = normal_discharge(TrapezoidalGeometry(design['base'], design['side_slope']),
+                             design['water_depth'], 0.015, 0.0005)
+        assert abs(q - 5.0) < 1e-8
+
+    # The cheapest design for any positive unit costs is on the front
+    costs = design_canal(5.0, 0.015, 0.0005, excavation_cost=12.0, lining_cost=30.0)
+    assert costs['best'] in costs['pareto']
+
+
+def test_pareto_front():
+    designs = [{'excavation': e, 'lining': l} for e, l in [(1, 5), (2, 4), (2, 6), (3, 4), (4, 1)]]
+    assert [(d['excavation'], d['lining']) for d in pareto_front(designs)] == [(1, 5), (2, 4), (4, 1)]
+
+
+def test_infeasible_segment_and_batch():
+    segments = [{'id': i, 'discharge': 1.0 + i, 'roughness': 0.015, 'slope': 0.001} for i in range(5)]
+    segments.append({'id': 'steep', 'discharge': 1.0, 'roughness': 0.015, 'slope': 0.05,
+                     'options': {'max_velocity': 1.0}})
+    results = design_canals(segments, workers=2, side_slopes=(1.5,))
+    assert [r['id'] for r in results] == [0, 1, 2, 3, 4, 'steep']
+    assert results[-1]['best'] is None
+    assert all(r['best']['side_slope'] == 1.5 for r in results[:5])
@@ -0,0 +1,67 @@
+import io
+import json
+
+from channelflowlib.cli import read_csv, read_jsonl, run, solve_job
+from channelflowlib.exceptions import STATUS_ABOVE_SECTION, STATUS_INVALID_INPUT
+
+jobs = [
+    {'id': 1, 'shape': 'rectangular', 'unknown': 'discharge',
+     'inputs': {'channel_slope': 0.001, 'channel_base': 1.0, 'roughness': 0.015, 'water_depth': 0.989}},
+    {'id': 2, 'shape': 'irregular',
+     'points': [[0, 1.13], [1.287, 1.2], [2.58, 0.09], [5.223, -1.57],
+                [10.446, -1.81], [12.333, 0.72], [14.188, 1.2]],
+     'inputs': {'roughness': 0.03, 'bed_slope': 0.002, 'water_elevation': 1.0}},
+    {'id': 3, 'shape': 'hexagonal', 'inputs': {}},
+]
+
+
+def test_solve_job():
+    result = solve_job(jobs[0])
+    assert round(result['discharge'], 2) == 1.0
+    assert 'critical_flow' in result
+    assert round(solve_job(jobs[1])['wetted_area'], 2) == 22.2
+    assert 'error' in solve_job(jobs[2])
+    assert solve_job(jobs[0])['status'] == 0
+
+    overflow = dict(jobs[1], inputs=dict(jobs[1]['inputs'], water_elevation=2.0))
+    assert solve_job(overflow)['status'] == STATUS_ABOVE_SECTION
+
+
+def test_run_streams_jsonl():
+    source = io.StringIO(''.join(json.dumps(job) + '\n' for job in jobs))
+    output = io.StringIO()
+    run(read_jsonl(source), output, batch_size=2)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result['id'] for result in results] == [1, 2, 3]
+
+
+def test_run_csv_in_parallel():
+    source = io.StringIO(
+        'id,shape,unknown,channel_slope,channel_base,roughness,water_depth\n'
+        '1,rectangular,discharge,0.001,1.0,0.015,0.989\n'
+        '2,rectangular,discharge,0.001,2.0,0.015,0.5\n'
+    )
+    output = io.StringIO()
+    run(read_csv(source), output, workers=2)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result['id'] for result in results] == ['1', '2']
+    assert round(results[0]['discharge'], 2) == 1.0
+
+
+def test_malformed_records_are_reported():
+    source = io.StringIO(json.dumps(jobs[0]) + '\n{bad json\n[1, 2]\n' + json.dumps(jobs[1]) + '\n')
+    output = io.StringIO()
+    run(read_jsonl(source), output)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result['status'] for result in results] == [0, STATUS_INVALID_INPUT, STATUS_INVALID_INPUT, 0]
+    assert [result.get('line') for result in results] == [None, 2, 3, None]
+
+    source = io.StringIO(
+        'id,shape,unknown,channel_slope,channel_base,roughness,water_depth\n'
+        '1,rectangular,discharge,0.001,abc,0.015,0.989\n'
+        '2,rectangular,discharge,0.001,2.0,0.015,0.5\n'
+    )
+    results = list(map(solve_job, read_csv(source)))
+    assert results[0]['id'] == '1' and results[0]['line'] == 2
+    assert results[0]['status'] == STATUS_INVALID_INPUT
+    assert results[1]['status'] == 0
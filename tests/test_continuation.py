@@ -0,0 +1,50 @@
+from channelflowlib.continuation import (
+    continuation,
+    sweep_base_width,
+    sweep_critical_depth,
+    sweep_normal_depth
+)
+from channelflowlib.energy import critical_depth
+from channelflowlib.geometry import CircularGeometry, TrapezoidalGeometry
+from channelflowlib.normal_flow import normal_depth, normal_discharge
+
+
+def test_normal_depth_sweep_matches_cold_solves():
+    trap = TrapezoidalGeometry(2.0, 1.5)
+    discharges = [0.1 * i for i in range(1, 201)]
+    depths = sweep_normal_depth(trap, discharges, 0.015, 0.001)
+    for q, y in zip(discharges[::20], depths[::20]):
+        assert abs(y - normal_depth(trap, q, 0.015, 0.001)) < 1e-8
+
+    slopes = [0.0005 + 0.0001 * i for i in range(50)]
+    depths = sweep_normal_depth(trap, 5.0, 0.015, slopes)
+    assert all(abs(normal_discharge(trap, y, 0.015, s) - 5.0) < 1e-8 for y, s in zip(depths, slopes))
+
+
+def test_warm_start_needs_few_evaluations():
+    parameters = [0.01 * i for i in range(1, 1001)]
+    solutions, evaluations = continuation(lambda y, p: y ** 3 + y - p, parameters)
+    assert all(abs(y ** 3 + y - p) < 1e-9 for y, p in zip(solutions, parameters))
+    assert evaluations < 5 * len(parameters)
+
+
+def test_pipe_sweep_stays_below_maximum_conveyance():
+    pipe = CircularGeometry(1.0)
+    capacity = normal_discharge(pipe, 0.938, 0.013, 0.001)
+    discharges = [capacity * i / 100.0 for i in range(1, 106)]
+    depths = sweep_normal_depth(pipe, discharges, 0.013, 0.001)
+    rising = [y for y in depths if y is not None]
+    assert rising == sorted(rising)
+    assert max(rising) < 0.95
+    assert depths[-1] is None
+
+
+def test_critical_depth_and_base_width_sweeps():
+    pipe = CircularGeometry(1.0)
+    discharges = [0.05 * i for i in range(1, 30)]
+    for q, y in zip(discharges, sweep_critical_depth(pipe, discharges)):
+        assert abs(y - critical_depth(pipe, q)) < 1e-7
+
+    widths = sweep_base_width([1.0 + 0.5 * i for i in range(20)], 0.015, 0.001, 0.8, 1.0)
+    for i, b in enumerate(widths):
+        assert abs(normal_discharge(TrapezoidalGeometry(b, 1.0), 0.8, 0.015, 0.001) - (1.0 + 0.5 * i)) < 1e-8
@@ -0,0 +1,45 @@
+from channelflowlib.conveyance import ConveyanceCurve
+from channelflowlib.geometry import CircularGeometry, TrapezoidalGeometry
+from channelflowlib.normal_flow import normal_depth, normal_discharge
+
+
+def test_scenario_cube_matches_direct_evaluation(make_section):
+    section = make_section()
+    curve = ConveyanceCurve.from_section(section, num_points=30)
+    roughnesses = [0.02, 0.03, 0.05]
+    slopes = [0.0005, 0.001, 0.004]
+    cube = curve.scenario_cube(roughnesses, slopes)
+
+    for i, n in enumerate(roughnesses):
+        for j, s in enumerate(slopes):
+            for k in (5, 17, 29):
+                expected = normal_discharge(section, curve.depths[k], n, s)
+                assert abs(cube[i][j][k] - expected) < 1e-9 * max(1.0, expected)
+
+
+def test_interpolated_depths_and_inverse():
+    trap = TrapezoidalGeometry(2.0, 1.5)
+    curve = ConveyanceCurve.from_section(trap, depths=[0.01 * i for i in range(301)])
+    q = curve.discharge(1.234, 0.015, 0.001)
+    assert abs(q - normal_discharge(trap, 1.234, 0.015, 0.001)) < 1e-3 * q
+    assert abs(curve.normal_depth(q, 0.015, 0.001) - normal_depth(trap, q, 0.015, 0.001)) < 1e-3
+
+    cube = curve.scenario_cube([0.015], [0.001], depths=[1.234])
+    assert cube[0][0][0] == q
+
+
+def test_closed_section_inverse_stays_on_rising_branch():
+    curve = ConveyanceCurve.from_section(CircularGeometry(1.0), num_points=201)
+    assert abs(curve.depths[curve.peak_index] - 0.938) < 0.01
+    capacity = curve.discharge(curve.depths[curve.peak_index], 0.013, 0.001)
+    assert curve.normal_depth(1.01 * capacity, 0.013, 0.001) is None
+    assert curve.normal_depth(0.999 * capacity, 0.013, 0.001) < curve.depths[curve.peak_index]
+
+
+def test_inverse_takes_first_crossing_of_a_dipping_curve():
+    # Conveyance drops as a bench floods at 1 m, then rises again
+    curve = ConveyanceCurve([0.0, 1.0, 2.0, 3.0, 4.0], [0.0, 10.0, 8.0, 12.0, 20.0])
+    assert abs(curve.normal_depth(9.0, 1.0, 1.0) - 0.9) < 1e-12
+    assert abs(curve.normal_depth(11.0, 1.0, 1.0) - 2.75) < 1e-12
+    assert curve.normal_depth(10.0, 1.0, 1.0) == 1.0
+    assert curve.normal_depth(21.0, 1.0, 1.0) is None
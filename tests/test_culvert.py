@@ -0,0 +1,74 @@
+import math
+
+from channelflowlib.constants import GRAVITY_G
+from channelflowlib.culvert import INLETS, KU, SUBMERGED_LIMIT, UNSUBMERGED_LIMIT, Culvert, performance_curves
+from channelflowlib.energy import critical_depth
+from channelflowlib.geometry import CircularGeometry
+
+
+def test_inlet_control_regimes():
+    culvert = Culvert(30.0, 0.01, 0.013, diameter=1.2)
+    constants = INLETS['concrete_pipe_square_edge_headwall']
+    area = math.pi * 1.2 ** 2 / 4
+    scale = area * math.sqrt(1.2)
+
+    # Unsubmerged form 1 with the critical specific energy
+    q = 0.8
+    dc = critical_depth(CircularGeometry(1.2), q)
+    hc = dc + (q / CircularGeometry(1.2).area(dc)) ** 2 / (2 * GRAVITY_G)
+    expected = hc + 1.2 * (constants['K'] * (KU * q / scale) ** 2 - 0.5 * 0.01)
+    assert abs(culvert.inlet_control(q) - expected) < 1e-6
+
+    # Submerged
+    q = 3.0
+    expected = 1.2 * (constants['c'] * (KU * q / scale) ** 2 + constants['Y'] - 0.5 * 0.01)
+    assert abs(culvert.inlet_control(q) - expected) < 1e-12
+
+    # Transition joins both equations
+    low = UNSUBMERGED_LIMIT * scale
+    high = SUBMERGED_LIMIT * scale
+    assert abs(culvert.inlet_control(low) - culvert.inlet_control(low * (1 + 1e-9))) < 1e-6
+    assert abs(culvert.inlet_control(high) - culvert.inlet_control(high * (1 - 1e-9))) < 1e-6
+
+
+def test_outlet_control():
+    culvert = Culvert(50.0, 0.002, 0.012, span=2.0, rise=1.5, inlet='box_wingwall_30_75', entrance_loss=0.4)
+    q = 8.0
+    area = 3.0
+    r = area / 7.0
+    v = q / area
+    dc = (q ** 2 / (GRAVITY_G * 4.0)) ** (1.0 / 3.0)
+    head = (1 + 0.4 + 2 * GRAVITY_G * 0.012 ** 2 * 50.0 / r ** (4.0 / 3.0)) * v * v / (2 * GRAVITY_G)
+    assert abs(culvert.outlet_control(q, 0.5) - ((dc + 1.5) / 2 + head - 0.1)) < 1e-6
+    assert abs(culvert.outlet_control(q, 2.0) - (2.0 + head - 0.1)) < 1e-9
+
+
+def test_performance_curve():
+    culvert = Culvert(40.0, 0.005, 0.013, diameter=0.9, barrels=2)
+    discharges = [0.0] + [0.1 * i for i in range(1, 60)]
+    curve = culvert.performance(discharges, tailwaters=0.3)
+
+    assert abs(curve['headwater'][0] - (0.3 - 40.0 * 0.005)) < 1e-12
+    assert all(b > a for a, b in zip(curve['headwater'][1:], curve['headwater'][2:]))
+    for i, q in enumerate(discharges):
+        assert abs(curve['inlet'][i] - culvert.inlet_control(q)) < 1e-6
+        assert abs(curve['outlet'][i] - culvert.outlet_control(q, 0.3)) < 1e-6
+        assert curve['headwater'][i] == max(curve['inlet'][i], curve['outlet'][i])
+
+    # A high tailwater moves the control to the outlet
+    flooded = culvert.performance(discharges, tailwaters=[2.0] * len(discharges))
+    assert flooded['control'][-1] == 'outlet'
+
+
+def test_performance_curves():
+    culverts = {
+        'C1': Culvert(30.0, 0.01, 0.013, diameter=1.2),
+        'C2': Culvert(25.0, 0.003, 0.024, diameter=1.5, inlet='cmp_projecting', entrance_loss=0.9),
+        'C3': Culvert(20.0, 0.002, 0.013, span=2.4, rise=1.8, inlet='box_wingwall_0'),
+    }
+    discharges = [0.5, 1.0, 2.0, 4.0]
+    serial = performance_curves(culverts, discharges)
+    parallel = performance_curves(culverts, discharges, workers=2)
+    assert serial == parallel
+    assert serial['C2'] == culverts['C2'].performance(discharges)
+    assert performance_curves(list(culverts.values()), discharges)[2] == serial['C3']
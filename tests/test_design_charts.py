@@ -0,0 +1,30 @@
+from channelflowlib.design_charts import DesignChart
+from channelflowlib.openchannellib import Trapezoidal
+
+
+def test_chart_matches_trapezoidal_analysis(tmp_path):
+    chart = DesignChart.build([0.0, 1.0, 1.5, 2.0])
+    path = str(tmp_path / 'chart.bin')
+    chart.save(path)
+    chart = DesignChart.load(path)
+
+    trap = Trapezoidal(unknown='water_depth')
+    trap.set_discharge(2.5)
+    trap.set_channel_slope(0.0008)
+    trap.set_sideslope(1.5)
+    trap.set_channel_base(1.2)
+    trap.set_roughness(0.018)
+    trap.analyze()
+
+    depth = chart.normal_depth(2.5, 0.018, 0.0008, 1.2, 1.5)
+    assert abs(depth - trap.water_depth) < 0.001
+    critical = chart.critical_depth(2.5, 1.2, 1.5)
+    assert abs(critical - trap.critical_flow['critical_depth']) < 0.001
+
+
+def test_interpolates_between_side_slopes():
+    chart = DesignChart.build([1.0, 2.0])
+    fine = DesignChart.build([1.0, 1.25, 2.0])
+    coarse_depth = chart.normal_depth(2.0, 0.015, 0.001, 1.0, 1.25)
+    exact_depth = fine.normal_depth(2.0, 0.015, 0.001, 1.0, 1.25)
+    assert abs(coarse_depth - exact_depth) / exact_depth < 0.02
@@ -0,0 +1,86 @@
+import math
+
+from channelflowlib.constants import GRAVITY_G
+from channelflowlib.energy import (
+    alternate_depths,
+    critical_depth,
+    energy_momentum_curves,
+    momentum_function,
+    sequent_depth,
+    specific_energy
+)
+from channelflowlib.geometry import (
+    CircularGeometry,
+    RectangularGeometry,
+    TrapezoidalGeometry,
+    section_geometry
+)
+from channelflowlib.openchannellib import Rectangular
+
+
+def numeric_first_moment(geometry, y, steps=2000):
+    # First moment about the surface equals the integral of A(eta) from 0 to y
+    h = y / steps
+    return sum(geometry.area((i + 0.5) * h) for i in range(steps)) * h
+
+
+def test_rectangular_closed_forms():
+    rect = Rectangular()
+    rect.set_channel_base(2.0)
+    q = 3.0
+    yc = critical_depth(rect, q)
+    assert abs(yc - (q ** 2 / 4.0 / GRAVITY_G) ** (1.0 / 3)) < 1e-8
+
+    y1 = 0.3
+    froude = q / 2.0 / y1 / math.sqrt(GRAVITY_G * y1)
+    y2 = sequent_depth(rect, q, y1)
+    assert abs(y2 - y1 / 2 * (math.sqrt(1 + 8 * froude ** 2) - 1)) < 1e-8
+    assert abs(sequent_depth(rect, q, y2) - y1) < 1e-8
+
+    low, high = alternate_depths(rect, q, 2.0)
+    assert low < yc < high
+    assert abs(specific_energy(rect, q, low) - 2.0) < 1e-8
+    assert abs(specific_energy(rect, q, high) - 2.0) < 1e-8
+    assert alternate_depths(rect, q, 0.5) == (None, None)
+
+
+def test_first_moments(make_section):
+    for geometry, y in ((TrapezoidalGeometry(1.0, 1.5), 0.8),
+                        (CircularGeometry(1.2), 0.3),
+                        (CircularGeometry(1.2), 0.9)):
+        assert abs(geometry.first_moment(y) - numeric_first_moment(geometry, y)) < 1e-6
+
+    channel = make_section()
+    geometry = section_geometry(channel)
+    assert abs(geometry.first_moment(2.5) - numeric_first_moment(geometry, 2.5)) < 1e-5
+
+
+def test_arrays_of_discharges():
+    trap = TrapezoidalGeometry(1.0, 1.5)
+    discharges = [0.5, 1.0, 2.0]
+    depths = critical_depth(trap, discharges)
+    sequents = sequent_depth(trap, discharges, [0.1, 0.15, 0.2])
+    for q, yc, y2, y1 in zip(discharges, depths, sequents, [0.1, 0.15, 0.2]):
+        assert y2 > yc
+        assert abs(momentum_function(trap, q, y1) - momentum_function(trap, q, y2)) < 1e-8
+
+    curves = energy_momentum_curves(trap, 1.0, [0.2, 0.4, 0.8])
+    assert len(curves['specific_energy']) == 3
+    assert curves['momentum'][1] < curves['momentum'][0]
+
+
+def test_zero_discharge():
+    rect = RectangularGeometry(2.0)
+    assert alternate_depths(rect, 0.0, 1.5) == (None, 1.5)
+    assert alternate_depths(rect, [0.0, 0.0], [0.0, 0.8]) == [(None, None), (None, 0.8)]
+    assert alternate_depths(CircularGeometry(1.0), 0.0, 1.5) == (None, None)
+    assert sequent_depth(rect, 0.0, 0.7) == 0.7
+
+
+def test_circular_and_irregular_critical_depth(make_section):
+    for geometry, q in ((CircularGeometry(1.0), 0.5), (section_geometry(make_section()), 20.0)):
+        yc = critical_depth(geometry, q)
+        froude = q * q * geometry.top_width(yc) / (GRAVITY_G * geometry.area(yc) ** 3)
+        assert abs(froude - 1.0) < 1e-6
+        energies = specific_energy(geometry, q, [yc * 0.99, yc, yc * 1.01])
+        assert energies[1] < energies[0] and energies[1] < energies[2]
@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+from channelflowlib.exceptions import (
+    STATUS_ABOVE_SECTION,
+    STATUS_BELOW_SECTION,
+    STATUS_OK,
+    InvalidInputError,
+    WaterAboveSectionError,
+    WaterBelowSectionError
+)
+from channelflowlib.openchannellib import Circular
+
+
+def test_scalar_calls_raise(capsys, make_section):
+    section = make_section()
+    section.set_water_elevation(1.5)
+    with pytest.raises(WaterAboveSectionError):
+        section.analyze()
+    section.set_water_elevation(-2.0)
+    with pytest.raises(WaterBelowSectionError):
+        section.analyze()
+    section.set_bed_slope(0.0)
+    with pytest.raises(InvalidInputError):
+        section.analyze()
+
+    pipe = Circular()
+    pipe.set_slope(0.001)
+    pipe.set_diameter(1.0)
+    pipe.set_roughness(0.015)
+    pipe.set_water_depth(1.0)
+    with pytest.raises(WaterAboveSectionError):
+        pipe.calculate_discharge()
+    pipe.set_water_depth(0.0)
+    with pytest.raises(WaterBelowSectionError):
+        pipe.calculate_discharge()
+
+    # Nothing is written to the console
+    assert capsys.readouterr().out == ''
+
+
+def test_batch_status_codes(make_section):
+    section = make_section()
+    section.set_water_elevation(0.5)
+    results = section.analyze_elevations([-2.0, 0.0, 1.0, 1.5, -1.81])
+    assert results['status'] == [STATUS_BELOW_SECTION, STATUS_OK, STATUS_OK, STATUS_ABOVE_SECTION,
+                                 STATUS_BELOW_SECTION]
+    assert results['valid'] == [False, True, True, False, False]
+    assert math.isnan(results['discharge'][0])
+    assert round(results['wetted_area'][2], 2) == 22.2
+    assert section.water_elevation == 0.5
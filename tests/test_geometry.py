@@ -0,0 +1,92 @@
+import math
+
+from channelflowlib.geometry import (
+    CircularGeometry,
+    ParabolicGeometry,
+    TrapezoidalGeometry,
+    TriangularGeometry,
+    section_parameters
+)
+from channelflowlib.normal_flow import normal_depth, normal_discharge
+from channelflowlib.openchannellib import Trapezoidal
+from channelflowlib.saint_venant import SaintVenantSolver
+
+
+def test_triangular_matches_trapezoid_with_zero_base():
+    tri = TriangularGeometry(1.5)
+    y = 0.8
+    assert abs(tri.area(y) - 1.5 * y * y) < 1e-12
+    assert abs(tri.top_width(y) - 3.0 * y) < 1e-12
+    assert abs(tri.depth_from_area(tri.area(y)) - y) < 1e-12
+
+
+def test_parabolic_against_numeric_integration():
+    par = ParabolicGeometry(4.0, 1.0)
+    assert abs(par.top_width(1.0) - 4.0) < 1e-12
+
+    y = 0.6
+    steps = 4000
+    half = par.top_width(y) / 2.0
+    h = 2 * half / steps
+    area = 0.0
+    perimeter = 0.0
+    for i in range(steps):
+        x0 = -half + i * h
+        x1 = x0 + h
+        z0 = par.coefficient * x0 * x0
+        z1 = par.coefficient * x1 * x1
+        area += (y - (z0 + z1) / 2.0) * h
+        perimeter += math.hypot(h, z1 - z0)
+    assert abs(par.area(y) - area) < 1e-5
+    assert abs(par.perimeter(y) - perimeter) < 1e-5
+    assert abs(par.depth_from_area(par.area(y)) - y) < 1e-10
+
+
+def test_sequences_give_lists():
+    geometries = [TrapezoidalGeometry(2.0, 1.0), CircularGeometry(1.0), ParabolicGeometry(3.0, 1.0)]
+    depths = [0.1, 0.4, 0.7]
+    for g in geometries:
+        for name in ('area', 'perimeter', 'top_width', 'hydraulic_radius', 'conveyance'):
+            values = getattr(g, name)(depths)
+            assert values == [getattr(g, name)(y) for y in depths]
+
+
+def test_normal_depth_matches_trapezoidal_analyze():
+    trap = Trapezoidal(unknown='water_depth', unit='metric')
+    trap.set_channel_base(1.0)
+    trap.set_sideslope(1.5)
+    trap.set_channel_slope(0.001)
+    trap.set_roughness(0.015)
+    trap.set_discharge(1.5)
+    trap.analyze()
+
+    y = normal_depth(trap, 1.5)
+    assert abs(y - trap.get_water_depth()) < 2e-4
+    assert abs(normal_discharge(trap, y) - 1.5) < 1e-8
+
+    ys = normal_depth(TrapezoidalGeometry(1.0, 1.5), [0.5, 1.5], 0.015, 0.001)
+    assert abs(ys[1] - y) < 1e-9
+
+
+def test_circular_normal_depth_capped_at_full_conveyance():
+    pipe = CircularGeometry(1.0)
+    capacity = normal_discharge(pipe, 0.938, 0.013, 0.001)
+    assert capacity > normal_discharge(pipe, 1.0, 0.013, 0.001)
+    assert normal_depth(pipe, 1.01 * capacity, 0.013, 0.001) is None
+    y = normal_depth(pipe, 0.5 * capacity, 0.013, 0.001)
+    assert abs(normal_discharge(pipe, y, 0.013, 0.001) - 0.5 * capacity) < 1e-8
+
+
+def test_irregular_section_parameters(make_section):
+    section = make_section()
+    geometry, n, s = section_parameters(section)
+    assert (n, s) == (0.03, 0.002)
+    assert abs(geometry.max_depth - (1.13 + 1.81)) < 1e-12
+
+    y = normal_depth(section, 5.0)
+    assert abs(normal_discharge(section, y) - 5.0) < 1e-8
+
+    # The dynamic wave solver runs on any section with the common interface
+    solver = SaintVenantSolver(section, 100.0, 10, initial_depth=y, initial_discharge=5.0)
+    solver.run(20.0)
+    assert max(abs(d - y) for d in solver.get_depths()) < 0.05
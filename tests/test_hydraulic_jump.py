@@ -0,0 +1,36 @@
+from channelflowlib.energy import critical_depth, sequent_depth
+from channelflowlib.geometry import RectangularGeometry
+from channelflowlib.gvf import compute_profile, locate_hydraulic_jump, screen_hydraulic_jumps
+
+channel = RectangularGeometry(3.0)
+stations = [i * 2.0 for i in range(101)]
+
+
+def test_profiles_approach_normal_depth():
+    # Mild slope: an M3 profile rises, an M1/M2 profile stays subcritical
+    depths = compute_profile(channel, 6.0, 0.015, 0.0005, stations, 0.3, 'downstream')
+    assert depths[0] == 0.3
+    assert depths[10] > depths[0]
+    sub = compute_profile(channel, 6.0, 0.015, 0.0005, stations, 1.5, 'upstream')
+    yc = critical_depth(channel, 6.0)
+    assert all(y > yc for y in sub)
+
+
+def test_jump_satisfies_momentum_balance():
+    result = locate_hydraulic_jump(channel, 6.0, 0.015, 0.0005, stations, 0.3, 1.2)
+    assert result['status'] == 'jump'
+    assert 0 < result['location'] < 200
+    assert abs(sequent_depth(channel, 6.0, result['upstream_depth']) - result['downstream_depth']) < 0.01
+    assert result['head_loss'] > 0
+    assert result['length'] > 0
+
+
+def test_screening_cases():
+    results = screen_hydraulic_jumps(channel, [(6.0, 0.3, 1.2), (6.0, 0.3, 0.8), (6.0, 0.3, 3.0)],
+                                     0.015, 0.0005, stations)
+    assert results[0]['status'] == 'jump'
+    # Higher tailwater pushes the jump upstream
+    assert results[2]['status'] == 'submerged'
+    # Lower tailwater moves it downstream
+    assert results[1]['status'] == 'jump'
+    assert results[1]['location'] > results[0]['location']
@@ -0,0 +1,48 @@
+from channelflowlib.interpolation import interpolate_sections, normalized_stations, resample_section
+
+
+def lowered(points, drop):
+    return tuple((x, y - drop) for x, y in points)
+
+
+def test_resampling_keeps_vertices(survey_points):
+    stations = normalized_stations(survey_points)
+    assert stations[0] == 0.0 and stations[-1] == 1.0
+    assert stations[4] == 0.5
+    xs, ys = resample_section(survey_points, stations)
+    assert all(abs(x - p[0]) < 1e-12 and abs(y - p[1]) < 1e-12
+               for x, y, p in zip(xs, ys, survey_points))
+
+
+def test_interpolated_sections_between_surveys(survey_points):
+    downstream = lowered(tuple((2 * x, y) for x, y in survey_points), 0.5)
+    sections = interpolate_sections(survey_points, downstream, 3)
+    assert len(sections) == 3
+    assert list(sections.positions) == [0.25, 0.5, 0.75]
+
+    middle = sections.points(1)
+    assert middle[0] == (0.0, 1.13 - 0.25)
+    assert abs(middle[-1][0] - 1.5 * 14.188) < 1e-9
+    assert min(y for x, y in middle) == -1.81 - 0.25
+
+    # Wetted area grows steadily along the widening reach at a fixed depth
+    areas = []
+    for i in range(len(sections)):
+        section = sections.section(i)
+        section.set_average_rougness(0.03)
+        section.set_bed_slope(0.001)
+        section.set_water_elevation(-1.81 - 0.5 * sections.positions[i] + 2.0)
+        section.analyze()
+        areas.append(section.wetted_area)
+    assert areas[0] < areas[1] < areas[2]
+
+
+def test_many_sections_share_flat_arrays(survey_points):
+    positions = [i / 1000.0 for i in range(1001)]
+    sections = interpolate_sections(survey_points, survey_points, positions, num_stations=25)
+    assert len(sections.xs) == 1001 * 25
+    xs, ys = sections.coordinates(500)
+    assert len(xs) == 25
+    first, last = resample_section(survey_points, [0.0, 1.0])
+    assert (xs[0], xs[-1]) == (first[0], first[1])
+    assert sections.section(500).points.xs.obj is sections.coords
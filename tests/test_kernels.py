@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from channelflowlib import kernels
+from channelflowlib.openchannellib import Trapezoidal
+
+
+# Stepping loops as they were written inline in Rectangular and Trapezoidal
+def rectangular_loop(q, s, n, b):
+    q_trial = 0.0
+    d = 0.0
+    v = 0.0
+    while q_trial < q:
+        d += 0.00001
+        a = d * b
+        p = b + 2*d
+        r = a / p
+        v = (1/n) * s**.5 * r**(2/3)
+        q_trial = a * v
+    return d, a, p, r, v
+
+
+def trapezoidal_loop(q, s, n, b, ss):
+    q_trial = 0.0
+    d = 0.0
+    a = 0.0
+    p = 0.0
+    r = 0.0
+    v = 0.0
+    while q_trial < q:
+        d += 0.0001
+        a = (b + d * ss) * d
+        p = 2 * d * (ss**2 + 1)**0.5 + b
+        r = a / p
+        v = (1/n) * r ** (2.0/3) * s ** 0.5
+        q_trial = v * a
+    return d, a, p, r, v
+
+
+def test_python_kernels_match_inline_loops():
+    rng = random.Random(3)
+    depth_search = kernels.get_kernel('manning_depth_search', kernels.PYTHON)
+    trapezoidal_search = kernels.get_kernel('manning_depth_search_trapezoidal', kernels.PYTHON)
+    for _ in range(20):
+        q = rng.uniform(0.2, 3.0)
+        s = rng.uniform(0.0005, 0.005)
+        n = rng.uniform(0.012, 0.03)
+        b = rng.uniform(0.5, 3.0)
+        ss = rng.uniform(0.5, 2.0)
+        assert depth_search(q, s, n, b, 0.0, 0.00001) == rectangular_loop(q, s, n, b)
+        assert trapezoidal_search(q, s, n, b, ss, 0.0001) == trapezoidal_loop(q, s, n, b, ss)
+
+
+def test_self_test_backends_agree():
+    if kernels.numba is None:
+        pytest.skip('numba is not installed')
+    results = kernels.self_test()
+    assert results and all(results.values())
+
+
+def test_python_backend_gives_same_results():
+    def solve():
+        trap = Trapezoidal(unknown='water_depth')
+        trap.set_discharge(1.0)
+        trap.set_channel_slope(0.001)
+        trap.set_sideslope(1.5)
+        trap.set_channel_base(1.0)
+        trap.set_roughness(0.015)
+        trap.analyze()
+        return trap.water_depth, trap.critical_flow['critical_depth']
+
+    backend = kernels.get_backend()
+    try:
+        kernels.set_backend(kernels.PYTHON)
+        expected = solve()
+    finally:
+        kernels.set_backend(backend)
+    assert solve() == expected
+    assert round(expected[0], 4) == 0.5436
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        kernels.set_backend('fortran')
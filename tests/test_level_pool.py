@@ -0,0 +1,51 @@
+import math
+
+from channelflowlib.level_pool import StorageTable, reach_storage, section_areas, weir
+
+
+def test_prismoidal_storage(survey_points, make_section):
+    elevations = [-2.0, -1.0, 0.0, 1.0]
+    section = make_section()
+    areas = section_areas(section, elevations)
+    assert areas[0] == 0.0
+
+    # Identical sections give a prism
+    storages = reach_storage([section, section, section], [100.0, 50.0], elevations)
+    assert all(abs(v - 150.0 * a) < 1e-9 for v, a in zip(storages, areas))
+
+    # A section twice as wide doubles the area, a frustum in between
+    wide = make_section(points=tuple((2 * x, y) for x, y in survey_points))
+    storages = reach_storage([section, wide], [90.0], elevations)
+    for v, a in zip(storages, areas):
+        assert abs(v - 30.0 * (a + 2 * a + math.sqrt(2) * a)) < 1e-9
+
+
+def test_level_pool_routing_conserves_volume_and_attenuates():
+    elevations = [100 + 0.05 * i for i in range(101)]
+    outflow = weir(101.0, 20.0)
+    table = StorageTable(elevations, [2e5 * (h - 100) for h in elevations], [outflow(h) for h in elevations])
+
+    dt = 60.0
+    inflows = [5.0 + 45.0 * math.exp(-((k - 300) / 60.0) ** 2) for k in range(3000)]
+    outflows, levels = table.route(inflows, dt, initial_elevation=101.0)
+
+    assert max(outflows) < max(inflows)
+    assert outflows.index(max(outflows)) > inflows.index(max(inflows))
+    assert abs(table.elevation_at_storage(2e5 * (levels[-1] - 100)) - levels[-1]) < 1e-9
+
+    # Trapezoidal-rule volumes balance the change in storage
+    volume_in = sum((a + b) / 2 * dt for a, b in zip(inflows, inflows[1:]))
+    volume_out = sum((a + b) / 2 * dt for a, b in zip(outflows, outflows[1:]))
+    storage_change = 2e5 * (levels[-1] - levels[0])
+    assert abs(volume_in - volume_out - storage_change) < 1e-6 * volume_in
+
+
+def test_table_from_sections(survey_points, make_section):
+    sections = [make_section(), make_section(points=tuple((x, y - 0.2) for x, y in survey_points))]
+    elevations = [-2.0 + 0.1 * i for i in range(31)]
+    table = StorageTable.from_sections(sections, [500.0], elevations, weir(0.5, 10.0))
+    assert table.outflows[0] == 0.0
+    assert list(table.storages) == sorted(table.storages)
+    outflows, levels = table.route([2.0] * 500, 300.0)
+    assert len(outflows) == 500
+    assert levels[-1] > levels[0]
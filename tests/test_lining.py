@@ -0,0 +1,41 @@
+import math
+
+from channelflowlib.constants import GRAVITY_G
+from channelflowlib.geometry import TrapezoidalGeometry
+from channelflowlib.lining import check_linings, tractive_force_ratio
+from channelflowlib.normal_flow import normal_depth
+
+
+def test_tractive_force_ratio():
+    k = tractive_force_ratio(2.0, 35.0)
+    assert abs(k - math.sqrt(1 - 0.2 / math.sin(math.radians(35.0)) ** 2)) < 1e-12
+    assert tractive_force_ratio(1.0, 35.0) is None
+
+
+def test_pass_fail_matrix():
+    # Same canal at increasing slopes
+    slopes = [0.0001, 0.0005, 0.002]
+    geometry = TrapezoidalGeometry(3.0, 2.0)
+    depths = [normal_depth(geometry, 4.0, 0.025, s) for s in slopes]
+    flows = {
+        'water_depth': depths,
+        'hydraulic_radius': geometry.hydraulic_radius(depths),
+        'velocity': [4.0 / a for a in geometry.area(depths)]
+    }
+    result = check_linings(flows, slopes, 2.0)
+
+    assert abs(result['bed_shear'][0] - 1000 * GRAVITY_G * flows['hydraulic_radius'][0] * 0.0001) < 1e-9
+    assert result['passes']['concrete'] == [True, True, True]
+    assert result['passes']['fine_sand'][2] is False
+    assert result['passes']['cobbles'] == [True, True, True]
+
+    # Coarse gravel at 2:1: the bank limit is reduced by K
+    gravel = result['checks']['coarse_gravel']
+    assert gravel['side_slope'] == [True, True, True]
+    k = tractive_force_ratio(2.0, 35.0)
+    assert gravel['bank_shear'] == [t <= k * 14.4 for t in result['bank_shear']]
+
+    # Banks steeper than the angle of repose fail whatever the flow
+    steep = check_linings(flows, slopes, 1.0)
+    assert steep['checks']['coarse_gravel']['side_slope'] == [False, False, False]
+    assert steep['passes']['stiff_clay'] == result['passes']['stiff_clay']
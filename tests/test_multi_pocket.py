@@ -0,0 +1,53 @@
+import math
+import random
+
+from channelflowlib.openchannellib import IrregularSection
+
+
+def brute_force(points, elevation):
+    area = 0.0
+    perimeter = 0.0
+    top_width = 0.0
+    steps = 200
+    for i in range(len(points) - 1):
+        x1, y1 = points[i]
+        x2, y2 = points[i + 1]
+        for j in range(steps):
+            xa = x1 + (x2 - x1) * j / steps
+            xb = x1 + (x2 - x1) * (j + 1) / steps
+            ya = y1 + (y2 - y1) * j / steps
+            yb = y1 + (y2 - y1) * (j + 1) / steps
+            if max(ya, yb) <= elevation:
+                area += (xb - xa) * (2 * elevation - ya - yb) / 2
+                perimeter += math.sqrt((xb - xa) ** 2 + (yb - ya) ** 2)
+                top_width += xb - xa
+    return area, perimeter, top_width
+
+
+def test_mid_channel_bar():
+    # Two thalwegs separated by a bar that stays dry at elevation 1.0
+    pts = ((0, 3), (2, 0), (4, 0), (5, 2), (6, 0), (8, 0), (10, 3))
+    channel = IrregularSection(pts)
+    area, perimeter, top_width = channel.get_wetted_properties(1.0)
+
+    # Each pocket is a trapezoid with a 2 m base and 1 m depth
+    left = (2 + (2 + 2.0 / 3 + 0.5)) / 2.0
+    right = (2 + (0.5 + 2 + 2.0 / 3)) / 2.0
+    assert abs(area - (left + right)) < 1e-9
+    assert abs(top_width - (2 + 2.0 / 3 + 0.5 + 0.5 + 2 + 2.0 / 3)) < 1e-9
+    assert perimeter > 4.0
+
+
+def test_dense_section_matches_brute_force():
+    random.seed(3)
+    pts = [(0.0, 10.0)]
+    for i in range(1, 400):
+        pts.append((i * 0.5, 5 * math.sin(i / 15.0) + random.uniform(-1, 1)))
+    pts.append((200.0, 10.0))
+    channel = IrregularSection(tuple(pts))
+
+    for elevation in (-4.0, -1.0, 0.0, 2.5, 5.0):
+        expected = brute_force(pts, elevation)
+        actual = channel.get_wetted_properties(elevation)
+        for a, b in zip(actual, expected):
+            assert abs(a - b) <= 1e-6 * max(1.0, b) + 0.01 * b
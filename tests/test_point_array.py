@@ -0,0 +1,63 @@
+import pickle
+from array import array
+
+import pytest
+
+from channelflowlib.openchannellib import IrregularSection
+from channelflowlib.rating_grid import rating_grid
+
+
+@pytest.fixture
+def flat(survey_points):
+    return array('d', [value for point in survey_points for value in point])
+
+
+@pytest.fixture
+def analyze(make_section):
+    def run(points, elevation=0.5):
+        section = make_section(points=points)
+        section.set_water_elevation(elevation)
+        section.analyze()
+        return section
+    return run
+
+
+def test_flat_buffer_is_used_without_copying(flat, survey_points, analyze):
+    section = analyze(flat)
+    expected = analyze(survey_points)
+    assert section.discharge == expected.discharge
+    assert section.froude_number == expected.froude_number
+
+    assert len(section.points) == 7
+    assert section.points[-1] == (14.188, 1.2)
+    assert list(section.points)[3] == (5.223, -1.57)
+
+    # The section reads the caller's buffer in place
+    assert section.points.flat.obj is flat
+
+
+def test_two_dimensional_buffer_and_pickling(flat, survey_points, analyze):
+    grid = memoryview(flat).cast('B').cast('d', (7, 2))
+    section = analyze(grid)
+    assert section.discharge == analyze(survey_points).discharge
+
+    copy = pickle.loads(pickle.dumps(section))
+    assert list(copy.points) == list(section.points)
+
+    # Integer buffers are converted
+    ints = array('i', [0, 2, 1, 0, 3, 0, 4, 2])
+    assert analyze(ints, 1.0).wetted_area == analyze(((0, 2), (1, 0), (3, 0), (4, 2)), 1.0).wetted_area
+
+
+def test_array_backed_sections_in_batch_tools(flat, survey_points):
+    grid = rating_grid([IrregularSection(flat), IrregularSection(survey_points)], [1.0, 2.0], [0.03], 0.002)
+    assert grid.table(0) == grid.table(1)
+
+
+def test_reassigning_points_rebuilds_the_index():
+    section = IrregularSection(((0, 10), (0, 0), (10, 0), (10, 10)))
+    assert section.get_wetted_properties(5) == (50.0, 20.0, 10.0)
+
+    section.points = ((0, 10), (0, 2), (10, 2), (10, 10))
+    assert section.get_wetted_properties(5) == (30.0, 16.0, 10.0)
+    assert section.points[1] == (0.0, 2.0)
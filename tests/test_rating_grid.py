@@ -0,0 +1,34 @@
+import math
+
+from channelflowlib.rating_grid import rating_grid
+
+
+def same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def test_grid_matches_analyze(make_section):
+    section = make_section()
+    grid = rating_grid([section], [1.0, 2.0, 4.0], [0.02, 0.04], 0.001)
+
+    section.set_average_rougness(0.02)
+    section.set_bed_slope(0.001)
+    section.set_water_elevation(-1.81 + 2.0)
+    section.analyze()
+    assert abs(grid.discharge(0, 1, 0) - section.discharge) < 1e-9
+    assert abs(grid.discharge(0, 1, 1) - section.discharge / 2.0) < 1e-9
+
+    # Above the lower bank
+    assert math.isnan(grid.table(0)[2][0])
+
+
+def test_shared_memory_workers_give_same_results(survey_points):
+    sections = [[(x, y + 0.01 * i) for x, y in survey_points] for i in range(40)]
+    slopes = [0.001 * (1 + i % 3) for i in range(40)]
+    depths = [0.25 * i for i in range(14)]
+    roughnesses = [0.025, 0.035]
+
+    serial = rating_grid(sections, depths, roughnesses, slopes)
+    parallel = rating_grid(sections, depths, roughnesses, slopes, workers=2, chunk_size=7)
+    assert len(parallel) == 40
+    assert all(same(a, b) for a, b in zip(serial.discharges, parallel.discharges))
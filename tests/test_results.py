@@ -0,0 +1,67 @@
+import io
+import math
+
+from channelflowlib.exceptions import STATUS_ABOVE_SECTION, STATUS_OK
+from channelflowlib.openchannellib import Trapezoidal
+from channelflowlib.results import ResultTable
+
+
+def make_table(make_section):
+    table = ResultTable.empty()
+    trap = Trapezoidal(unknown='discharge', unit='metric')
+    trap.set_channel_base(1.0)
+    trap.set_sideslope(1.5)
+    trap.set_channel_slope(0.001)
+    trap.set_roughness(0.015)
+    for depth in (0.5, 1.0, 1.5):
+        trap.set_water_depth(depth)
+        trap.analyze()
+        table.append_section(trap)
+    table.append_section(trap, STATUS_ABOVE_SECTION)
+
+    results = make_section().analyze_elevations([0.0, 1.0])
+    table.extend(discharge=results['discharge'], velocity=results['velocity'], status=results['status'])
+    return table, trap
+
+
+def same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def test_collects_hydraulic_and_critical_outputs(make_section):
+    table, trap = make_table(make_section)
+    assert len(table) == 6
+    assert table['discharge'][2] == trap.discharge
+    assert table['critical_depth'][2] == trap.critical_flow['critical_depth']
+    assert math.isnan(table['discharge'][3])
+    assert math.isnan(table['critical_depth'][5])
+    assert table.valid() == [True, True, True, False, True, True]
+
+
+def test_npy_npz_and_mmap_round_trips(tmp_path, make_section):
+    table, trap = make_table(make_section)
+    npy = str(tmp_path / 'results.npy')
+    npz = str(tmp_path / 'results.npz')
+    table.save_npy(npy)
+    table.save_npz(npz)
+    with open(npy, 'rb') as f:
+        assert f.read(6) == b'\x93NUMPY'
+        header_size = int.from_bytes(f.read(4)[2:], 'little')
+        assert (10 + header_size) % 64 == 0
+
+    for loaded in (ResultTable.load_npy(npy), ResultTable.load_npy(npy, mmap_mode=True),
+                   ResultTable.load_npz(npz)):
+        assert loaded.fields == table.fields
+        for name in table.fields:
+            assert all(same(a, b) for a, b in zip(loaded[name], table[name]))
+        assert loaded['status'][3] == STATUS_ABOVE_SECTION
+
+
+def test_csv_export(make_section):
+    table, trap = make_table(make_section)
+    stream = io.StringIO()
+    table.to_csv(stream)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].split(',')[0] == 'discharge'
+    assert len(lines) == 7
+    assert lines[1].split(',')[-1] == str(STATUS_OK)
@@ -0,0 +1,80 @@
+import pytest
+
+from channelflowlib.routing import CelerityTable, Reach, RoutingNetwork
+
+
+@pytest.fixture
+def table(make_section):
+    return CelerityTable.from_section(make_section(), num_stages=30)
+
+
+def hydrograph(base, peak, num_steps):
+    flows = []
+    for t in range(num_steps):
+        rise = max(0.0, 1.0 - abs(t - 20) / 10.0)
+        flows.append(base + (peak - base) * rise)
+    return flows
+
+
+def test_table_is_increasing(table):
+    assert table.discharges == sorted(table.discharges)
+    assert all(c > 0 for c in table.celerities)
+
+
+def test_routing_conserves_volume_and_attenuates(table):
+    reach = Reach('a', table, 2000.0)
+    inflow = hydrograph(1.0, 10.0, 200)
+    outflow = reach.route(inflow, 60.0)
+    assert abs(sum(outflow) - sum(inflow)) / sum(inflow) < 0.05
+    assert max(outflow) < max(inflow)
+    assert outflow.index(max(outflow)) > inflow.index(max(inflow))
+
+
+def test_large_courant_number_keeps_volume(table):
+    # One sub-reach with C > 2 (1 - X): C2 is negative and the outflow is
+    # not clipped
+    reach = Reach('a', table, 300.0)
+    inflow = hydrograph(1.0, 10.0, 200)
+    outflow = reach.route(inflow, 600.0)
+    assert min(outflow) < 1.0
+    assert abs(sum(outflow) - sum(inflow)) / sum(inflow) < 1e-3
+
+
+def test_network_order_and_basins(table):
+    reaches = [
+        Reach('outlet', table, 1000.0),
+        Reach('left', table, 1000.0, downstream='outlet'),
+        Reach('right', table, 1000.0, downstream='outlet'),
+        Reach('other', table, 1000.0),
+    ]
+    network = RoutingNetwork(reaches)
+    order = network.topological_order()
+    assert order.index('outlet') > order.index('left')
+    assert order.index('outlet') > order.index('right')
+    assert sorted(len(basin) for basin in network.sub_basins()) == [1, 3]
+
+    inflows = {
+        'left': hydrograph(1.0, 5.0, 100),
+        'right': hydrograph(1.0, 5.0, 100),
+        'other': hydrograph(1.0, 5.0, 100),
+    }
+    serial = network.route(inflows, 60.0)
+    parallel = network.route(inflows, 60.0, workers=2)
+    assert serial == parallel
+    assert serial['outlet'][0] == 2.0
+
+
+def test_single_outlet_levels_route_in_parallel(table):
+    reaches = [Reach('outlet', table, 1000.0)]
+    for side in ('a', 'b'):
+        reaches.append(Reach(side, table, 1000.0, downstream='outlet'))
+        reaches.append(Reach(side + '1', table, 1000.0, downstream=side))
+        reaches.append(Reach(side + '2', table, 1000.0, downstream=side))
+    network = RoutingNetwork(reaches)
+    levels = network.topological_levels()
+    assert [sorted(level) for level in levels] == [['a1', 'a2', 'b1', 'b2'], ['a', 'b'], ['outlet']]
+
+    inflows = {reach_id: hydrograph(1.0, 5.0, 100) for reach_id in ('a1', 'a2', 'b1', 'b2')}
+    serial = network.route(inflows, 60.0)
+    assert network.route(inflows, 60.0, workers=2) == serial
+    assert serial['outlet'][0] == 4.0
@@ -0,0 +1,72 @@
+from channelflowlib.openchannellib import Rectangular
+from channelflowlib.saint_venant import (
+    SaintVenantSolver,
+    WallBoundary,
+    DischargeBoundary,
+    DepthBoundary
+)
+
+
+def make_channel(slope):
+    rect = Rectangular(unknown='discharge')
+    rect.set_channel_base(2.0)
+    rect.set_roughness(0.015)
+    rect.set_channel_slope(slope)
+    rect.set_water_depth(1.0)
+    return rect
+
+
+def test_lake_at_rest():
+    solver = SaintVenantSolver(make_channel(0.0), 100.0, 50,
+                               initial_depth=1.0,
+                               upstream=WallBoundary(),
+                               downstream=WallBoundary())
+    solver.run(10.0)
+    for depth in solver.get_depths():
+        assert abs(depth - 1.0) < 1e-9
+
+
+def test_dam_break_conserves_mass():
+    depths = [2.0] * 50 + [0.5] * 50
+    solver = SaintVenantSolver(make_channel(0.0), 100.0, 100,
+                               initial_depth=depths,
+                               upstream=WallBoundary(),
+                               downstream=WallBoundary())
+    volume = sum(solver.area) * solver.dx
+    solver.run(5.0)
+    assert abs(sum(solver.area) * solver.dx - volume) < 1e-9
+    assert max(solver.get_depths()) <= 2.0 + 1e-9
+    assert solver.get_depths()[49] < 2.0
+
+
+def test_uniform_flow_is_steady():
+    rect = make_channel(0.001)
+    rect.analyze()
+    q = rect.discharge
+    solver = SaintVenantSolver(rect, 500.0, 50,
+                               initial_depth=1.0,
+                               initial_discharge=q,
+                               upstream=DischargeBoundary(q),
+                               downstream=DepthBoundary(1.0))
+    solver.run(60.0)
+    for depth in solver.get_depths():
+        assert abs(depth - 1.0) < 0.01
+
+
+def test_checkpoint_restart(tmp_path):
+    path = str(tmp_path / 'state.json')
+    depths = [1.5] * 20 + [1.0] * 20
+    kwargs = dict(initial_depth=depths, upstream=WallBoundary(), downstream=WallBoundary())
+
+    full = SaintVenantSolver(make_channel(0.0), 40.0, 40, **kwargs)
+    full.run(4.0, dt=0.05)
+
+    first = SaintVenantSolver(make_channel(0.0), 40.0, 40, **kwargs)
+    first.run(2.0, dt=0.05, checkpoint_path=path)
+    second = SaintVenantSolver(make_channel(0.0), 40.0, 40, **kwargs)
+    second.load_checkpoint(path)
+    second.run(4.0, dt=0.05)
+
+    assert second.steps == full.steps
+    for a, b in zip(second.area, full.area):
+        assert abs(a - b) < 1e-9
@@ -0,0 +1,140 @@
+from channelflowlib.openchannellib import Circular
+from channelflowlib.sewer import PartialFlowTable, SewerNetwork, full_flow_discharge, pipe_hgl, size_pipes
+
+catalogue = [0.3, 0.375, 0.45, 0.525, 0.6, 0.675, 0.75, 0.9, 1.05, 1.2]
+
+
+def test_partial_flow_matches_circular():
+    table = PartialFlowTable()
+    circ = Circular()
+    circ.set_slope(0.002)
+    circ.set_diameter(0.6)
+    circ.set_roughness(0.013)
+    circ.set_water_depth(0.42)
+    circ.calculate_discharge()
+
+    q_full = full_flow_discharge(0.6, 0.002, 0.013)
+    assert abs(table.discharge_ratio(0.7) * q_full - circ.discharge) / circ.discharge < 1e-3
+    assert abs(table.depth_ratio(circ.discharge / q_full) - 0.7) < 1e-3
+
+
+def test_size_pipes_picks_smallest_diameter():
+    pipes = [
+        {'id': 'p1', 'discharge': 0.05, 'slope': 0.005},
+        {'id': 'p2', 'discharge': 0.4, 'slope': 0.002, 'roughness': 0.013},
+        {'id': 'p3', 'discharge': 50.0, 'slope': 0.001},
+    ]
+    table = PartialFlowTable()
+    results = size_pipes(pipes, catalogue, max_depth_ratio=0.8, table=table)
+
+    for pipe, result in zip(pipes[:2], results[:2]):
+        assert result['depth_ratio'] <= 0.8
+        assert not result['surcharged']
+        index = catalogue.index(result['diameter'])
+        if index > 0:
+            n = pipe.get('roughness', 0.015)
+            smaller = full_flow_discharge(catalogue[index - 1], pipe['slope'], n)
+            assert pipe['discharge'] / smaller > table.discharge_ratio(0.8)
+
+    assert results[2]['undersized']
+    assert results[2]['surcharged']
+    assert results[2]['diameter'] == 1.2
+
+
+def test_critical_depth_ratio():
+    from channelflowlib.constants import GRAVITY_G
+    from channelflowlib.energy import critical_depth
+    from channelflowlib.geometry import CircularGeometry
+
+    table = PartialFlowTable()
+    for q in [0.05, 0.2, 0.5]:
+        yc = critical_depth(CircularGeometry(0.6), q)
+        assert abs(table.critical_depth_ratio(q / (GRAVITY_G * 0.6 ** 5) ** 0.5) * 0.6 - yc) < 1e-3
+
+
+def test_pipe_hgl_backwater_matches_profile():
+    from channelflowlib.geometry import CircularGeometry
+    from channelflowlib.gvf import compute_profile
+
+    pipe = {'discharge': 0.15, 'diameter': 0.6, 'length': 80.0, 'roughness': 0.013,
+            'upstream_invert': 10.08, 'downstream_invert': 10.0}
+    table = PartialFlowTable()
+
+    # M1 backwater from a tailwater below the crown
+    result = pipe_hgl(pipe, 10.5, table=table)
+    stations = [0.1 * i for i in range(801)]
+    depths = compute_profile(CircularGeometry(0.6), 0.15, 0.013, 0.001, stations, 0.5, 'upstream')
+    assert result['full_length'] == 0.0
+    assert abs(result['upstream_depth'] - depths[0]) < 2e-3
+    assert result['normal_depth'] < result['upstream_depth'] < 0.5
+
+    # Free outfall on a long pipe: critical at the outlet, normal upstream
+    long_pipe = dict(pipe, length=2000.0, upstream_invert=12.0)
+    result = pipe_hgl(long_pipe, None, table=table)
+    assert result['downstream_depth'] == result['critical_depth']
+    assert abs(result['upstream_depth'] - result['normal_depth']) < 1e-3
+
+    # Steep pipe: inlet control at critical depth
+    steep = dict(pipe, upstream_invert=12.0)
+    result = pipe_hgl(steep, None, table=table)
+    assert result['normal_depth'] < result['critical_depth'] == result['upstream_depth']
+
+
+def test_pipe_hgl_pressure_flow():
+    pipe = {'discharge': 0.5, 'diameter': 0.6, 'length': 60.0, 'roughness': 0.013,
+            'upstream_invert': 10.06, 'downstream_invert': 10.0}
+    friction = (0.5 / full_flow_discharge(0.6, 1.0, 0.013)) ** 2
+
+    # Flow above the capacity: surcharged over the whole length
+    result = pipe_hgl(pipe, 11.0)
+    assert result['normal_depth'] is None
+    assert result['full_length'] == 60.0
+    assert abs(result['upstream_hgl'] - (11.0 + friction * 60.0)) < 1e-9
+
+    # Flow above the capacity from a free outfall: pressurizes upstream
+    result = pipe_hgl(pipe, None)
+    assert 0 < result['full_length'] < 60.0
+    assert result['upstream_depth'] > 0.6
+
+    # Steep pipe with a surcharged outlet: the HGL meets the crown
+    steep = dict(pipe, discharge=0.3, upstream_invert=10.6)
+    friction = (0.3 / full_flow_discharge(0.6, 1.0, 0.013)) ** 2
+    result = pipe_hgl(steep, 10.8)
+    assert abs(result['full_length'] - 0.2 / (0.01 - friction)) < 1e-9
+    assert result['upstream_depth'] < 0.6
+
+
+def test_sewer_network():
+    pipes = [
+        {'id': 'out', 'downstream': None, 'discharge': 0.4, 'diameter': 0.75, 'length': 50.0,
+         'upstream_invert': 10.1, 'downstream_invert': 10.0, 'junction_loss': 0.5},
+        {'id': 'a', 'downstream': 'out', 'discharge': 0.25, 'diameter': 0.6, 'length': 40.0,
+         'upstream_invert': 10.3, 'downstream_invert': 10.15, 'rim_elevation': 12.0},
+        {'id': 'b', 'downstream': 'out', 'discharge': 0.15, 'diameter': 0.45, 'length': 40.0,
+         'upstream_invert': 10.4, 'downstream_invert': 10.2, 'rim_elevation': 10.5},
+        {'id': 'other', 'downstream': None, 'discharge': 0.1, 'diameter': 0.45, 'length': 30.0,
+         'upstream_invert': 9.1, 'downstream_invert': 9.0},
+    ]
+    network = SewerNetwork(pipes)
+    trees = network.outfall_order()
+    assert sorted(len(tree) for tree in trees) == [1, 3]
+    assert all(tree[0] in ('out', 'other') for tree in trees)
+
+    table = PartialFlowTable()
+    results = network.hgl({'out': 10.9}, table=table)
+    assert results == network.hgl({'out': 10.9}, table=table, workers=2)
+
+    trunk = results['out']
+    v = trunk['velocity']
+    assert abs(trunk['manhole_hgl'] - (trunk['upstream_hgl'] + 0.5 * v * v / 19.62)) < 1e-9
+    branch = pipe_hgl(pipes[1], trunk['manhole_hgl'], table=table)
+    assert results['a']['upstream_hgl'] == branch['upstream_hgl']
+    assert results['out']['surcharged'] and not results['other']['surcharged']
+    assert results['b']['flooded'] and not results['a']['flooded']
+
+    looped = [dict(pipes[0], downstream='a'), pipes[1]]
+    try:
+        SewerNetwork(looped).outfall_order()
+        assert False
+    except ValueError:
+        pass
@@ -0,0 +1,34 @@
+import math
+from channelflowlib.openchannellib import IrregularSection
+from channelflowlib.simplify import douglas_peucker, section_deviation, simplify_section
+
+
+def survey(num_points):
+    pts = [(0.0, 6.0)]
+    for i in range(1, num_points - 1):
+        x = 100.0 * i / (num_points - 1)
+        pts.append((x, 4 * math.cos(x / 100.0 * 2 * math.pi)))
+    pts.append((100.0, 6.0))
+    return pts
+
+
+def test_douglas_peucker_keeps_corners():
+    pts = [(0, 2), (1, 1), (2, 0), (3, 0), (4, 0), (5, 1), (6, 2)]
+    assert douglas_peucker(pts, 0.01) == [(0, 2), (2, 0), (4, 0), (6, 2)]
+
+
+def test_simplify_respects_limits():
+    pts = survey(3000)
+    simplified, report = simplify_section(pts, 0.5, max_area_error=0.5, max_perimeter_error=0.2)
+    assert report['max_area_error'] <= 0.5
+    assert report['max_perimeter_error'] <= 0.2
+    assert report['reduction'] > 10
+    assert section_deviation(pts, simplified) == (report['max_area_error'],
+                                                  report['max_perimeter_error'])
+
+    original = IrregularSection(tuple(pts))
+    reduced = IrregularSection(simplified)
+    for elevation in (-3.0, 0.0, 3.0):
+        area_a = original.get_wetted_properties(elevation)[0]
+        area_b = reduced.get_wetted_properties(elevation)[0]
+        assert abs(area_a - area_b) <= 0.5
@@ -0,0 +1,58 @@
+import math
+
+from channelflowlib.exceptions import (
+    STATUS_ABOVE_SECTION,
+    STATUS_BELOW_SECTION,
+    STATUS_OK,
+    STATUS_UNKNOWN_GAUGE
+)
+from channelflowlib.telemetry import GaugeRating, RollingStatistics, TelemetryPipeline, replay_file
+
+
+def test_rating_matches_analyze(make_section):
+    section = make_section(slope=0.001)
+    rating = GaugeRating(section, step=0.001)
+    q, v, fr, status = rating.convert(0.5)
+    section.set_water_elevation(0.5)
+    section.analyze()
+    assert status == STATUS_OK
+    assert abs(q - section.discharge) < 1e-3 * section.discharge
+    assert abs(v - section.velocity) < 1e-3 * section.velocity
+    assert abs(fr - section.froude_number) < 1e-3 * section.froude_number
+
+    assert rating.convert(-2.0)[3] == STATUS_BELOW_SECTION
+    assert rating.convert(1.2)[3] == STATUS_ABOVE_SECTION
+
+
+def test_rolling_statistics_window():
+    stats = RollingStatistics(window=3)
+    for value in [5.0, 1.0, 4.0, 2.0, 3.0]:
+        stats.add(value)
+    summary = stats.summary()
+    assert summary['count'] == 5
+    assert summary['window_min'] == 2.0
+    assert summary['window_max'] == 4.0
+    assert abs(summary['window_mean'] - 3.0) < 1e-12
+    assert len(stats.values) == 3
+
+
+def test_pipeline_replay(tmp_path, make_section):
+    lines = ['gauge_id,timestamp,stage']
+    for i in range(100):
+        lines.append('A,%d,%f' % (i, -1.0 + 0.01 * i))
+        lines.append('B,%d,0.0' % i)
+    lines.append('C,100,0.0')
+
+    path = tmp_path / 'telemetry.csv'
+    path.write_text('\n'.join(lines) + '\n')
+
+    sections = {gauge: make_section(slope=0.001) for gauge in 'AB'}
+    pipeline = TelemetryPipeline(sections, window=10)
+    records = list(pipeline.process(replay_file(str(path))))
+
+    assert len(records) == 201
+    assert records[-1]['status'] == STATUS_UNKNOWN_GAUGE
+    assert math.isnan(records[-1]['discharge'])
+    assert pipeline.summary('A')['count'] == 100
+    assert pipeline.summary('B')['window_min'] == pipeline.summary('B')['window_max']
+    assert pipeline.summary('A')['latest'] == records[-3]['discharge']
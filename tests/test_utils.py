@@ -0,0 +1,28 @@
+from channelflowlib.utils import interpolate, is_sequence, job_pool, map_jobs
+
+
+def square(x):
+    return x * x
+
+
+def test_interpolate():
+    xs = [0.0, 1.0, 3.0]
+    ys = [0.0, 2.0, 6.0]
+    assert interpolate(2.0, xs, ys) == 4.0
+    assert interpolate(1.0, xs, ys) == 2.0
+    assert interpolate(-1.0, xs, ys) == 0.0
+    assert interpolate(4.0, xs, ys) == 6.0
+    assert interpolate(-1.0, xs, ys, extrapolate=True) == -2.0
+    assert interpolate(4.0, xs, ys, extrapolate=True) == 8.0
+
+
+def test_map_jobs():
+    jobs = list(range(10))
+    assert map_jobs(square, jobs) == [x * x for x in jobs]
+    assert map_jobs(square, jobs, workers=2) == [x * x for x in jobs]
+    assert is_sequence(jobs) and not is_sequence(1.0)
+
+    with job_pool(2) as executor:
+        assert map_jobs(square, jobs, 2, executor) == map_jobs(square, jobs[::-1], 2, executor)[::-1]
+    with job_pool(1) as executor:
+        assert executor is None